@@ -0,0 +1,61 @@
+# Benchmark: memory and time of the dense feature matrix used before against the sparse CSR one.
+# Run from the project root with: python -m benchmarks.feature_matrix_benchmark [repeats] [model-name ...]
+import sys
+import time
+
+import numpy as np
+
+from model.factory.classification_factory import ClassificationContextFactory
+from preprocessing.processor import DataProcessor, VectoriserManager
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+def matrix_bytes(X) -> int:
+    if isinstance(X, np.ndarray):
+        return X.nbytes
+    return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+
+
+def run(repeats: int = 10, model_names: list = None) -> None:
+    logger = PrefixLogger(InfoLogger(), "FeatureMatrixBenchmark")
+    model_names = model_names or ["naive_bayes", "decision_tree", "logistic_regression", "k_nearest_neighbors", "svm"]
+
+    df = FileManager().load_csv(Config.PREPROCESSED_CSV_PATH)
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
+    df = df.loc[df.index.repeat(repeats)].reset_index(drop=True)
+    vectoriser = VectoriserManager()
+    vectoriser.fit_vectoriser(df["x_ic"])
+
+    start_time = time.perf_counter()
+    X_sparse, y = vectoriser.vectorize_data(df)
+    sparse_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    X_dense = np.concatenate((vectoriser.tfidfconverter.transform(df["x_ic"]).toarray(),
+                              vectoriser.tfidfconverter.transform(df["x_ts"]).toarray()), axis=1)
+    dense_time = time.perf_counter() - start_time
+
+    density = X_sparse.nnz / (X_sparse.shape[0] * X_sparse.shape[1])
+    logger.log(f"X is {X_sparse.shape[0]} x {X_sparse.shape[1]}, {density * 100:.2f}% non-zero")
+    logger.log(f"Dense:  {matrix_bytes(X_dense) / 2 ** 20:.1f} MiB, vectorised in {dense_time:.2f} seconds")
+    logger.log(f"Sparse: {matrix_bytes(X_sparse) / 2 ** 20:.1f} MiB, vectorised in {sparse_time:.2f} seconds")
+
+    X_trimmed, y_trimmed = DataProcessor.remove_nan_rows(X_sparse, y["y2"])
+    X_dense_trimmed, _ = DataProcessor.remove_nan_rows(X_dense, y["y2"])
+    y_trimmed = y_trimmed.astype(str)
+    for model_name in model_names:
+        timings = []
+        for X in (X_dense_trimmed, X_trimmed):
+            context = ClassificationContextFactory.create_context(model_name)
+            start_time = time.perf_counter()
+            context.train_model(X, y_trimmed)
+            context.evaluate_model(X, y_trimmed)
+            timings.append(time.perf_counter() - start_time)
+        logger.log(f"{model_name.ljust(20)} train + evaluate: dense {timings[0]:.2f}s | sparse {timings[1]:.2f}s")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10, sys.argv[2:])
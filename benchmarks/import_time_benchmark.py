@@ -0,0 +1,65 @@
+# Benchmark: cold start of each command, the wall time of a fresh `python main.py ...` process and where its import
+# time goes, from the report of python -X importtime. Also shows which heavy libraries each command ends up importing.
+# Commands that need saved models or data that is missing still run, they fail after their imports are done.
+# Run from the project root with: python -m benchmarks.import_time_benchmark [repeats]
+import os
+import subprocess
+import sys
+import time
+
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+COMMANDS = [
+    ["-l"],
+    ["-u", "-c", "data/sample_emails.csv"],
+    ["-u", "online", "-c", "data/sample_emails.csv"],
+]
+
+# Libraries that take long to import, only the commands that use them should import them
+HEAVY_LIBRARIES = ["sklearn", "scipy", "pandas", "torch", "transformers", "stanza"]
+
+
+def parse_import_times(report: str) -> dict:
+    """Returns module name -> (self, cumulative) import time in seconds from a -X importtime report"""
+    import_times = {}
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        # Nested imports are indented, the first time a module is reported is when it was imported
+        import_times.setdefault(module.strip(), (int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return import_times
+
+
+def measure(args: list) -> tuple:
+    """Runs main.py with args in a fresh process, returns its wall time, exit code and import times"""
+    start_time = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "main.py", *args],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, env=os.environ)
+    elapsed = time.perf_counter() - start_time
+    return elapsed, completed.returncode, parse_import_times(completed.stderr)
+
+
+def run(repeats: int = 3) -> None:
+    logger = PrefixLogger(InfoLogger(), "ImportTimeBenchmark")
+    logger.log(f"Saved models: {os.path.exists(Config.MODEL_BUNDLE_PATH)}, "
+               f"online models: {os.path.exists(Config.ONLINE_MODEL_BUNDLE_PATH)}")
+
+    for args in COMMANDS:
+        # The fastest run is reported, the others include noise from the rest of the machine
+        elapsed, exit_code, import_times = min((measure(args) for _ in range(repeats)), key=lambda run: run[0])
+        total_import_time = sum(self_time for self_time, _ in import_times.values())
+        heavy = [library for library in HEAVY_LIBRARIES if library in import_times]
+        logger.log(f"main.py {' '.join(args)} (exit code {exit_code}): {elapsed:.3f}s wall, "
+                   f"{total_import_time:.3f}s importing {len(import_times)} modules")
+        logger.log(f"    heavy libraries imported: {', '.join(heavy) or 'none'}")
+        slowest = sorted(((module, cumulative) for module, (_, cumulative) in import_times.items()
+                          if module in HEAVY_LIBRARIES or module.split(".")[0] not in HEAVY_LIBRARIES),
+                         key=lambda entry: entry[1], reverse=True)[:5]
+        logger.log("    slowest imports: " + ", ".join(f"{module} {cumulative:.3f}s" for module, cumulative in slowest))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,47 @@
+# Benchmark: compares the tiered language detector against per-text stanza detection on the training data.
+# Run from the project root with: python -m benchmarks.language_detection_benchmark [directory]
+import sys
+import time
+
+from preprocessing.language_detector import LanguageDetector
+from preprocessing.translation_engine import TranslationEngine
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+def run(directory: str = "data/training_data") -> None:
+    logger = PrefixLogger(InfoLogger(), "LanguageDetectionBenchmark")
+    df = FileManager().load_all_csvs_in_directory(directory)
+    texts = []
+    for column in (Config.TICKET_SUMMARY, Config.INTERACTION_CONTENT):
+        texts.extend(df[column].fillna("").astype(str).tolist())
+
+    nlp_stanza = TranslationEngine().language_identifier
+
+    # Current behaviour: one stanza call per text
+    start_time = time.perf_counter()
+    per_text = [nlp_stanza(text).lang if text != "" else None for text in texts]
+    per_text_time = time.perf_counter() - start_time
+
+    detector = LanguageDetector(lambda: nlp_stanza)
+    start_time = time.perf_counter()
+    tiered = detector.detect(texts)
+    tiered_time = time.perf_counter() - start_time
+
+    agreement = sum(a == b for a, b in zip(per_text, tiered)) / len(texts)
+    fast_path = [(a, text) for a, b, text in zip(per_text, tiered, texts) if b == "en" and a != "en"]
+
+    logger.log(f"{len(texts)} texts")
+    logger.log(f"Per-text stanza: {per_text_time:.2f} seconds")
+    logger.log(f"Tiered detector: {tiered_time:.2f} seconds")
+    detector.log_tier_counts()
+    logger.log(f"Agreement with per-text detection: {agreement * 100:.2f}%")
+    logger.log(f"Fast path decisions stanza disagrees with: {len(fast_path)}")
+    for lang, text in fast_path[:10]:
+        logger.log(f"    {lang}: {text[:80]}")
+
+
+if __name__ == '__main__':
+    run(*sys.argv[1:2])
@@ -0,0 +1,103 @@
+# Benchmark: messages per second through the logger decorators, written to a file as when the output is redirected.
+# The logging used before built its decorator chain for every message and printed every line on its own with colour
+# codes, it is reproduced below as the baseline. Then the precomposed chains of the logging core are measured with
+# buffered and non-blocking writes, and with info messages turned off.
+# Run from the project root with: python -m benchmarks.logging_benchmark [messages]
+import os
+import sys
+import tempfile
+import time
+
+from colorama import Fore, Style
+
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.indentation_decorator import IndentationDecorator
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.logger.log_handler import LogHandler
+from utilities.logger.log_level import LogLevel
+
+
+class LegacyInfoLogger:
+    def log(self, message):
+        # A colour decorator was built for every message
+        coloured_logger = LegacyDecorator(self, Fore.LIGHTCYAN_EX, Style.RESET_ALL)
+        coloured_logger.write(message)
+
+    def write(self, message):
+        print("[INFO]", message, flush=True)
+
+
+class LegacyDecorator:
+    def __init__(self, logger, before: str, after: str = ""):
+        self.logger = logger
+        self.before = before
+        self.after = after
+
+    def log(self, message=""):
+        self.logger.log(f"{self.before}{message}{self.after}")
+
+    def write(self, message):
+        self.logger.write(f"{self.before}{message}{self.after}")
+
+
+def legacy_display(messages: int) -> None:
+    """Logs like ResultsDisplayer did, building its prefix and indentation chain for every email"""
+    for index in range(messages):
+        display_logger = LegacyDecorator(LegacyDecorator(LegacyInfoLogger(), "[ResultsDisplayer] "), "    ")
+        display_logger.log(f"Ticket summary: message {index}")
+
+
+def precomposed_display(messages: int) -> None:
+    display_logger = IndentationDecorator(PrefixLogger(InfoLogger(), "ResultsDisplayer"))
+    for index in range(messages):
+        display_logger.log(f"Ticket summary: message {index}")
+
+
+def guarded_display(messages: int) -> None:
+    display_logger = IndentationDecorator(PrefixLogger(InfoLogger(), "ResultsDisplayer"))
+    for index in range(messages):
+        if display_logger.is_enabled():
+            display_logger.log(f"Ticket summary: message {index}")
+
+
+def measure(log_messages, messages: int, stream) -> float:
+    """Returns messages per second, including writing out what is still buffered"""
+    handler = LogHandler()
+    start_time = time.perf_counter()
+    log_messages(messages)
+    handler.flush()
+    stream.flush()
+    return messages / (time.perf_counter() - start_time)
+
+
+def run(messages: int = 200000) -> None:
+    logger = PrefixLogger(InfoLogger(), "LoggingBenchmark")
+    handler = LogHandler()
+    results = []
+
+    with tempfile.TemporaryDirectory() as directory, open(os.path.join(directory, "log.txt"), "w") as stream:
+        real_stdout = sys.stdout
+        sys.stdout = stream
+        try:
+            handler.configure(stream=stream, level=LogLevel.INFO)
+            results.append(("decorators built per message, unbuffered print",
+                            measure(legacy_display, messages, stream)))
+            results.append(("precomposed, buffered", measure(precomposed_display, messages, stream)))
+            handler.configure(level=LogLevel.WARNING)
+            results.append(("precomposed, info turned off", measure(precomposed_display, messages, stream)))
+            results.append(("precomposed, info turned off, is_enabled guard",
+                            measure(guarded_display, messages, stream)))
+            # The background writer keeps running once started, so it is measured last
+            handler.configure(level=LogLevel.INFO, non_blocking=True)
+            results.append(("precomposed, non-blocking", measure(precomposed_display, messages, stream)))
+        finally:
+            handler.configure(stream=real_stdout)
+            sys.stdout = real_stdout
+
+    baseline = results[0][1]
+    for name, rate in results:
+        logger.log(f"{name.ljust(50)}: {rate:12,.0f} messages/s ({rate / baseline:6.1f}x)")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
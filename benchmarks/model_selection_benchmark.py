@@ -0,0 +1,60 @@
+# Benchmark: wall-clock time of training every candidate and scoring it on its own training data, as -r did before,
+# against successive halving followed by training only the selected models on all rows.
+# Run from the project root with: python -m benchmarks.model_selection_benchmark [repeats]
+import sys
+import time
+
+from preprocessing.processor import DataProcessor, VectoriserManager
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.model_selector import SuccessiveHalvingSelector
+from utilities.training_scheduler import TrainingScheduler
+from utilities.utility import Utils
+
+
+def run(repeats: int = 1) -> None:
+    logger = PrefixLogger(InfoLogger(), "ModelSelectionBenchmark")
+
+    df = FileManager().load_csv(Config.PREPROCESSED_CSV_PATH)
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
+    df = df.loc[df.index.repeat(repeats)].reset_index(drop=True)
+    df = DataProcessor.order_by_labels(df)
+    vectoriser = VectoriserManager()
+    vectoriser.fit_vectoriser(df["x_ic"])
+    X, y = vectoriser.vectorize_data(df)
+
+    start_time = time.perf_counter()
+    scheduler = TrainingScheduler(workers=1)
+    best_scores = {label_name: 0 for label_name in y}
+    exhaustive_models = {label_name: "None" for label_name in y}
+    for model_name in Utils.CANDIDATE_MODELS:
+        trained_models = scheduler.train_selected(X, y, {label_name: model_name for label_name in y})
+        for label_name, y_val in y.items():
+            X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X, y_val)
+            score = trained_models[label_name].evaluate_model(X_trimmed, y_trim_val.astype(str))
+            if score > best_scores[label_name]:
+                best_scores[label_name] = score
+                exhaustive_models[label_name] = model_name
+    exhaustive_time = time.perf_counter() - start_time
+
+    selector = SuccessiveHalvingSelector(workers=1)
+    scheduler = TrainingScheduler(workers=1)
+    start_time = time.perf_counter()
+    selected_models = selector.select_all(X, y, Utils.CANDIDATE_MODELS)
+    scheduler.train_selected(X, y, selected_models)
+    halving_time = time.perf_counter() - start_time
+
+    for label_name in y:
+        logger.log(f"{label_name}: train everything picks {exhaustive_models[label_name].ljust(20)} | "
+                   f"successive halving picks {selected_models[label_name]}")
+    logger.log(f"Train everything:   {exhaustive_time:.2f} seconds")
+    logger.log(f"Successive halving: {halving_time:.2f} seconds ({exhaustive_time / halving_time:.1f}x faster), "
+               f"{selector.selection_time:.2f} seconds selecting and {scheduler.wall_time:.2f} seconds "
+               f"training the selected models")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1)
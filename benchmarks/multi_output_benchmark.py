@@ -0,0 +1,79 @@
+# Benchmark: one multi-output forest predicting y1..y4 together against a random forest per label.
+# Compares training time, prediction throughput and held-out accuracy, each label scored on the rows that have it.
+# Run from the project root with: python -m benchmarks.multi_output_benchmark [repeats]
+import sys
+import time
+
+import numpy as np
+
+from model.factory.classification_factory import ClassificationContextFactory
+from preprocessing.incremental_preprocessor import IncrementalPreprocessor
+from preprocessing.processor import DataProcessor, VectoriserManager
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.utility import Utils
+
+
+def labelled_accuracy(y_true, y_pred) -> float:
+    labelled = DataProcessor.labelled_mask(y_true)
+    return float(np.mean(np.asarray(y_pred)[labelled] == y_true[labelled].astype(str)) * 100)
+
+
+def run(repeats: int = 20) -> None:
+    logger = PrefixLogger(InfoLogger(), "MultiOutputBenchmark")
+
+    df = IncrementalPreprocessor().load_store(columns=Config.PREPROCESSED_COLUMNS)
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
+    vectoriser = VectoriserManager()
+    vectoriser.fit_vectoriser(df["x_ic"])
+    X, y = vectoriser.vectorize_data(df)
+
+    # Hold out a quarter of the emails for scoring
+    rng = np.random.default_rng(0)
+    test = rng.random(X.shape[0]) < 0.25
+    X_train, X_test = X[~test], X[test]
+    y_train = {label_name: y_val[~test] for label_name, y_val in y.items()}
+    y_test = {label_name: y_val[test] for label_name, y_val in y.items()}
+    # Throughput is measured on the held-out emails repeated, accuracy on them once
+    X_throughput = X_test[np.tile(np.arange(X_test.shape[0]), repeats)]
+
+    start_time = time.perf_counter()
+    per_label = {}
+    for label_name, y_val in y_train.items():
+        X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X_train, y_val)
+        per_label[label_name] = ClassificationContextFactory.create_context("random_forest")
+        per_label[label_name].train_model(X_trimmed, y_trim_val.astype(str))
+    per_label_train_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    labelled = DataProcessor.labelled_mask(y_train["y1"])
+    multi_output = ClassificationContextFactory.create_context("multi_output_forest")
+    multi_output.train_model(X_train[labelled], Utils.stack_labels(y_train)[labelled].astype(str))
+    multi_output_train_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for model in per_label.values():
+        model.classify_batch(X_throughput, [], [])
+    per_label_predict_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    multi_output.classify_batch(X_throughput, [], [])
+    multi_output_predict_time = time.perf_counter() - start_time
+
+    multi_output_predictions = multi_output.classify_batch(X_test, [], [])
+    for label_index, (label_name, y_val) in enumerate(y_test.items()):
+        per_label_accuracy = labelled_accuracy(y_val, per_label[label_name].classify_batch(X_test, [], []))
+        multi_output_accuracy = labelled_accuracy(y_val, multi_output_predictions[:, label_index])
+        logger.log(f"{label_name} accuracy: forest per label {per_label_accuracy:.2f}% | "
+                   f"multi-output forest {multi_output_accuracy:.2f}%")
+
+    n_emails = X_throughput.shape[0]
+    logger.log(f"Training:   forest per label {per_label_train_time:.2f}s | "
+               f"multi-output forest {multi_output_train_time:.2f}s")
+    logger.log(f"Prediction: forest per label {n_emails / per_label_predict_time:.0f} emails/s | "
+               f"multi-output forest {n_emails / multi_output_predict_time:.0f} emails/s")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
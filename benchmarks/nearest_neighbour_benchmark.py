@@ -0,0 +1,77 @@
+# Benchmark: latency and recall of the k-NN backends on the TF-IDF features of synthetic emails.
+# The KNeighborsClassifier used before scans every training row by euclidean distance. The cosine neighbours
+# classifier is measured with its exact index and with LSH indexes of several sizes. Recall is the share of the
+# neighbours an index returns that are as similar to the query as the k-th exact neighbour, so ties count as found.
+# Run from the project root with: python -m benchmarks.nearest_neighbour_benchmark [training rows] [queries]
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_emails import SyntheticEmailGenerator
+from model.neighbours.cosine_neighbours_classifier import CosineNeighboursClassifier
+from preprocessing.processor import DataProcessor, VectoriserManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+# (tables, bits) of the LSH indexes measured
+LSH_SETTINGS = [(4, 16), (8, 16), (8, 12), (16, 12), (16, 8)]
+
+
+def synthetic_features(rows: int) -> tuple:
+    """Returns the TF-IDF features and the Type 2 labels of rows synthetic emails"""
+    df = SyntheticEmailGenerator(duplicate_rate=0).generate(rows)
+    df = DataProcessor.renaming_cols(df)
+    df = DataProcessor.remove_noise(df)
+    vectoriser = VectoriserManager()
+    vectoriser.fit_vectoriser(df["x_ic"])
+    X, y = vectoriser.vectorize_data(df)
+    return X, y["y2"].astype(str)
+
+
+def recall(similarities: np.ndarray, exact_similarities: np.ndarray) -> float:
+    return float(np.mean(similarities >= exact_similarities[:, -1:] - 1e-5))
+
+
+def measure(classifier, X_train, y_train, X_test) -> tuple:
+    """Returns the fit and query time, the neighbour similarities and the predictions of a classifier"""
+    start_time = time.perf_counter()
+    classifier.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    distances, _ = classifier.kneighbors(X_test)
+    predictions = classifier.predict(X_test)
+    query_time = time.perf_counter() - start_time
+    return fit_time, query_time, 1 - distances, predictions
+
+
+def run(rows: int = 20000, queries: int = 1000) -> None:
+    logger = PrefixLogger(InfoLogger(), "NearestNeighbourBenchmark")
+    X, y = synthetic_features(rows + queries)
+    X_train, y_train, X_test = X[:rows], y[:rows], X[rows:]
+    logger.log(f"{rows} training rows, {queries} queries, {X.shape[1]} features")
+
+    from sklearn.neighbors import KNeighborsClassifier
+    start_time = time.perf_counter()
+    euclidean = KNeighborsClassifier().fit(X_train, y_train)
+    euclidean_predictions = euclidean.predict(X_test)
+    euclidean_time = time.perf_counter() - start_time
+    logger.log(f"{'euclidean KNeighborsClassifier'.ljust(30)}: fit and query {euclidean_time:8.3f}s")
+
+    _, exact_time, exact_similarities, exact_predictions = measure(CosineNeighboursClassifier(index="exact"),
+                                                                   X_train, y_train, X_test)
+    logger.log(f"{'cosine exact'.ljust(30)}: query {exact_time:8.3f}s ({euclidean_time / exact_time:5.1f}x), "
+               f"same prediction as euclidean {np.mean(exact_predictions == euclidean_predictions):.3f}")
+
+    for n_tables, n_bits in LSH_SETTINGS:
+        classifier = CosineNeighboursClassifier(index="lsh", n_tables=n_tables, n_bits=n_bits, random_state=0)
+        fit_time, query_time, similarities, predictions = measure(classifier, X_train, y_train, X_test)
+        logger.log(f"{f'cosine lsh {n_tables} tables x {n_bits} bits'.ljust(30)}: query {query_time:8.3f}s "
+                   f"({exact_time / query_time:5.1f}x exact), index {fit_time:6.3f}s, "
+                   f"recall {recall(similarities, exact_similarities):.3f}, "
+                   f"same prediction as exact {np.mean(predictions == exact_predictions):.3f}, "
+                   f"answered exactly {classifier.index_.exact_fallbacks}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,125 @@
+# Benchmark and equivalence check: compares NoiseRemover against the original one-pass-per-pattern noise removal.
+# Run from the project root with: python -m benchmarks.noise_removal_benchmark [directory] [repeats]
+# Exits with status 1 if any text is cleaned differently.
+import random
+import sys
+import time
+
+import pandas as pd
+
+from preprocessing.noise_remover import NoiseRemover
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.error_logger import ErrorLogger
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+def legacy_remove_noise(data_frame):
+    """The original DataProcessor.remove_noise, kept as the reference implementation"""
+    noise = "(sv\\s*:)|(wg\\s*:)|(ynt\\s*:)|(fw(d)?\\s*:)|(r\\s*:)|(re\\s*:)|(\\[|\\])|(aspiegel support issue submit)|(null)|(nan)|((bonus place my )?support.pt 自动回复:)"
+    data_frame["x_ts"] = data_frame["x_ts"].str.lower().replace(noise, " ", regex=True).replace(r'\\s+', ' ', regex=True).str.strip()
+
+    data_frame["x_ic"] = data_frame["x_ic"].str.lower()
+    noise_1 = [
+        "(from :)|(subject :)|(sent :)|(r\\s*:)|(re\\s*:)",
+        "(january|february|march|april|may|june|july|august|september|october|november|december)",
+        "(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)",
+        "(monday|tuesday|wednesday|thursday|friday|saturday|sunday)",
+        "\\d{2}(:|.)\\d{2}",
+        "(xxxxx@xxxx\\.com)|(\\*{5}\\([a-z]+\\))",
+        "dear ((customer)|(user))",
+        "dear",
+        "(hello)|(hallo)|(hi )|(hi there)",
+        "good morning",
+        "thank you for your patience ((during (our)? investigation)|(and cooperation))?",
+        "thank you for contacting us",
+        "thank you for your availability",
+        "thank you for providing us this information",
+        "thank you for contacting",
+        "thank you for reaching us (back)?",
+        "thank you for patience",
+        "thank you for (your)? reply",
+        "thank you for (your)? response",
+        "thank you for (your)? cooperation",
+        "thank you for providing us with more information",
+        "thank you very kindly",
+        "thank you( very much)?",
+        "i would like to follow up on the case you raised on the date",
+        "i will do my very best to assist you"
+        "in order to give you the best solution",
+        "could you please clarify your request with following information:"
+        "in this matter",
+        "we hope you(( are)|('re)) doing ((fine)|(well))",
+        "i would like to follow up on the case you raised on",
+        "we apologize for the inconvenience",
+        "sent from my huawei (cell )?phone",
+        "original message",
+        "customer support team",
+        "(aspiegel )?se is a company incorporated under the laws of ireland with its headquarters in dublin, ireland.",
+        "(aspiegel )?se is the provider of huawei mobile services to huawei and honor device owners in",
+        "canada, australia, new zealand and other countries",
+        "\\d+",
+        "[^0-9a-zA-Z]+",
+        "(\\s|^).(\\s|$)"]
+    for noise in noise_1:
+        data_frame["x_ic"] = data_frame["x_ic"].replace(noise, " ", regex=True)
+    data_frame["x_ic"] = data_frame["x_ic"].replace(r'\\s+', ' ', regex=True).str.strip()
+
+    return data_frame
+
+
+def fuzz_texts(texts: list, count: int, seed: int = 0) -> list:
+    """Builds adversarial texts by gluing fragments of real texts and noise phrases together"""
+    rng = random.Random(seed)
+    fragments = ["dear", " customer", "thank you", " for", "junovember", "12:30", "\\ss", "r :", "*****(person)",
+                 "xxxxx@xxxx.com", " a ", "hi there", "2023", "é", "٣", "\t", "  ", "we hope you're doing well",
+                 # Characters that Python and the Arrow strings of Series.str lowercase differently, and unicode spaces and digits
+                 "İletişim", "re\xa0:", "fw\x0b:", "٣٣.٣٣", "12\u200935", "ΣΑΣ", "ǅ"]
+    words = [word for text in texts[:500] for word in text.split()[:20]] or ["text"]
+    fuzzed = []
+    for _ in range(count):
+        parts = [rng.choice(fragments) if rng.random() < 0.5 else rng.choice(words) for _ in range(rng.randint(1, 30))]
+        fuzzed.append(("" if rng.random() < 0.5 else " ").join(parts))
+    return fuzzed
+
+
+def run(directory: str = "data/training_data", repeats: int = 20) -> bool:
+    logger = PrefixLogger(InfoLogger(), "NoiseRemovalBenchmark")
+    error_logger = PrefixLogger(ErrorLogger(), "NoiseRemovalBenchmark")
+
+    df = FileManager().load_all_csvs_in_directory(directory)
+    x_ts = df[Config.TICKET_SUMMARY].fillna("").astype(str).tolist()
+    x_ic = df[Config.INTERACTION_CONTENT].fillna("").astype(str).tolist()
+    x_ts += fuzz_texts(x_ts, 2000, seed=1)
+    x_ic += fuzz_texts(x_ic, 2000, seed=2)
+    data_frame = pd.DataFrame({"x_ts": x_ts * repeats, "x_ic": x_ic * repeats})
+
+    start_time = time.perf_counter()
+    expected = legacy_remove_noise(data_frame.copy())
+    legacy_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    actual_ts = NoiseRemover.clean_ticket_summaries(data_frame["x_ts"].to_list())
+    actual_ic = NoiseRemover.clean_interaction_contents(data_frame["x_ic"].to_list())
+    compiled_time = time.perf_counter() - start_time
+
+    mismatches = 0
+    for column, actual in (("x_ts", actual_ts), ("x_ic", actual_ic)):
+        for original, want, got in zip(data_frame[column], expected[column], actual):
+            if want != got:
+                mismatches += 1
+                if mismatches <= 10:
+                    error_logger.log(f"{column} mismatch for {original[:60]!r}: {want[:60]!r} != {got[:60]!r}")
+
+    logger.log(f"{len(data_frame)} rows ({len(df)} real rows and 2000 fuzzed rows, repeated {repeats} times)")
+    logger.log(f"Series.replace per pattern: {legacy_time:.2f} seconds")
+    logger.log(f"Compiled single pass:      {compiled_time:.2f} seconds ({legacy_time / compiled_time:.1f}x)")
+    logger.log(f"Mismatching texts: {mismatches}")
+    return mismatches == 0
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    equivalent = run(*arguments[:1], *[int(argument) for argument in arguments[1:2]])
+    sys.exit(0 if equivalent else 1)
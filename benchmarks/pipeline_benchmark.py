@@ -0,0 +1,258 @@
+# Benchmark: time of every stage of the pipeline on synthetic emails, see benchmarks/synthetic_emails.py.
+# The emails are written to a csv and go through FileManager loading, de_duplication, translation, remove_noise and
+# vectorisation like the training data. Then every strategy of ClassificationContextFactory is trained on four fifths
+# of them and classifies the rest. Each stage keeps its fastest time over the repeats.
+# The translator is a stub by default: languages are decided by the fast path of the LanguageDetector and nothing is
+# translated, so the stage measures our own code and not the models. --translator local uses the TranslationEngine.
+# Results are saved as a JSON baseline named after the current commit, --compare reports the stages that got slower
+# than in an earlier baseline.
+# Run from the project root with: python -m benchmarks.pipeline_benchmark [--rows N] [--mix en=0.5,de=0.5] ...
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.synthetic_emails import SyntheticEmailGenerator
+from model.factory.classification_factory import ClassificationContextFactory
+from preprocessing.processor import DataProcessor, TranslatorAdaptor, VectoriserManager
+from preprocessing.translation_engine import TranslationEngine
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.concrete_logger.warning_logger import WarningLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.metrics.metrics_registry import MetricsRegistry
+from utilities.utility import Utils
+
+BASELINE_DIR = "benchmarks/baselines"
+
+
+class StubTranslationEngine:
+    """Stands in for the TranslationEngine without loading any model, every text keeps its original form"""
+
+    def __init__(self) -> None:
+        self.detector = TranslationEngine().detector
+
+    def detect_languages(self, texts: list) -> list:
+        # Texts the fast path cannot decide would go to stanza, they are only marked as not english here
+        return [None if text == "" else "en" if self.detector.is_obviously_english(text) else "xx"
+                for text in texts]
+
+    def translate_batched(self, texts: list, batch_size: int = None, languages: list = None) -> list:
+        return list(texts)
+
+
+class StageTimer:
+    def __init__(self) -> None:
+        self.times = {}
+
+    def time(self, stage: str, function, *args, **kwargs):
+        """Runs function and keeps its time if it is the fastest run of the stage so far"""
+        start_time = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start_time
+        self.times[stage] = min(elapsed, self.times.get(stage, elapsed))
+        return result
+
+
+def translate(df, engine):
+    """Translates both text columns like DataProcessor.translate_data_frame, without the translation cache"""
+    for column in ("x_ic", "x_ts"):
+        adaptor = TranslatorAdaptor(df[column].to_list())
+        adaptor.engine = engine
+        # The cache would make every repeat after the first one free
+        adaptor.cache = None
+        df[column] = adaptor.trans_to_en()
+    return df
+
+
+def preprocess(file_path: str, engine, timer: StageTimer):
+    df = timer.time("load_csv", FileManager().load_csv, file_path)
+    df = timer.time("renaming_cols", DataProcessor.renaming_cols, df)
+    df = timer.time("de_duplication", DataProcessor.de_duplication, df).reset_index(drop=True)
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
+    df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
+    df = timer.time("translation", translate, df, engine)
+    df = timer.time("remove_noise", DataProcessor.remove_noise, df)
+    return DataProcessor.order_by_labels(df)
+
+
+def vectorise(df):
+    vectoriser = VectoriserManager()
+    vectoriser.fit_vectoriser(df["x_ic"])
+    return vectoriser.vectorize_data(df)
+
+
+def train(strategy: str, X, y: dict) -> list:
+    """Trains the strategy like -t does, once per label or once for every label for a multi-output strategy"""
+    if strategy in Utils.MULTI_OUTPUT_MODELS:
+        labelled = DataProcessor.labelled_mask(y["y1"])
+        model_context = ClassificationContextFactory.create_context(strategy)
+        model_context.train_model(X[labelled], Utils.stack_labels(y)[labelled].astype(str))
+        model_context.set_label_names(list(y))
+        return [model_context]
+    models = []
+    for label_name, y_val in y.items():
+        model_context = ClassificationContextFactory.create_context(strategy)
+        X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X, y_val)
+        model_context.train_model(X_trimmed, y_trim_val.astype(str))
+        model_context.set_label_names([label_name])
+        models.append(model_context)
+    return models
+
+
+def classify(models: list, X, df) -> dict:
+    """Classifies every row of X with every model, returns the predictions of each label"""
+    ts = df["x_ts"].to_numpy()
+    ic = df["x_ic"].to_numpy()
+    predictions = {}
+    for model in models:
+        classifications = model.classify_batch(X, ts, ic)
+        predictions.update(zip(model.label_names, np.transpose(classifications) if np.ndim(classifications) == 2
+                               else [classifications]))
+    return predictions
+
+
+def accuracy(predictions: dict, y: dict) -> dict:
+    """Accuracy of each label on the rows that have it"""
+    scores = {}
+    for label_name, y_val in y.items():
+        labelled = DataProcessor.labelled_mask(y_val)
+        if labelled.any():
+            scores[label_name] = round(float(np.mean(np.asarray(predictions[label_name])[labelled]
+                                                     == y_val[labelled].astype(str))), 4)
+    return scores
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def benchmark(rows: int, language_mix: dict, translator: str, strategies: list, repeats: int, seed: int) -> dict:
+    generator = SyntheticEmailGenerator(language_mix, seed=seed)
+    engine = TranslationEngine() if translator == "local" else StubTranslationEngine()
+    timer = StageTimer()
+    scores = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "emails.csv")
+        timer.time("generate", generator.write, rows, file_path)
+        for _ in range(repeats):
+            df = preprocess(file_path, engine, timer)
+            X, y = timer.time("vectorisation", vectorise, df)
+            # Every fifth email is held out and classified
+            held_out = np.arange(len(df)) % 5 == 0
+            train_rows = np.flatnonzero(~held_out)
+            X_train, y_train = X[train_rows], {label_name: y_val[train_rows] for label_name, y_val in y.items()}
+            X_test, y_test = X[held_out], {label_name: y_val[held_out] for label_name, y_val in y.items()}
+            for strategy in strategies:
+                models = timer.time(f"train/{strategy}", train, strategy, X_train, y_train)
+                predictions = timer.time(f"classify/{strategy}", classify, models, X_test, df[held_out])
+                scores[strategy] = accuracy(predictions, y_test)
+
+    return {
+        "commit": current_commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "settings": {"rows": rows, "language_mix": generator.language_mix, "translator": translator,
+                     "strategies": strategies, "repeats": repeats, "seed": seed},
+        "stages": {stage: round(seconds, 6) for stage, seconds in timer.times.items()},
+        "accuracy": scores,
+    }
+
+
+def save(result: dict, file_path: str = None) -> str:
+    file_path = file_path or os.path.join(BASELINE_DIR, f"{result['commit']}.json")
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(file_path, "w") as baseline_file:
+        json.dump(result, baseline_file, indent=4)
+    return file_path
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Logs every stage against the baseline, returns the stages more than tolerance slower"""
+    logger = PrefixLogger(InfoLogger(), "PipelineBenchmark")
+    warning_logger = PrefixLogger(WarningLogger(), "PipelineBenchmark")
+    if result["settings"] != baseline["settings"]:
+        warning_logger.log(f"Settings differ from the baseline of {baseline['commit']}, times may not be comparable")
+    regressions = []
+    for stage, seconds in result["stages"].items():
+        baseline_seconds = baseline["stages"].get(stage)
+        if not baseline_seconds:
+            logger.log(f"{stage.ljust(40)}: {seconds:9.4f}s (not in baseline)")
+            continue
+        ratio = seconds / baseline_seconds
+        regressed = ratio > 1 + tolerance
+        if regressed:
+            regressions.append(stage)
+        logger.log(f"{stage.ljust(40)}: {seconds:9.4f}s against {baseline_seconds:9.4f}s ({ratio:5.2f}x)"
+                   f"{'  REGRESSION' if regressed else ''}")
+    for strategy, scores in result["accuracy"].items():
+        for label_name, score in scores.items():
+            baseline_score = baseline.get("accuracy", {}).get(strategy, {}).get(label_name)
+            if baseline_score is not None and score < baseline_score - 0.01:
+                warning_logger.log(f"{strategy} {label_name}: accuracy {score:.4f} against {baseline_score:.4f}")
+    return regressions
+
+
+def run(args) -> int:
+    logger = PrefixLogger(InfoLogger(), "PipelineBenchmark")
+    # The models trained here are not the ones of the real runs, their latencies are kept out of data/metrics
+    MetricsRegistry().directory = None
+
+    strategies = (args.strategies.split(",") if args.strategies
+                  else list(ClassificationContextFactory.constructor_selector))
+    mix = SyntheticEmailGenerator.parse_language_mix(args.mix) if args.mix else None
+    result = benchmark(args.rows, mix, args.translator, strategies, args.repeats, args.seed)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(result, baseline, args.tolerance)
+        logger.log(f"{len(regressions)} of {len(result['stages'])} stages slower than the baseline of "
+                   f"{baseline['commit']} by more than {args.tolerance:.0%}")
+    else:
+        for stage, seconds in result["stages"].items():
+            logger.log(f"{stage.ljust(40)}: {seconds:9.4f}s")
+        regressions = []
+    for strategy, scores in result["accuracy"].items():
+        logger.log(f"{strategy.ljust(25)} accuracy: " + ", ".join(f"{label_name} {score:.3f}"
+                                                                    for label_name, score in scores.items()))
+
+    if not args.no_save:
+        logger.log(f"Saved baseline to {save(result, args.output)}")
+    return 1 if regressions else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.pipeline_benchmark",
+                                     description="Times every stage of the pipeline on synthetic emails")
+    parser.add_argument("--rows", type=int, default=5000, help="number of emails generated")
+    parser.add_argument("--mix", help="share of each language, e.g. en=0.5,de=0.3,fr=0.2")
+    parser.add_argument("--translator", choices=("stub", "local"), default="stub",
+                        help="stub skips the translation models, local runs the TranslationEngine")
+    parser.add_argument("--strategies", help="comma separated factory strategies, all of them by default")
+    parser.add_argument("--repeats", type=int, default=1, help="each stage keeps its fastest time over the repeats")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help=f"where the baseline is saved, {BASELINE_DIR}/<commit>.json by default")
+    parser.add_argument("--no-save", action="store_true", help="do not save a baseline")
+    parser.add_argument("--compare", help="baseline to compare with, the exit code is 1 if a stage regressed")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="how much slower than the baseline a stage may get, 0.2 is 20%% slower")
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    exit(run(parse_args()))
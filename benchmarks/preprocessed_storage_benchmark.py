@@ -0,0 +1,79 @@
+# Benchmark: load time and memory of the preprocessed data as csv, Parquet and Feather, and of reading many training
+# files with the concat-in-a-loop used before against parallel reads concatenated once.
+# Every load runs in a fresh process so its peak RSS is not hidden by an earlier one.
+# Run from the project root with: python -m benchmarks.preprocessed_storage_benchmark [repeats] [files]
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_all_csvs_in_loop(directory_path: str) -> pd.DataFrame:
+    """The ingestion used before, every concat copies everything read so far"""
+    combined_df = pd.DataFrame()
+    for file_path in os.listdir(directory_path):
+        csv = FileManager().load_csv(os.path.join(directory_path, file_path))
+        combined_df = pd.concat([combined_df, csv], axis=0, ignore_index=True)
+    return combined_df
+
+
+def measure(load, *args) -> tuple:
+    """Runs in a fresh process, returns the load time and the peak RSS it added"""
+    # Imported first so the Parquet and Feather readers are not charged for loading the library
+    import pyarrow.feather, pyarrow.parquet  # noqa: F401
+    baseline = peak_rss_mib()
+    start_time = time.perf_counter()
+    df = load(*args)
+    elapsed = time.perf_counter() - start_time
+    return elapsed, peak_rss_mib() - baseline, len(df)
+
+
+def run_isolated(load, *args) -> tuple:
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(measure, (load, *args))
+
+
+def run(repeats: int = 100, files: int = 20) -> None:
+    logger = PrefixLogger(InfoLogger(), "PreprocessedStorageBenchmark")
+    file_manager = FileManager()
+
+    with tempfile.TemporaryDirectory() as directory:
+        df = file_manager.load_csv(Config.PREPROCESSED_CSV_PATH)
+        df = pd.concat([df] * repeats, ignore_index=True)
+        for extension in (".csv", ".parquet", ".feather"):
+            path = os.path.join(directory, "preprocessed" + extension)
+            file_manager.save_table(df, path)
+            full_time, full_rss, _ = run_isolated(file_manager.load_table, path)
+            projected_time, projected_rss, rows = run_isolated(file_manager.load_table, path,
+                                                               Config.PREPROCESSED_COLUMNS)
+            logger.log(f"{extension.ljust(9)} {os.path.getsize(path) / 2 ** 20:7.1f} MiB on disk | "
+                       f"all columns {full_time:.3f}s +{full_rss:.0f} MiB | "
+                       f"training columns {projected_time:.3f}s +{projected_rss:.0f} MiB ({rows} rows)")
+
+        training_directory = os.path.join(directory, "training_data")
+        os.makedirs(training_directory)
+        training_df = file_manager.load_all_csvs_in_directory("data/training_data")
+        for index in range(files):
+            training_df.to_csv(os.path.join(training_directory, f"part_{index}.csv"), index=False)
+        loop_time, loop_rss, rows = run_isolated(load_all_csvs_in_loop, training_directory)
+        parallel_time, parallel_rss, _ = run_isolated(file_manager.load_all_csvs_in_directory, training_directory)
+        logger.log(f"{files} training files ({rows} rows): concat in a loop {loop_time:.3f}s +{loop_rss:.0f} MiB | "
+                   f"parallel, concat once {parallel_time:.3f}s +{parallel_rss:.0f} MiB")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
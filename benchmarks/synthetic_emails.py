@@ -0,0 +1,210 @@
+# Synthetic support emails for the benchmarks, in the schema of the training data exports.
+# Every email has a topic, which decides its four labels, written in one of several languages with the greetings,
+# signatures and masked contact details the noise removal strips from real emails. Order numbers and app names make
+# most texts unique, so caches do not hide the cost of a stage.
+# Write a csv from the project root with: python -m benchmarks.synthetic_emails <path/to/file.csv> [rows] [mix]
+# where mix is the share of each language, e.g. en=0.5,de=0.3,fr=0.2
+import sys
+
+import numpy as np
+import pandas as pd
+
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+APP_GALLERY = "AppGallery &amp; Games "
+IN_APP_PURCHASE = "In-App Purchase "
+
+# Labels (Type 1 to Type 4) of each topic and its ticket summary and sentence in each language. Labels are nested
+# like in the exports: a topic without Type 3 has no Type 4 either
+TOPICS = [
+    ((APP_GALLERY, "Problem/Fault", "AppGallery-Install/Upgrade", "Can't install Apps"), {
+        "en": ("[AppGallery]Problems and Suggestions", "the app {app} cannot be installed, the installation stops"),
+        "de": ("[AppGallery]Probleme und Vorschläge", "die App {app} lässt sich nicht installieren"),
+        "fr": ("[AppGallery]Problèmes et suggestions", "impossible d'installer l'application {app}"),
+        "es": ("[AppGallery]Problemas y sugerencias", "no puedo instalar la aplicación {app}"),
+        "it": ("[AppGallery]Problemi e suggerimenti", "non riesco a installare l'app {app}"),
+    }),
+    ((APP_GALLERY, "Problem/Fault", "AppGallery-Install/Upgrade", "Can't update Apps"), {
+        "en": ("Update failed", "the update of {app} fails every time I try it"),
+        "de": ("Update fehlgeschlagen", "das Update von {app} schlägt jedes Mal fehl"),
+        "fr": ("Échec de la mise à jour", "la mise à jour de {app} échoue à chaque fois"),
+        "es": ("Error de actualización", "la actualización de {app} falla cada vez"),
+        "it": ("Aggiornamento non riuscito", "l'aggiornamento di {app} non riesce mai"),
+    }),
+    ((APP_GALLERY, "Problem/Fault", "AppGallery-Use", "AppGallery not loading"), {
+        "en": ("AppGallery does not open", "AppGallery keeps loading and never shows the apps"),
+        "de": ("AppGallery öffnet nicht", "AppGallery lädt ständig und zeigt keine Apps an"),
+        "fr": ("AppGallery ne s'ouvre pas", "AppGallery charge sans fin et n'affiche aucune application"),
+        "es": ("AppGallery no abre", "AppGallery se queda cargando y no muestra las aplicaciones"),
+        "it": ("AppGallery non si apre", "AppGallery continua a caricare e non mostra le app"),
+    }),
+    ((APP_GALLERY, "Suggestion", "Third Party APPs", "Personal data"), {
+        "en": ("Question about my data", "which personal data does {app} collect about me"),
+        "de": ("Frage zu meinen Daten", "welche persönlichen Daten sammelt {app} über mich"),
+        "fr": ("Question sur mes données", "quelles données personnelles {app} collecte sur moi"),
+        "es": ("Pregunta sobre mis datos", "qué datos personales recoge {app} sobre mí"),
+        "it": ("Domanda sui miei dati", "quali dati personali raccoglie {app} su di me"),
+    }),
+    ((APP_GALLERY, "Others", None, None), {
+        "en": ("Feedback", "I just wanted to say that I like the new design"),
+        "de": ("Rückmeldung", "ich wollte nur sagen, dass mir das neue Design gefällt"),
+        "fr": ("Avis", "je voulais juste dire que j'aime le nouveau design"),
+        "es": ("Comentario", "solo quería decir que me gusta el nuevo diseño"),
+        "it": ("Commento", "volevo solo dire che mi piace il nuovo design"),
+    }),
+    ((IN_APP_PURCHASE, "Suggestion", "Payment", "Subscription cancellation"), {
+        "en": ("Cancel subscription", "please cancel my subscription to {app}, I was charged again"),
+        "de": ("Abonnement kündigen", "bitte kündigen Sie mein Abonnement für {app}, ich wurde erneut belastet"),
+        "fr": ("Résilier l'abonnement", "veuillez résilier mon abonnement à {app}, j'ai encore été débité"),
+        "es": ("Cancelar suscripción", "por favor cancelen mi suscripción a {app}, me cobraron otra vez"),
+        "it": ("Annullare abbonamento",
+               "per favore annullate il mio abbonamento a {app}, mi hanno addebitato di nuovo"),
+    }),
+    ((IN_APP_PURCHASE, "Problem/Fault", "Payment", "Refund"), {
+        "en": ("Refund request", "I want a refund for the purchase in {app}, it never arrived"),
+        "de": ("Rückerstattung", "ich möchte eine Rückerstattung für den Kauf in {app}, er kam nie an"),
+        "fr": ("Demande de remboursement", "je veux un remboursement pour l'achat dans {app}, il n'est jamais arrivé"),
+        "es": ("Solicitud de reembolso", "quiero un reembolso de la compra en {app}, nunca llegó"),
+        "it": ("Richiesta di rimborso", "voglio un rimborso per l'acquisto in {app}, non è mai arrivato"),
+    }),
+    ((IN_APP_PURCHASE, "Suggestion", "Coupon/Gifts/Points Issues", "Offers / Vouchers / Promotions"), {
+        "en": ("Voucher not working", "the voucher code for {app} is not accepted at checkout"),
+        "de": ("Gutschein funktioniert nicht", "der Gutscheincode für {app} wird beim Bezahlen nicht akzeptiert"),
+        "fr": ("Bon d'achat invalide", "le code promo pour {app} n'est pas accepté au paiement"),
+        "es": ("Cupón no funciona", "el código del cupón para {app} no se acepta al pagar"),
+        "it": ("Buono non valido", "il codice del buono per {app} non viene accettato al pagamento"),
+    }),
+    ((IN_APP_PURCHASE, "Suggestion", "Invoice", "Invoice related request"), {
+        "en": ("Invoice", "could you send me an invoice for my purchase in {app}"),
+        "de": ("Rechnung", "können Sie mir eine Rechnung für meinen Kauf in {app} schicken"),
+        "fr": ("Facture", "pouvez-vous m'envoyer une facture pour mon achat dans {app}"),
+        "es": ("Factura", "pueden enviarme una factura de mi compra en {app}"),
+        "it": ("Fattura", "potete inviarmi una fattura per il mio acquisto in {app}"),
+    }),
+    ((IN_APP_PURCHASE, "Others", None, None), {
+        "en": ("Other question", "I have a general question about my account"),
+        "de": ("Andere Frage", "ich habe eine allgemeine Frage zu meinem Konto"),
+        "fr": ("Autre question", "j'ai une question générale sur mon compte"),
+        "es": ("Otra pregunta", "tengo una pregunta general sobre mi cuenta"),
+        "it": ("Altra domanda", "ho una domanda generale sul mio account"),
+    }),
+]
+
+# Greeting, detail sentence and closing of each language, the detail mentions the order number
+PHRASES = {
+    "en": ("Dear customer support team,", "My order number is {order} and my phone is a {device}.",
+           "Thank you very much. Sent from my Huawei phone"),
+    "de": ("Hallo,", "Meine Bestellnummer ist {order} und mein Telefon ist ein {device}.",
+           "Vielen Dank und freundliche Grüße"),
+    "fr": ("Bonjour,", "Mon numéro de commande est {order} et mon téléphone est un {device}.",
+           "Merci beaucoup, cordialement"),
+    "es": ("Hola,", "Mi número de pedido es {order} y mi teléfono es un {device}.", "Muchas gracias, saludos"),
+    "it": ("Buongiorno,", "Il mio numero d'ordine è {order} e il mio telefono è un {device}.",
+           "Grazie mille, cordiali saluti"),
+}
+
+APPS = ["Music", "Video", "Themes", "Cloud", "Petal Maps", "Games Center", "Health", "Wallet", "Reader", "Browser"]
+DEVICES = ["P40", "P30 Pro", "Mate 40", "Nova 9", "Y6p", "MatePad 11", "Honor 9X", "P smart"]
+MAILBOXES = ["support.eu@aspiegel.com", "support.pt@aspiegel.com", "support.de@aspiegel.com"]
+
+
+class SyntheticEmailGenerator:
+    LANGUAGES = tuple(PHRASES)
+    DEFAULT_LANGUAGE_MIX = {"en": 0.5, "de": 0.2, "fr": 0.1, "es": 0.1, "it": 0.1}
+
+    def __init__(self, language_mix: dict = None, duplicate_rate: float = 0.02, label_noise: float = 0.1,
+                 seed: int = 0) -> None:
+        """
+        :param language_mix: language -> share of the emails, normalised to sum to one
+        :param duplicate_rate: share of the emails sent twice with the same interaction id, de_duplication drops both
+        :param label_noise: share of the emails labelled as a random topic, so no model classifies every email right
+        """
+        language_mix = language_mix or self.DEFAULT_LANGUAGE_MIX
+        unknown = set(language_mix) - set(self.LANGUAGES)
+        if unknown:
+            raise ValueError(f"Unknown languages {sorted(unknown)}, available: {', '.join(self.LANGUAGES)}")
+        total = sum(language_mix.values())
+        self.language_mix = {language: share / total for language, share in language_mix.items()}
+        self.duplicate_rate = duplicate_rate
+        self.label_noise = label_noise
+        self.seed = seed
+
+    @staticmethod
+    def parse_language_mix(text: str) -> dict:
+        """Parses a mix written as en=0.5,de=0.3,fr=0.2"""
+        language_mix = {}
+        for part in text.split(","):
+            language, _, share = part.partition("=")
+            language_mix[language.strip()] = float(share) if share else 1.0
+        return language_mix
+
+    def generate(self, rows: int) -> pd.DataFrame:
+        """Returns rows emails with the columns of the training data exports"""
+        rng = np.random.default_rng(self.seed)
+        languages = rng.choice(list(self.language_mix), size=rows, p=list(self.language_mix.values()))
+        topics = rng.integers(len(TOPICS), size=rows)
+        apps = rng.integers(len(APPS), size=rows)
+        devices = rng.integers(len(DEVICES), size=rows)
+        orders = rng.integers(10 ** 7, 10 ** 8, size=rows)
+        replies = rng.random(rows) < 0.2
+        signed = rng.random(rows) < 0.5
+
+        summaries = []
+        contents = []
+        for language, topic, app, device, order, reply, sign in zip(languages, topics, apps, devices, orders,
+                                                                     replies, signed):
+            summary, sentence = TOPICS[topic][1][language]
+            greeting, detail, closing = PHRASES[language]
+            summaries.append(f"Re: {summary}" if reply else summary)
+            content = (f"{greeting} {sentence.format(app=APPS[app])}. "
+                       f"{detail.format(order=order, device=DEVICES[device])} {closing}")
+            # Masked contact details, as in the exports
+            contents.append(f"{content} Sxxxxx@xxxx.com *****(PHONE)" if sign else content)
+
+        label_topics = np.where(rng.random(rows) < self.label_noise, rng.integers(len(TOPICS), size=rows), topics)
+        labels = np.array([TOPICS[topic][0] for topic in label_topics], dtype=object).reshape(rows, 4)
+        ticket_ids = np.arange(rows) // 2 + 20000
+        interaction_ids = np.arange(rows) + 60000
+        # Duplicates reuse the interaction id of the email before them
+        duplicates = np.flatnonzero(rng.random(rows) < self.duplicate_rate)
+        duplicates = duplicates[duplicates > 0]
+        interaction_ids[duplicates] = interaction_ids[duplicates - 1]
+
+        return pd.DataFrame({
+            "Ticket id": ticket_ids,
+            "Interaction id": interaction_ids,
+            "Interaction date": "",
+            "Mailbox": np.array(MAILBOXES, dtype=object)[rng.integers(len(MAILBOXES), size=rows)],
+            Config.TICKET_SUMMARY: summaries,
+            Config.INTERACTION_CONTENT: contents,
+            "Innso TYPOLOGY_TICKET ": [f"{y1.strip()} / {y2}" for y1, y2 in labels[:, :2]],
+            Config.GROUPED: labels[:, 0],
+            Config.CLASS_COL: labels[:, 1],
+            Config.TYPE_COLS[0]: labels[:, 2],
+            Config.TYPE_COLS[1]: labels[:, 3],
+        })
+
+    def write(self, rows: int, file_path: str) -> pd.DataFrame:
+        """Generates rows emails and saves them as a csv"""
+        df = self.generate(rows)
+        FileManager().save_table(df, file_path)
+        return df
+
+
+def run(file_path: str, rows: int = 10000, language_mix: str = None) -> None:
+    logger = PrefixLogger(InfoLogger(), "SyntheticEmails")
+    mix = SyntheticEmailGenerator.parse_language_mix(language_mix) if language_mix else None
+    generator = SyntheticEmailGenerator(mix)
+    generator.write(rows, file_path)
+    shares = ", ".join(f"{language} {share:.0%}" for language, share in generator.language_mix.items())
+    logger.log(f"Wrote {rows} emails to {file_path} ({shares})")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m benchmarks.synthetic_emails <path/to/file.csv> [rows] [mix]")
+        exit(1)
+    run(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 10000, sys.argv[3] if len(sys.argv) > 3 else None)
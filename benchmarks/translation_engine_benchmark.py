@@ -0,0 +1,36 @@
+# Benchmark: shows that the translation models are loaded once per process and then reused.
+# Run from the project root with: python -m benchmarks.translation_engine_benchmark
+import sys
+import time
+
+from preprocessing.processor import DataProcessor
+from preprocessing.translation_engine import TranslationEngine
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+SAMPLE_TEXTS = [
+    "",
+    "My app will not update after the last release",
+    "Ich kann die App nicht herunterladen",
+    "No puedo instalar aplicaciones desde la tienda",
+    "Je voudrais un remboursement pour mon achat",
+]
+
+
+def run(calls: int = 4) -> None:
+    logger = PrefixLogger(InfoLogger(), "TranslationEngineBenchmark")
+    engine = TranslationEngine()
+    engine.release()
+
+    for call in range(calls):
+        start_time = time.perf_counter()
+        DataProcessor.trans_to_en(SAMPLE_TEXTS)
+        elapsed = time.perf_counter() - start_time
+        logger.log(f"Call {call + 1}: {elapsed:.2f} seconds (model loads so far: {engine.load_count})")
+
+    logger.log(f"Total model load time: {engine.load_time:.2f} seconds over {engine.load_count} loads")
+    engine.release()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -1,18 +1,28 @@
 # This is a main file: The controller. All methods will directly or indirectly be called here.
-import os
 import sys
 import traceback
 
+import numpy as np
+
 from model.factory.classification_factory import ClassificationContextFactory
+from model.model_bundle import ModelBundle
+from observers.observer_bus import ObserverBus
 from observers.results_displayer import ResultsDisplayer
 from observers.statistics_collector import StatisticsCollector
+from preprocessing.email_stream import EmailStream
+from preprocessing.feature_cache import FeatureCache
+from preprocessing.incremental_preprocessor import IncrementalPreprocessor
 from preprocessing.processor import DataProcessor, VectoriserManager
+from preprocessing.translation_engine import TranslationEngine
+from server.classification_server import ClassificationServer
 from utilities.logger.concrete_logger.error_logger import ErrorLogger
 from utilities.logger.concrete_logger.info_logger import InfoLogger
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
 from utilities.utility import Utils
 from utilities.configuration.config import Config
 from utilities.file_manager import FileManager
+from utilities.model_selector import SuccessiveHalvingSelector
+from utilities.training_scheduler import TrainingScheduler
 
 class Main:
     def __init__(self):
@@ -23,10 +33,106 @@ class Main:
         logger.log("""Usage: python main.py
             -t <model-name>       : Trains the specified model for all labels. These models are not saved and are for one time use.
             -l                    : Lists all trainable models.
-            -r                    : Trains the best model for each label and saves the models for future use unless another model is specified. This will overwrite any previously saved models.
-            -u                    : Use saved models for classification. If insufficient saved models exist this will return an error.
+            -r                    : Trains the best model for each label and saves the models together with the vectoriser for future use unless another model is specified. This will overwrite any previously saved models.
+            -i                    : Used with -t or -r, preprocesses only training data rows added or changed since the last run and merges them into the preprocessed data.
+            -o [model-name]       : Trains the specified online model (default sgd) for all labels on hashed features and saves them, so they can be updated with -n later.
+            -n <path/to/file.csv> : Updates the saved online models with the labelled emails in the file, in time proportional to the file and not the training data.
+            -d [address]          : Used with -u, keeps the saved models loaded and classifies emails sent to a local HTTP server at host:port or unix:/path/to/socket (default 127.0.0.1:8765) until interrupted.
+            -u [online]           : Use saved models for classification, without loading the training data. With online the models saved by -o and -n are used. If insufficient saved models exist this will return an error.
             -c <path/to/file.csv> : Classifies emails in the file at the specified location (trained models are required for this to work).
-    Make sure to specify only one of -t, -r, or -u, otherwise you may overwrite previously loaded models!""")
+            -s [chunk-size]       : Used with -c, reads and classifies the file in chunks of emails (default 1000) to keep memory use bounded.
+    Make sure to specify only one of -t, -r, -o or -u, otherwise you may overwrite previously loaded models!""")
+
+    def log_processing_error(self, error_logger, e: Exception) -> None:
+        error_logger.log(str(e))
+        error_logger.log(traceback.format_exc())
+        error_logger.log("""Error in processing of data
+        Make sure in your CSV you have the at least the following columns:
+            - Ticket Summary
+            - Interaction Content""")
+
+    def load_training_data(self, file_manager, error_logger, args):
+        """
+        Loads the preprocessed training data, preprocessing and saving it first if it does not exist yet
+        With -i, rows added to or changed in the training data since the last run are preprocessed and merged in
+        Returns a DataFrame
+        """
+        preprocessor = IncrementalPreprocessor(file_manager)
+        try:
+            if '-i' in args or not preprocessor.has_store():
+                # Preprocess the training data, reusing whatever is already preprocessed
+                df = preprocessor.update(Config.TRAINING_DATA_DIR)[Config.PREPROCESSED_COLUMNS]
+                # Free the translation models unless they are needed again for classification
+                if preprocessor.processed_rows and "-c" not in args:
+                    TranslationEngine().release()
+            else:
+                # Load existing preprocessing data
+                df = preprocessor.load_store(columns=Config.PREPROCESSED_COLUMNS)
+        except FileNotFoundError as e:
+            error_logger.log(str(e))
+            error_logger.log(traceback.format_exc())
+            exit(1)
+        df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
+        df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
+
+        return df
+
+    @staticmethod
+    def vectorise_training_data(vectoriser, df):
+        """
+        Fits the vectoriser and vectorises the training data, or memory-maps both from the feature cache
+        Returns X and the dict of label arrays
+        """
+        if not Config.FEATURE_CACHE_ENABLED:
+            vectoriser.fit_vectoriser(df["x_ic"])
+            return vectoriser.vectorize_data(df)
+
+        feature_cache = FeatureCache()
+        key = FeatureCache.fingerprint(df, vectoriser.tfidfconverter)
+        cached = feature_cache.load(key)
+        if cached is None:
+            vectoriser.fit_vectoriser(df["x_ic"])
+            X, y = vectoriser.vectorize_data(df)
+            cached = feature_cache.save(key, X, y, vectoriser.tfidfconverter)
+        X, y, vectoriser.tfidfconverter = cached
+        return X, y
+
+    @staticmethod
+    def preprocess_labelled_emails(email_df):
+        """Preprocesses a csv export of labelled emails the same way as the training data"""
+        email_df = DataProcessor.renaming_cols(email_df)
+        email_df = DataProcessor.de_duplication(email_df)
+        email_df = DataProcessor.replace_nan_data_in_column(email_df, "x_ts")
+        email_df = DataProcessor.replace_nan_data_in_column(email_df, "x_ic")
+        email_df = DataProcessor.translate_data_frame(email_df)
+        email_df = DataProcessor.remove_noise(email_df)
+        return email_df.reset_index(drop=True)
+
+    @staticmethod
+    def update_online_models(models: dict, X, y: dict, logger) -> None:
+        """
+        Updates each label's model with the labelled rows of X
+        Rows with a class the model has never seen are skipped, online models cannot add classes after training
+        """
+        for label_name, y_val in y.items():
+            model = models[label_name]
+            X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X, y_val)
+            y_trim_val = y_trim_val.astype(str)
+            known = np.isin(y_trim_val, model.get_fitted_model().classes_)
+            if not known.all():
+                logger.log(f"{label_name}: skipping {int((~known).sum())} rows with classes unseen in training, "
+                           f"retrain with -o to learn them")
+            if known.any():
+                model.update_model(X_trimmed[known], y_trim_val[known])
+            logger.log(f"{label_name}: updated {model} with {int(known.sum())} rows")
+
+    @staticmethod
+    def classify_emails(models, X, email_df) -> None:
+        """Classifies all rows of X with one call per model"""
+        ts = email_df["x_ts"].to_numpy()
+        ic = email_df["x_ic"].to_numpy()
+        for model in models:
+            model.classify_batch(X, ts, ic)
 
     @staticmethod
     def main(args):
@@ -51,41 +157,32 @@ class Main:
             - random_forest
             - logistic_regression
             - k_nearest_neighbors
+        Multi-output models (-t), predicting every label at once:
+            - multi_output_forest
+        Online models (-o):
+            - sgd
+            - passive_aggressive
+            - complement_naive_bayes
+            - naive_bayes
         """)
 
         # This array is used to store trained models for classification
         models = []
 
-        # Load existing preprocessing data or preprocess training data
-        if file_manager.exists_file(Config.PREPROCESSED_DATA_PATH):
-            try:
-                df = file_manager.load_csv(Config.PREPROCESSED_DATA_PATH)
-            except FileNotFoundError as e:
-                error_logger.log(str(e))
-                error_logger.log(traceback.format_exc())
-                exit(1)
-            df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
-            df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
-        else:
-            try:
-                df = file_manager.load_all_csvs_in_directory("data/training_data")
-            except FileNotFoundError as e:
-                error_logger.log(str(e))
-                error_logger.log(traceback.format_exc())
-                exit(1)
-            # Preprocess the training data
-            df = DataProcessor.renaming_cols(df)
-            df = DataProcessor.de_duplication(df)
-            df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
-            df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
-            df = DataProcessor.translate_data_frame(df)
-            df = DataProcessor.remove_noise(df)
-            # Save the preprocessed data for re-use
-            file_manager.save_csv(df, Config.PREPROCESSED_DATA_PATH)
-
         vectoriser = VectoriserManager()
-        vectoriser.fit_vectoriser(df["x_ic"])
-        X, y = vectoriser.vectorize_data(df)
+
+        # Training data is only needed to train models, saved models come with their own vectoriser
+        if '-t' in args or '-r' in args or '-o' in args:
+            df = main.load_training_data(file_manager, error_logger, args)
+
+            # Online models are trained on hashed features, which stay the same however much data is added
+            if '-o' in args:
+                vectoriser.tfidfconverter = DataProcessor.create_hashing_vectoriser()
+
+            # Rows with the most labels first, so each label task trains on a view of the same feature matrix
+            df = DataProcessor.order_by_labels(df)
+
+            X, y = main.vectorise_training_data(vectoriser, df)
 
         # Train a specific model
         if '-t' in args:
@@ -97,64 +194,132 @@ class Main:
 
             model_name = str(args[args.index('-t') + 1])
             training_logger = PrefixLogger(logger, "TRAINING")
-            for label_name, y_val in y.items():
-                training_logger.log(f"Training model for {label_name}...")
-                try:
-                    model_context = ClassificationContextFactory.create_context(model_name)
-                except ValueError as e:
-                    error_logger.log(str(e))
-                    error_logger.log("Model name invalid! Use -l to get a list of all trainable model names.")
-                    exit(1)
-
-                # Remove unlabelled rows
-                X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X, y_val)
-                y_trim_val = y_trim_val.astype(str)
-
-                # Train models on the current task
-                model_context.train_model(X_trimmed, y_trim_val)
-
-                # Add model
+            # A multi-output model is trained once on every label, on the rows that have all of them
+            if model_name in Utils.MULTI_OUTPUT_MODELS:
+                training_logger.log("Training model for all labels...")
+                labelled = DataProcessor.labelled_mask(y["y1"])
+                model_context = ClassificationContextFactory.create_context(model_name)
+                model_context.train_model(X[labelled], Utils.stack_labels(y)[labelled].astype(str))
+                model_context.set_label_names(list(y))
                 models.append(model_context)
+            else:
+                for label_name, y_val in y.items():
+                    training_logger.log(f"Training model for {label_name}...")
+                    try:
+                        model_context = ClassificationContextFactory.create_context(model_name)
+                    except ValueError as e:
+                        error_logger.log(str(e))
+                        error_logger.log("Model name invalid! Use -l to get a list of all trainable model names.")
+                        exit(1)
+
+                    # Remove unlabelled rows
+                    X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X, y_val)
+                    y_trim_val = y_trim_val.astype(str)
+
+                    # Train models on the current task
+                    model_context.train_model(X_trimmed, y_trim_val)
+                    model_context.set_label_names([label_name])
+
+                    # Add model
+                    models.append(model_context)
 
         # Train best performing models for each label and save them
         if '-r' in args:
-            for label_name, y_val in y.items():
-                logger.log(f"Training models for {label_name}...")
-                # Instantiate fresh models for this task
-                candidates = Utils.instantiate_all_models()
-
-                # Remove unlabelled rows
-                X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X, y_val)
-                y_trim_val = y_trim_val.astype(str)
-
-                # Train models on the current task
-                Utils.train_models(candidates, X_trimmed, y_trim_val)
+            logger.log("Selecting models for all labels...")
+            # Candidates compete on growing subsamples, only the winner of each label is trained on all rows
+            selector = SuccessiveHalvingSelector()
+            selected_models = selector.select_all(X, y, Utils.CANDIDATE_MODELS)
+            scheduler = TrainingScheduler()
+            best_models = scheduler.train_selected(X, y, selected_models)
+            models.extend(best_models.values())
+            logger.log(f"Selected models in {selector.selection_time:.2f} seconds, "
+                       f"trained them on all rows in {scheduler.wall_time:.2f} seconds")
+
+            # Save the vectoriser and the best models together
+            logger.log(f"Saving models to {Config.MODEL_BUNDLE_PATH}")
+            ModelBundle(vectoriser.tfidfconverter, best_models).save(Config.MODEL_BUNDLE_PATH)
+
+        # Train online models for each label and save them
+        if '-o' in args:
+            model_name = Config.ONLINE_DEFAULT_MODEL
+            model_name_index = args.index('-o') + 1
+            if model_name_index < len(args) and not str(args[model_name_index]).startswith('-'):
+                model_name = str(args[model_name_index])
+            try:
+                model_context = ClassificationContextFactory.create_context(model_name)
+            except ValueError as e:
+                error_logger.log(str(e))
+                error_logger.log("Model name invalid! Use -l to get a list of all trainable model names.")
+                exit(1)
+            if not model_context.supports_update():
+                error_logger.log(f"{model_name} cannot be updated with new data! Use -l to get a list of online models.")
+                exit(1)
 
-                # Get the best-performing model for this task
-                best_model = Utils.get_best_model(candidates, X_trimmed, y_trim_val)
-                models.append(best_model)
+            logger.log(f"Training online model {model_name} for all labels...")
+            online_models = TrainingScheduler().train_selected(X, y, {label_name: model_name for label_name in y})
+            models.extend(online_models.values())
+            logger.log(f"Saving online models to {Config.ONLINE_MODEL_BUNDLE_PATH}")
+            ModelBundle(vectoriser.tfidfconverter, online_models).save(Config.ONLINE_MODEL_BUNDLE_PATH)
 
-                os.makedirs(Config.TRAINED_MODELS_DIR, exist_ok=True)
+        # Update the saved online models with new labelled emails
+        if '-n' in args:
+            file_path_index = args.index('-n') + 1
+            if file_path_index >= len(args):
+                error_logger.log("File path not found!")
+                main.print_usage(error_logger)
+                exit(1)
 
-                # Save the trained model
-                model_path = f"trained_models/{label_name}_model.{str(best_model)}"
+            try:
+                bundle = ModelBundle.load(Config.ONLINE_MODEL_BUNDLE_PATH)
+            except (FileNotFoundError, ValueError) as e:
+                error_logger.log(str(e))
+                exit(1)
+            try:
+                new_df = main.preprocess_labelled_emails(file_manager.load_csv(str(args[file_path_index])))
+            except Exception as e:
+                main.log_processing_error(error_logger, e)
+                exit(1)
 
-                logger.log(f"Saving model to {model_path}")
-                best_model.save_model(model_path)
+            vectoriser.tfidfconverter = bundle.vectoriser
+            X_new, y_new = vectoriser.vectorize_data(new_df)
+            main.update_online_models(bundle.models, X_new, y_new, logger)
+            models.extend(bundle.models.values())
+            ModelBundle(bundle.vectoriser, bundle.models).save(Config.ONLINE_MODEL_BUNDLE_PATH)
 
-        # Load pretrained models
+        # Load pretrained models, together with the vectoriser they were trained with
         if '-u' in args:
-            model_paths = os.listdir(Config.TRAINED_MODELS_DIR)
+            bundle_path = Config.MODEL_BUNDLE_PATH
+            bundle_kind_index = args.index('-u') + 1
+            if bundle_kind_index < len(args) and args[bundle_kind_index] == "online":
+                bundle_path = Config.ONLINE_MODEL_BUNDLE_PATH
+            try:
+                bundle = ModelBundle.load(bundle_path)
+            except (FileNotFoundError, ValueError) as e:
+                error_logger.log(str(e))
+                exit(1)
 
-            if len(model_paths) < 4:
-                error_logger.log(f"Not enough saved models, expected {4}, found {len(model_paths)}")
+            if len(bundle.models) < 4:
+                error_logger.log(f"Not enough saved models, expected {4}, found {len(bundle.models)}")
                 exit(1)
 
-            for model_path in model_paths:
-                model_type = model_path.split('.')[1]
-                model_context = ClassificationContextFactory.create_context(model_type)
-                model_context.load_model(os.path.join(Config.TRAINED_MODELS_DIR, model_path))
-                models.append(model_context)
+            vectoriser.tfidfconverter = bundle.vectoriser
+            models.extend(bundle.models.values())
+
+        # Serve the loaded models until interrupted
+        if '-d' in args:
+            if '-u' not in args:
+                error_logger.log("The server needs saved models, use -d together with -u!")
+                exit(1)
+            address = Config.SERVER_ADDRESS
+            address_index = args.index('-d') + 1
+            if address_index < len(args) and not str(args[address_index]).startswith('-'):
+                address = str(args[address_index])
+
+            # Load the translation models now, not on the first request
+            TranslationEngine().warm_up()
+            server = ClassificationServer(vectoriser, bundle.models, address)
+            server.serve_forever()
+            exit(0)
 
         # Classify emails in the specified CSV
         if "-c" in args:
@@ -167,32 +332,48 @@ class Main:
 
             file_path = str(args[args.index("-c") + 1])
 
-            try:
-                email_df = file_manager.load_csv(file_path)
-                email_df = DataProcessor.renaming_cols(email_df)
-                email_df = DataProcessor.translate_data_frame(email_df)
-                X = vectoriser.vectorize_unclassified_data(email_df)
-            except Exception as e:
-                error_logger.log(str(e))
-                error_logger.log(traceback.format_exc())
-                error_logger.log("""Error in processing of data
-        Make sure in your CSV you have the at least the following columns:
-            - Ticket Summary
-            - Interaction Content""")
-                exit(1)
-
-            logger.log(f"Classifying emails in {file_path}")
-            # Subscribe observers for tracking classification information
+            # Subscribe observers for tracking classification information, they are notified in the background
             rd = ResultsDisplayer()
-            sc = StatisticsCollector()
+            sc = StatisticsCollector.from_models(models)
+            observer_bus = ObserverBus()
+            observer_bus.add_observer(rd)
+            observer_bus.add_observer(sc)
             for model in models:
-                model.add_observer(rd)
-                model.add_observer(sc)
+                model.add_observer(observer_bus)
+
+            # Stream the file in chunks, results are displayed as each chunk is classified
+            if '-s' in args:
+                chunk_size = Config.STREAM_CHUNK_SIZE
+                chunk_size_index = args.index('-s') + 1
+                if chunk_size_index < len(args) and str(args[chunk_size_index]).isdigit():
+                    chunk_size = int(args[chunk_size_index])
+
+                logger.log(f"Classifying emails in {file_path} in chunks of {chunk_size}")
+                email_stream = EmailStream(vectoriser, chunk_size, file_manager)
+                try:
+                    for email_df, X in email_stream.stream(file_path):
+                        main.classify_emails(models, X, email_df)
+                except Exception as e:
+                    main.log_processing_error(error_logger, e)
+                    exit(1)
+                TranslationEngine().release()
+            else:
+                try:
+                    email_df = file_manager.load_csv(file_path)
+                    email_df = DataProcessor.renaming_cols(email_df)
+                    email_df = DataProcessor.translate_data_frame(email_df)
+                    X = vectoriser.vectorize_unclassified_data(email_df)
+                    # Translation is done, free the models before classifying
+                    TranslationEngine().release()
+                except Exception as e:
+                    main.log_processing_error(error_logger, e)
+                    exit(1)
 
-            for idx, email in enumerate(X):
-                for model in models:
-                    model.classify_email(email, email_df["x_ts"][idx], email_df["x_ic"][idx])
+                logger.log(f"Classifying emails in {file_path}")
+                main.classify_emails(models, X, email_df)
 
+            # Every classification has to reach the observers before the statistics are complete
+            observer_bus.close()
             sc.display_stats()
 
         exit(0)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from model.classifier import Classifier
 
 from observers.email_classification_observer import EmailClassificationObserver
@@ -15,6 +17,8 @@ class ClassificationContext:
     def __init__(self, strategy: Classifier) -> None:
         self._strategy = strategy
         self._observers = []
+        # Labels the strategy predicts, in the order of its outputs. Observers are told which label a classification is for
+        self.label_names = []
         self.info_logger = InfoLogger()
         self.info_logger = PrefixLogger(self.info_logger, "ClassificationContext")
         self.info_logger.log("Classification Context initialized with strategy:" + str(strategy))
@@ -24,10 +28,24 @@ class ClassificationContext:
         """Allows switching the strategy dynamically."""
         self._strategy = strategy
 
+    def set_label_names(self, label_names: list) -> None:
+        """Sets the labels the strategy predicts, one for a single label strategy and one per output otherwise."""
+        self.label_names = list(label_names)
+
+    @global_timing_decorator
     def train_model(self, X, y):
         """Trains a model using the classification strategy"""
         self._strategy.train(X, y)
 
+    @global_timing_decorator
+    def update_model(self, X, y, classes=None):
+        """Updates a trained model with a batch of new rows, for strategies that support incremental training"""
+        self._strategy.partial_train(X, y, classes)
+
+    def supports_update(self) -> bool:
+        """Returns whether update_model can be used, i.e. the strategy supports incremental training"""
+        return self._strategy.supports_partial_train()
+
     @global_timing_decorator
     def evaluate_model(self, X, y) -> float:
         """Evaluates a model using the classification strategy and returns its accuracy"""
@@ -37,9 +55,27 @@ class ClassificationContext:
     def classify_email(self, email, ts, ic) -> str:
         """Classifies an email using the current strategy."""
         classification = self._strategy.classify(email)
-        self._notify_observers(ts, ic, classification)
+        # A multi-output strategy returns every label, observers are notified of each as a separate classification
+        if np.ndim(classification) == 1:
+            for label_name, label_classification in zip(self._output_label_names(len(classification)), classification):
+                self._notify_observers(ts, ic, label_classification, label_name)
+        else:
+            self._notify_observers(ts, ic, classification, self._output_label_names(1)[0])
         return classification
 
+    @global_timing_decorator
+    def classify_batch(self, X, ts, ic) -> list:
+        """Classifies every row of X using the current strategy, observers are notified once for the whole batch."""
+        classifications = self._strategy.classify_batch(X)
+        # A multi-output strategy returns a column per label, observers are notified of each label as a batch
+        if np.ndim(classifications) == 2:
+            label_names = self._output_label_names(np.shape(classifications)[1])
+            for label_name, label_classifications in zip(label_names, np.transpose(classifications)):
+                self._notify_observers_batch(ts, ic, label_classifications, label_name)
+        else:
+            self._notify_observers_batch(ts, ic, classifications, self._output_label_names(1)[0])
+        return classifications
+
     def save_model(self, file_path):
         """Saves the model in the Classifier"""
         self._strategy.save(file_path)
@@ -48,6 +84,14 @@ class ClassificationContext:
         """Loads a model into the Classifier"""
         self._strategy.load(file_path)
 
+    def get_fitted_model(self):
+        """Returns the underlying fitted model, used to bundle it with other models"""
+        return self._strategy.get_fitted_model()
+
+    def set_fitted_model(self, fitted_model) -> None:
+        """Replaces the underlying model with an already fitted one"""
+        self._strategy.set_fitted_model(fitted_model)
+
     def add_observer(self, observer: EmailClassificationObserver) -> None:
         """Subscribe an observer to this subject."""
         if observer not in self._observers:
@@ -58,10 +102,19 @@ class ClassificationContext:
         if observer in self._observers:
             self._observers.remove(observer)
 
-    def _notify_observers(self, ts, ic, classification: str) -> None:
+    def _output_label_names(self, n_outputs: int) -> list:
+        """Returns the label of each output, None for each if the labels were not set"""
+        return self.label_names if len(self.label_names) == n_outputs else [None] * n_outputs
+
+    def _notify_observers(self, ts, ic, classification: str, label_name: str = None) -> None:
         """Notify observers of a classification."""
         for observer in self._observers:
-            observer.update(ts, ic, classification)
+            observer.update(ts, ic, classification, label_name)
+
+    def _notify_observers_batch(self, ts, ic, classifications, label_name: str = None) -> None:
+        """Notify observers of a batch of classifications."""
+        for observer in self._observers:
+            observer.update_batch(ts, ic, classifications, label_name)
 
     def __str__(self):
         return str(self._strategy)
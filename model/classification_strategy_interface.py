@@ -6,9 +6,18 @@ class IClassificationStrategy(ABC):
     def train(self, X, y):
         pass
     @abstractmethod
+    def partial_train(self, X, y, classes=None):
+        pass
+    @abstractmethod
+    def supports_partial_train(self) -> bool:
+        pass
+    @abstractmethod
     def classify(self, email_data):
         pass
     @abstractmethod
+    def classify_batch(self, X):
+        pass
+    @abstractmethod
     def evaluate(self, X, y):
         pass
     @abstractmethod
@@ -16,4 +25,10 @@ class IClassificationStrategy(ABC):
         pass
     @abstractmethod
     def load(self, file_path):
+        pass
+    @abstractmethod
+    def get_fitted_model(self):
+        pass
+    @abstractmethod
+    def set_fitted_model(self, fitted_model):
         pass
\ No newline at end of file
@@ -1,7 +1,7 @@
 # Parent Classification Classes
 from abc import ABC
 
-from sklearn.metrics import accuracy_score
+from scipy.sparse import issparse
 
 from model.classification_strategy_interface import IClassificationStrategy
 from model.models.base import BaseModel
@@ -20,11 +20,24 @@ class Classifier(IClassificationStrategy, ABC):
     def train(self, X, y):
         self.model.train(X, y)
 
+    def partial_train(self, X, y, classes=None):
+        self.model.partial_train(X, y, classes)
+
+    def supports_partial_train(self) -> bool:
+        return self.model.supports_partial_fit
+
     def classify(self, email) -> str:
-        prediction = self.model.predict([email])
+        # A row of a sparse matrix is already two dimensional
+        email = email if issparse(email) else [email]
+        prediction = self.model.predict(email)
         return prediction[0]
 
+    def classify_batch(self, X) -> list:
+        """Classifies every row of X with a single predict call"""
+        return self.model.predict(X)
+
     def evaluate(self, X, y) -> float:
+        from sklearn.metrics import accuracy_score
         y_pred = self.model.predict(X)
         accuracy = accuracy_score(y, y_pred) * 100
         self.info_logger.log(f"Accuracy: {accuracy:.2f}%")
@@ -36,5 +49,11 @@ class Classifier(IClassificationStrategy, ABC):
     def load(self, file_path):
         self.model.load(file_path)
 
+    def get_fitted_model(self):
+        return self.model.model
+
+    def set_fitted_model(self, fitted_model):
+        self.model.model = fitted_model
+
     def __str__(self):
         return str(self.model)
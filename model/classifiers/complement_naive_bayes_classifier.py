@@ -0,0 +1,8 @@
+from model.classification_context import Classifier
+from model.models.complement_naive_bayes import ComplementNaiveBayesModel
+
+
+class ComplementNaiveBayesClassifier(Classifier):
+    def __init__(self):
+        super().__init__()
+        self.model = ComplementNaiveBayesModel()
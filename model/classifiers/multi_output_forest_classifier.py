@@ -0,0 +1,22 @@
+import numpy as np
+
+from model.classification_context import Classifier
+from model.models.multi_output_forest import MultiOutputForestModel
+
+
+class MultiOutputForestClassifier(Classifier):
+    def __init__(self):
+        super().__init__()
+        self.model = MultiOutputForestModel()
+
+    def evaluate(self, X, y) -> float:
+        """Returns the mean accuracy over the labels, each label only scored on the rows that have it"""
+        y_pred = self.model.predict(X)
+        accuracies = []
+        for label_index in range(y.shape[1]):
+            y_true = y[:, label_index].astype(str)
+            labelled = y_true != "nan"
+            accuracy = np.mean(y_pred[labelled, label_index] == y_true[labelled]) * 100
+            self.info_logger.log(f"Accuracy of label {label_index + 1}: {accuracy:.2f}%")
+            accuracies.append(accuracy)
+        return float(np.mean(accuracies))
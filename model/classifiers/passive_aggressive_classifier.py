@@ -0,0 +1,8 @@
+from model.classification_context import Classifier
+from model.models.passive_aggressive import PassiveAggressiveModel
+
+
+class PassiveAggressiveClassifier(Classifier):
+    def __init__(self):
+        super().__init__()
+        self.model = PassiveAggressiveModel()
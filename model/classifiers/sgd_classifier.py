@@ -0,0 +1,8 @@
+from model.classification_context import Classifier
+from model.models.sgd import SGDModel
+
+
+class SGDClassifier(Classifier):
+    def __init__(self):
+        super().__init__()
+        self.model = SGDModel()
@@ -1,28 +1,35 @@
 # Factory Pattern - Context Factory
+from importlib import import_module
+
 from model.classification_context import ClassificationContext
-from model.classifiers.decision_tree_classifier import DecisionTreeClassifier
-from model.classifiers.k_nearest_neighbour_classifier import KNearestNeighborsClassifier
-from model.classifiers.logistic_regression_classifier import LogisticRegressionClassifier
-from model.classifiers.naive_bayes_classifer import NaiveBayesClassifier
-from model.classifiers.random_forest_classifier import RandomForestClassifier
-from model.classifiers.svm_classifier import SVMClassifier
 
 
 class ClassificationContextFactory:
+    # Strategy name -> module and class of its classifier. The module, and the part of scikit-learn it uses,
+    # is only imported when the strategy is first created so commands that never train do not pay for it
+    constructor_selector = {
+        "naive_bayes": ("model.classifiers.naive_bayes_classifer", "NaiveBayesClassifier"),
+        "svm": ("model.classifiers.svm_classifier", "SVMClassifier"),
+        "decision_tree": ("model.classifiers.decision_tree_classifier", "DecisionTreeClassifier"),
+        "random_forest": ("model.classifiers.random_forest_classifier", "RandomForestClassifier"),
+        "logistic_regression": ("model.classifiers.logistic_regression_classifier", "LogisticRegressionClassifier"),
+        "k_nearest_neighbors": ("model.classifiers.k_nearest_neighbour_classifier", "KNearestNeighborsClassifier"),
+        # Online strategies, they can be updated with new rows after training, see -o and -n
+        "sgd": ("model.classifiers.sgd_classifier", "SGDClassifier"),
+        "passive_aggressive": ("model.classifiers.passive_aggressive_classifier", "PassiveAggressiveClassifier"),
+        "complement_naive_bayes": ("model.classifiers.complement_naive_bayes_classifier",
+                                   "ComplementNaiveBayesClassifier"),
+        # Predicts every label at once, see Utils.MULTI_OUTPUT_MODELS
+        "multi_output_forest": ("model.classifiers.multi_output_forest_classifier", "MultiOutputForestClassifier")
+    }
+
     @staticmethod
     def create_context(strategy: str) -> ClassificationContext:
-        constructor_selector = {
-            "naive_bayes": NaiveBayesClassifier,
-            "svm": SVMClassifier,
-            "decision_tree": DecisionTreeClassifier,
-            "random_forest": RandomForestClassifier,
-            "logistic_regression": LogisticRegressionClassifier,
-            "k_nearest_neighbors": KNearestNeighborsClassifier
-        }
-
-        constructor = constructor_selector.get(strategy)
+        constructor_path = ClassificationContextFactory.constructor_selector.get(strategy)
 
-        if constructor:
+        if constructor_path:
+            module_name, class_name = constructor_path
+            constructor = getattr(import_module(module_name), class_name)
             return ClassificationContext(constructor())
         else:
             raise ValueError("Invalid strategy")
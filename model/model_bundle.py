@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+
+from model.classification_context import ClassificationContext
+from model.factory.classification_factory import ClassificationContextFactory
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# A single versioned file holding the fitted vectoriser together with the per-label models trained on its features,
+# so classification never has to refit the vectoriser or read the training data
+class ModelBundle:
+    BUNDLE_VERSION = 1
+
+    def __init__(self, vectoriser, models: dict, manifest: dict = None) -> None:
+        """
+        :param vectoriser: fitted TfidfVectorizer the models were trained with
+        :param models: label name -> trained ClassificationContext
+        """
+        self.vectoriser = vectoriser
+        self.models = models
+        self.manifest = manifest or self._create_manifest()
+        self.info_logger = PrefixLogger(InfoLogger(), "ModelBundle")
+
+    @staticmethod
+    def feature_fingerprint(vectoriser) -> str:
+        """Hashes the vocabulary, idf weights and parameters that define the feature space of a fitted vectoriser"""
+        digest = hashlib.sha256()
+        # A hashing vectoriser is stateless, its parameters alone define the feature space
+        if hasattr(vectoriser, "vocabulary_"):
+            vocabulary = sorted((term, int(index)) for term, index in vectoriser.vocabulary_.items())
+            digest.update(json.dumps(vocabulary).encode("utf-8"))
+            digest.update(np.ascontiguousarray(vectoriser.idf_).tobytes())
+        digest.update(json.dumps(vectoriser.get_params(), sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def n_features(vectoriser) -> int:
+        # Interaction content and ticket summary are vectorised separately and stacked
+        if hasattr(vectoriser, "vocabulary_"):
+            return 2 * len(vectoriser.vocabulary_)
+        return 2 * vectoriser.n_features
+
+    def _create_manifest(self) -> dict:
+        import sklearn
+        labels = {}
+        for label_name, model in self.models.items():
+            fitted_model = model.get_fitted_model()
+            classes = getattr(fitted_model, "classes_", [])
+            labels[label_name] = {"model": str(model), "classes": [str(c) for c in classes]}
+        return {
+            "bundle_version": self.BUNDLE_VERSION,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "feature_fingerprint": self.feature_fingerprint(self.vectoriser),
+            "n_features": self.n_features(self.vectoriser),
+            "labels": labels,
+            "library_versions": {"scikit-learn": sklearn.__version__, "numpy": np.__version__},
+        }
+
+    def save(self, path: str) -> None:
+        """Saves the bundle, with a readable copy of its manifest next to it"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump({
+            "manifest": self.manifest,
+            "vectoriser": self.vectoriser,
+            "models": {label_name: model.get_fitted_model() for label_name, model in self.models.items()},
+        }, path)
+        with open(os.path.splitext(path)[0] + ".json", "w") as manifest_file:
+            json.dump(self.manifest, manifest_file, indent=4)
+        self.info_logger.log(f"Saved {len(self.models)} models to {path}")
+
+    @staticmethod
+    def load(path: str) -> "ModelBundle":
+        """
+        Loads a bundle and checks that it matches this version and that its models fit its vectoriser
+        Raises FileNotFoundError if there is no bundle and ValueError if it is inconsistent
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"No model bundle at location: {path}! Train and save models with -r first.")
+        contents = joblib.load(path)
+        manifest = contents["manifest"]
+        vectoriser = contents["vectoriser"]
+
+        if manifest.get("bundle_version") != ModelBundle.BUNDLE_VERSION:
+            raise ValueError(f"Model bundle version {manifest.get('bundle_version')} is not supported, "
+                             f"expected {ModelBundle.BUNDLE_VERSION}. Retrain with -r.")
+        if ModelBundle.feature_fingerprint(vectoriser) != manifest["feature_fingerprint"]:
+            raise ValueError("The vectoriser in the model bundle does not match its manifest")
+
+        models = {}
+        for label_name, fitted_model in contents["models"].items():
+            n_features_in = getattr(fitted_model, "n_features_in_", manifest["n_features"])
+            if n_features_in != manifest["n_features"]:
+                raise ValueError(f"The {label_name} model expects {n_features_in} features, "
+                                 f"the vectoriser produces {manifest['n_features']}")
+            model: ClassificationContext = ClassificationContextFactory.create_context(
+                manifest["labels"][label_name]["model"])
+            model.set_fitted_model(fitted_model)
+            model.set_label_names([label_name])
+            models[label_name] = model
+
+        return ModelBundle(vectoriser, models, manifest)
@@ -1,6 +1,7 @@
 from sklearn.svm import SVC
 
 from model.models.base import BaseModel
+from utilities.configuration.config import Config
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
 
 
@@ -8,7 +9,7 @@ class SVMModel(BaseModel):
 
     def __init__(self) -> None:
         super(SVMModel, self).__init__()
-        self.model = SVC(probability=True) # SVM with probability support
+        self.model = SVC(probability=True, random_state=Config.RANDOM_SEED) # SVM with probability support
         self.logger = PrefixLogger(self.logger, "LogisticRegressionModel")
 
     def train(self, X, y) -> None:
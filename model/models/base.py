@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 import joblib
+import numpy as np
 
 from utilities.logger.concrete_logger.info_logger import InfoLogger
 
 
 class BaseModel(ABC):
+    # Models that can keep learning from new batches with partial_fit set this, see partial_train
+    supports_partial_fit = False
+
     def __init__(self) -> None:
         self.model = None
         self.logger = InfoLogger()
@@ -28,6 +32,17 @@ class BaseModel(ABC):
         """
         ...
 
+    def partial_train(self, X, y, classes=None) -> None:
+        """
+        Updates the trained model with one more batch, without revisiting earlier data.
+        :params: classes lists every class the model will ever see, it is taken from y when training starts
+        """
+        if not self.supports_partial_fit:
+            raise NotImplementedError(f"{self} cannot be trained incrementally")
+        if classes is None and not hasattr(self.model, "classes_"):
+            classes = np.unique(y)
+        self.model.partial_fit(X, y, classes=classes)
+
     def save(self, path) -> None:
         joblib.dump(self.model, path)
 
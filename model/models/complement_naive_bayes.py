@@ -0,0 +1,23 @@
+from sklearn.naive_bayes import ComplementNB
+
+from model.models.base import BaseModel
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+class ComplementNaiveBayesModel(BaseModel):
+    supports_partial_fit = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.model = ComplementNB()
+        self.logger = PrefixLogger(self.logger, "ComplementNaiveBayesModel")
+
+    def train(self, X, y) -> None:
+        self.model.fit(X, y)
+
+    def predict(self, X) -> list:
+        predictions = self.model.predict(X)
+        return predictions
+
+    def __str__(self):
+        return "complement_naive_bayes"
@@ -1,6 +1,7 @@
 from sklearn.tree import DecisionTreeClassifier
 
 from model.models.base import BaseModel
+from utilities.configuration.config import Config
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
 
 
@@ -8,7 +9,7 @@ class DecisionTreeModel(BaseModel):
 
     def __init__(self) -> None:
         super().__init__()
-        self.model = DecisionTreeClassifier()
+        self.model = DecisionTreeClassifier(random_state=Config.RANDOM_SEED)
         self.logger = PrefixLogger(self.logger, "DecisionTreeModel")
 
     def train(self, X, y) -> None:
@@ -1,12 +1,13 @@
-from sklearn.neighbors import KNeighborsClassifier
 from model.models.base import BaseModel
+from model.neighbours.cosine_neighbours_classifier import CosineNeighboursClassifier
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
 
 
+# Neighbours by cosine similarity on the sparse features, see Config.KNN_INDEX for the exact and approximate index
 class KNearestNeighbourModel(BaseModel):
     def __init__(self) -> None:
         super().__init__()
-        self.model = KNeighborsClassifier()
+        self.model = CosineNeighboursClassifier()
         self.logger = PrefixLogger(self.logger, "KNearestNeighborsModel")
 
     def train(self, X, y) -> None:
@@ -14,4 +15,7 @@ class KNearestNeighbourModel(BaseModel):
 
     def predict(self, X) -> list:
         predictions = self.model.predict(X)
-        return predictions
\ No newline at end of file
+        return predictions
+
+    def __str__(self):
+        return "k_nearest_neighbors"
@@ -0,0 +1,33 @@
+import random
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from model.models.base import BaseModel
+from preprocessing.processor import DataProcessor
+from utilities.configuration.config import Config
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# One forest shared by all labels: every tree predicts y1..y4 together, so each email is classified in one pass.
+# y has one column per label. A forest cannot leave out single outputs, so it is trained on the rows that have every
+# label and never learns a missing label as a class.
+class MultiOutputForestModel(BaseModel):
+    def __init__(self) -> None:
+        super().__init__()
+        seed = Config.RANDOM_SEED if Config.RANDOM_SEED is not None else random.randint(1, 1000)
+        self.model = RandomForestClassifier(n_estimators=1000, random_state=seed, class_weight='balanced_subsample')
+        self.logger = PrefixLogger(self.logger, "MultiOutputForestModel")
+
+    def train(self, X, y) -> None:
+        labelled = DataProcessor.labelled_mask(y).all(axis=1)
+        if not labelled.any():
+            raise ValueError("No rows have every label, the multi-output forest cannot be trained")
+        self.model.fit(X[labelled], np.asarray(y)[labelled])
+
+    def predict(self, X) -> list:
+        predictions = self.model.predict(X)
+        return predictions
+
+    def __str__(self):
+        return "multi_output_forest"
@@ -5,6 +5,7 @@ from utilities.logger.decorators.prefix_decorator import PrefixLogger
 
 
 class NaiveBayesModel(BaseModel):
+    supports_partial_fit = True
 
     def __init__(self) -> None:
         super().__init__()
@@ -0,0 +1,26 @@
+from sklearn.linear_model import SGDClassifier
+
+from model.models.base import BaseModel
+from utilities.configuration.config import Config
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+class PassiveAggressiveModel(BaseModel):
+    supports_partial_fit = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Passive-Aggressive (PA-I) updates, which scikit-learn provides through SGDClassifier
+        self.model = SGDClassifier(loss="hinge", penalty=None, learning_rate="pa1", eta0=1.0,
+                                   random_state=Config.RANDOM_SEED)
+        self.logger = PrefixLogger(self.logger, "PassiveAggressiveModel")
+
+    def train(self, X, y) -> None:
+        self.model.fit(X, y)
+
+    def predict(self, X) -> list:
+        predictions = self.model.predict(X)
+        return predictions
+
+    def __str__(self):
+        return "passive_aggressive"
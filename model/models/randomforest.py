@@ -3,12 +3,13 @@ import random
 from sklearn.ensemble import RandomForestClassifier
 
 from model.models.base import BaseModel
+from utilities.configuration.config import Config
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
 
 class RandomForest(BaseModel):
     def __init__(self) -> None:
         super(RandomForest, self).__init__()
-        seed = random.randint(1, 1000)
+        seed = Config.RANDOM_SEED if Config.RANDOM_SEED is not None else random.randint(1, 1000)
         self.model = RandomForestClassifier(n_estimators=1000, random_state=seed, class_weight='balanced_subsample')
         self.logger = PrefixLogger(self.logger, "LogisticRegressionModel")
 
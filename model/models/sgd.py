@@ -0,0 +1,24 @@
+from sklearn.linear_model import SGDClassifier
+
+from model.models.base import BaseModel
+from utilities.configuration.config import Config
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+class SGDModel(BaseModel):
+    supports_partial_fit = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.model = SGDClassifier(loss="log_loss", random_state=Config.RANDOM_SEED)
+        self.logger = PrefixLogger(self.logger, "SGDModel")
+
+    def train(self, X, y) -> None:
+        self.model.fit(X, y)
+
+    def predict(self, X) -> list:
+        predictions = self.model.predict(X)
+        return predictions
+
+    def __str__(self):
+        return "sgd"
@@ -0,0 +1,58 @@
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from model.neighbours.exact_cosine_index import ExactCosineIndex
+from model.neighbours.lsh_cosine_index import LshCosineIndex
+from utilities.configuration.config import Config
+
+
+# k nearest neighbours classifier on L2-normalised sparse features, neighbours are the rows with the highest cosine
+# similarity. The index is exact (ExactCosineIndex) or approximate (LshCosineIndex), a whole batch of emails is
+# answered with one query. Follows the scikit-learn estimator interface so it is saved, bundled and budgeted like the
+# other models.
+class CosineNeighboursClassifier(ClassifierMixin, BaseEstimator):
+    INDEXES = ("exact", "lsh")
+
+    def __init__(self, n_neighbors: int = Config.KNN_NEIGHBOURS, index: str = Config.KNN_INDEX,
+                 block_size: int = Config.KNN_BLOCK_SIZE, n_tables: int = Config.KNN_LSH_TABLES,
+                 n_bits: int = Config.KNN_LSH_BITS, max_bucket_size: int = Config.KNN_LSH_MAX_BUCKET_SIZE,
+                 random_state: int = Config.RANDOM_SEED) -> None:
+        self.n_neighbors = n_neighbors
+        self.index = index
+        self.block_size = block_size
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.max_bucket_size = max_bucket_size
+        self.random_state = random_state
+
+    def _create_index(self) -> ExactCosineIndex:
+        if self.index == "exact":
+            return ExactCosineIndex(self.block_size)
+        if self.index == "lsh":
+            return LshCosineIndex(self.n_tables, self.n_bits, self.max_bucket_size, self.block_size, self.random_state)
+        raise ValueError(f"Unknown index '{self.index}', expected one of {', '.join(self.INDEXES)}")
+
+    def fit(self, X, y) -> "CosineNeighboursClassifier":
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        self.index_ = self._create_index().fit(X)
+        self.n_samples_fit_ = X.shape[0]
+        return self
+
+    def kneighbors(self, X, n_neighbors: int = None) -> tuple:
+        """Returns the cosine distances and the indices of the nearest training rows of each row, nearest first"""
+        n_neighbors = n_neighbors or self.n_neighbors
+        if n_neighbors > self.n_samples_fit_:
+            raise ValueError(f"Expected n_neighbors <= n_samples_fit, but n_neighbors = {n_neighbors}, "
+                             f"n_samples_fit = {self.n_samples_fit_}")
+        indices, similarities = self.index_.query(X, n_neighbors)
+        return 1 - similarities, indices
+
+    def predict(self, X) -> np.ndarray:
+        """Returns the most frequent class among the neighbours of each row, the first class in classes_ on a tie"""
+        _, indices = self.kneighbors(X)
+        votes = self._y[indices]
+        n_classes = len(self.classes_)
+        # Votes of every row counted at once, row i counts into bins i * n_classes, ..., (i + 1) * n_classes - 1
+        offsets = np.arange(votes.shape[0])[:, None] * n_classes
+        counts = np.bincount((votes + offsets).ravel(), minlength=votes.shape[0] * n_classes)
+        return self.classes_[counts.reshape(-1, n_classes).argmax(axis=1)]
@@ -0,0 +1,59 @@
+import numpy as np
+from scipy import sparse
+
+from utilities.configuration.config import Config
+
+
+# Exact nearest neighbours by cosine similarity. Rows are L2-normalised once, so a similarity is a dot product and
+# the similarities of a block of queries to every training row are one matrix product. Queries are taken a block at
+# a time so at most block_size similarities are held at once.
+class ExactCosineIndex:
+    def __init__(self, block_size: int = Config.KNN_BLOCK_SIZE) -> None:
+        self.block_size = block_size
+        self.X = None
+
+    @staticmethod
+    def normalise(X) -> sparse.csr_matrix:
+        """Returns the rows of X scaled to unit length as a float32 CSR matrix, all-zero rows stay zero"""
+        X = sparse.csr_matrix(X, dtype=np.float32, copy=True)
+        norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        X.data /= np.repeat(norms, np.diff(X.indptr)).astype(np.float32)
+        return X
+
+    def fit(self, X) -> "ExactCosineIndex":
+        self.X = self.normalise(X)
+        return self
+
+    def query(self, X, k: int) -> tuple:
+        """
+        Finds the k training rows most similar to each row of X
+        Returns the indices and the cosine similarities of the neighbours, each of shape (n_queries, k),
+        most similar first
+        """
+        return self._query_normalised(self.normalise(X), k)
+
+    def _query_normalised(self, Q: sparse.csr_matrix, k: int) -> tuple:
+        indices = np.empty((Q.shape[0], k), dtype=np.int64)
+        similarities = np.empty((Q.shape[0], k), dtype=np.float32)
+        # A block of queries is densified, so it holds at most block_size features as well
+        rows_per_block = max(1, self.block_size // max(self.X.shape[0], self.X.shape[1], 1))
+        for start in range(0, Q.shape[0], rows_per_block):
+            block = slice(start, start + rows_per_block)
+            # Most similarities are not zero, so a sparse times dense product is faster than a sparse one
+            S = np.ascontiguousarray((self.X @ Q[block].T.toarray()).T)
+            indices[block], similarities[block] = self._top_k(S, k)
+        return indices, similarities
+
+    @staticmethod
+    def _top_k(S: np.ndarray, k: int) -> tuple:
+        """Returns the columns of the k largest values of each row of S and the values, largest first. Overwrites S"""
+        # Negated in place, the k smallest values are then found without copying S
+        np.negative(S, out=S)
+        if k < S.shape[1]:
+            top = np.argpartition(S, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(S.shape[1]), S.shape)
+        top_distances = np.take_along_axis(S, top, axis=1)
+        order = np.argsort(top_distances, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1), -np.take_along_axis(top_distances, order, axis=1)
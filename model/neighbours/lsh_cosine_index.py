@@ -0,0 +1,106 @@
+import numpy as np
+from scipy import sparse
+
+from model.neighbours.exact_cosine_index import ExactCosineIndex
+from utilities.configuration.config import Config
+
+
+# Approximate nearest neighbours by cosine similarity with random projection LSH. Each of n_tables hash tables
+# gives a row an n_bits code, one bit per random hyperplane telling on which side of it the row lies, so rows at a
+# small angle usually share a code. Only the training rows sharing a code with the query in some table are compared
+# with it exactly. More tables find more of the true neighbours, more bits make the buckets and the queries smaller.
+# A bucket contributes at most max_bucket_size rows, queries with fewer than k candidates are answered exactly.
+class LshCosineIndex(ExactCosineIndex):
+    def __init__(self, n_tables: int = Config.KNN_LSH_TABLES, n_bits: int = Config.KNN_LSH_BITS,
+                 max_bucket_size: int = Config.KNN_LSH_MAX_BUCKET_SIZE, block_size: int = Config.KNN_BLOCK_SIZE,
+                 random_state: int = Config.RANDOM_SEED) -> None:
+        super().__init__(block_size)
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.max_bucket_size = max_bucket_size
+        self.random_state = random_state
+        self.planes = None
+        # Per table, the training rows ordered by their code and the codes in that order
+        self._orders = None
+        self._sorted_codes = None
+        # Queries answered exactly because their buckets held fewer than k rows, for tuning the knobs
+        self.exact_fallbacks = 0
+
+    def fit(self, X) -> "LshCosineIndex":
+        super().fit(X)
+        rng = np.random.default_rng(self.random_state)
+        self.planes = rng.standard_normal((self.X.shape[1], self.n_tables * self.n_bits), dtype=np.float32)
+        codes = self._codes(self.X)
+        self._orders = np.argsort(codes, axis=0, kind="stable").T
+        self._sorted_codes = np.take_along_axis(codes, self._orders.T, axis=0).T
+        return self
+
+    def _codes(self, Q: sparse.csr_matrix) -> np.ndarray:
+        """Returns the code of every row in every table, of shape (n_rows, n_tables)"""
+        bits = np.asarray(Q @ self.planes) > 0
+        weights = np.left_shift(1, np.arange(self.n_bits, dtype=np.int64))
+        return bits.reshape(Q.shape[0], self.n_tables, self.n_bits) @ weights
+
+    def _query_normalised(self, Q: sparse.csr_matrix, k: int) -> tuple:
+        indices = np.empty((Q.shape[0], k), dtype=np.int64)
+        similarities = np.empty((Q.shape[0], k), dtype=np.float32)
+        # A query has at most n_tables * max_bucket_size candidates, a block holds at most block_size of them
+        rows_per_block = max(1, self.block_size // (self.n_tables * self.max_bucket_size))
+        for start in range(0, Q.shape[0], rows_per_block):
+            block = slice(start, start + rows_per_block)
+            indices[block], similarities[block] = self._query_block(Q[block], k)
+        return indices, similarities
+
+    def _query_block(self, Q: sparse.csr_matrix, k: int) -> tuple:
+        query_rows, candidates = self._candidates(Q)
+        # Each candidate pair once, even when the query and the row share a bucket in several tables
+        pairs = np.sort(query_rows * self.X.shape[0] + candidates)
+        pairs = pairs[np.append(True, pairs[1:] != pairs[:-1])]
+        query_rows, candidates = np.divmod(pairs, self.X.shape[0])
+        pair_similarities = self._pair_similarities(Q.toarray(), query_rows, candidates)
+
+        # Sorted by query and then by similarity, the first k pairs of each query are its neighbours
+        order = np.lexsort((-pair_similarities, query_rows))
+        query_rows, candidates, pair_similarities = query_rows[order], candidates[order], pair_similarities[order]
+        starts = np.searchsorted(query_rows, np.arange(Q.shape[0]))
+        counts = np.diff(np.append(starts, len(query_rows)))
+        ranks = np.arange(len(query_rows)) - np.repeat(starts, counts)
+        kept = ranks < k
+
+        indices = np.empty((Q.shape[0], k), dtype=np.int64)
+        similarities = np.empty((Q.shape[0], k), dtype=np.float32)
+        indices[query_rows[kept], ranks[kept]] = candidates[kept]
+        similarities[query_rows[kept], ranks[kept]] = pair_similarities[kept]
+
+        too_few = np.flatnonzero(counts < k)
+        if len(too_few):
+            self.exact_fallbacks += len(too_few)
+            indices[too_few], similarities[too_few] = super()._query_normalised(Q[too_few], k)
+        return indices, similarities
+
+    def _pair_similarities(self, Q: np.ndarray, query_rows: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Returns the dot product of each query row with its candidate, reading only the features of the candidate"""
+        starts = self.X.indptr[candidates]
+        lengths = self.X.indptr[candidates + 1] - starts
+        # Positions of the stored features of every candidate in X.data, one run per pair
+        positions = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) \
+            + np.repeat(starts, lengths)
+        products = self.X.data[positions] * Q[np.repeat(query_rows, lengths), self.X.indices[positions]]
+        return np.bincount(np.repeat(np.arange(len(candidates)), lengths), weights=products,
+                           minlength=len(candidates)).astype(np.float32)
+
+    def _candidates(self, Q: sparse.csr_matrix) -> tuple:
+        """Returns every (query row, training row) pair sharing a bucket, as two arrays"""
+        codes = self._codes(Q)
+        query_rows = []
+        candidates = []
+        for table in range(self.n_tables):
+            sorted_codes = self._sorted_codes[table]
+            first = np.searchsorted(sorted_codes, codes[:, table], side="left")
+            counts = np.minimum(np.searchsorted(sorted_codes, codes[:, table], side="right") - first,
+                                self.max_bucket_size)
+            # Positions first[i], ..., first[i] + counts[i] - 1 of every query i, without a loop over the queries
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            query_rows.append(np.repeat(np.arange(Q.shape[0]), counts))
+            candidates.append(self._orders[table][np.repeat(first, counts) + offsets])
+        return np.concatenate(query_rows), np.concatenate(candidates)
@@ -2,6 +2,13 @@ from abc import ABC, abstractmethod
 
 class EmailClassificationObserver(ABC):
     @abstractmethod
-    def update(self, ts, ic, classification: str) -> None:
-        """This method is called when the subject notifies its subscribers"""
-        pass
\ No newline at end of file
+    def update(self, ts, ic, classification: str, label_name: str = None) -> None:
+        """This method is called when the subject notifies its subscribers.
+        label_name is the label the classification is for, None if the subject does not know it."""
+        pass
+
+    def update_batch(self, ts, ic, classifications, label_name: str = None) -> None:
+        """This method is called when the subject notifies its subscribers of a batch of classifications.
+        By default update is called for each classification, observers that can do better override it."""
+        for email_ts, email_ic, classification in zip(ts, ic, classifications):
+            self.update(email_ts, email_ic, classification, label_name)
@@ -0,0 +1,114 @@
+import atexit
+import queue
+import threading
+
+import numpy as np
+
+from observers.email_classification_observer import EmailClassificationObserver
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.error_logger import ErrorLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# Observer that hands classifications on to its own observers from a background worker, so classifying never waits
+# for them. Notifications are queued and merged into arrays of up to max_batch_size classifications, every observer
+# gets them through update_batch, one batch per label in the order they were classified. When max_queue_size
+# notifications are waiting, notifying blocks until the worker catches up. Queued notifications are delivered before
+# the process exits.
+class ObserverBus(EmailClassificationObserver):
+    def __init__(self, max_queue_size: int = Config.OBSERVER_QUEUE_SIZE,
+                 max_batch_size: int = Config.OBSERVER_BATCH_SIZE) -> None:
+        self.max_batch_size = max_batch_size
+        self._observers = []
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        # Batches delivered to the observers and observer errors, for reporting
+        self.batches = 0
+        self.errors = 0
+        self._closed = False
+        self.error_logger = PrefixLogger(ErrorLogger(), "ObserverBus")
+        self._worker = threading.Thread(target=self._run, name="ObserverBus", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def add_observer(self, observer: EmailClassificationObserver) -> None:
+        """Subscribe an observer to the bus."""
+        if observer not in self._observers:
+            self._observers.append(observer)
+
+    def remove_observer(self, observer: EmailClassificationObserver) -> None:
+        """Unsubscribe an observer from the bus."""
+        if observer in self._observers:
+            self._observers.remove(observer)
+
+    def update(self, ts, ic, classification: str, label_name: str = None) -> None:
+        self.update_batch([ts], [ic], [classification], label_name)
+
+    def update_batch(self, ts, ic, classifications, label_name: str = None) -> None:
+        """Queues a batch of classifications, ts and ic hold the texts of the email of each classification"""
+        event = (np.asarray(ts), np.asarray(ic), np.asarray(classifications), label_name)
+        if self._closed:
+            # Nothing would deliver it any more
+            self._deliver([event])
+            return
+        self._queue.put(event)
+
+    def flush(self) -> None:
+        """Blocks until every queued classification has been delivered to the observers"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Delivers what is queued and stops the worker, later notifications are delivered on the calling thread"""
+        if self._closed:
+            return
+        self._queue.put(None)
+        self._worker.join()
+        self._closed = True
+        atexit.unregister(self.close)
+
+    def _next_events(self) -> list:
+        """Blocks for the next notification, then takes what is already queued up to max_batch_size classifications"""
+        events = [self._queue.get()]
+        size = 0 if events[0] is None else len(events[0][2])
+        while events[-1] is not None and size < self.max_batch_size:
+            try:
+                event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            events.append(event)
+            if event is not None:
+                size += len(event[2])
+        return events
+
+    def _run(self) -> None:
+        while True:
+            events = self._next_events()
+            stop = events[-1] is None
+            if stop:
+                events.pop()
+            if events:
+                self._deliver(events)
+            for _ in range(len(events) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _deliver(self, events: list) -> None:
+        # Notifications for the same label are merged into one batch, keeping their order
+        events_by_label = {}
+        for event in events:
+            events_by_label.setdefault(event[3], []).append(event)
+        for label_name, label_events in events_by_label.items():
+            ts, ic, classifications = (np.concatenate(column) if len(label_events) > 1 else column[0]
+                                       for column in list(zip(*label_events))[:3])
+            self._deliver_batch(ts, ic, classifications, label_name)
+
+    def _deliver_batch(self, ts, ic, classifications, label_name) -> None:
+        self.batches += 1
+        for observer in list(self._observers):
+            try:
+                observer.update_batch(ts, ic, classifications, label_name)
+            except Exception as e:
+                # One failing observer must not stop the others or the classification
+                self.errors += 1
+                self.error_logger.log(f"{type(observer).__name__} failed on {len(classifications)} "
+                                      f"classifications: {e}")
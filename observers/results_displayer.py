@@ -1,4 +1,3 @@
-
 from observers.email_classification_observer import EmailClassificationObserver
 from utilities.logger.decorators.indentation_decorator import IndentationDecorator
 from utilities.logger.concrete_logger.info_logger import InfoLogger
@@ -8,16 +7,27 @@ from utilities.logger.decorators.prefix_decorator import PrefixLogger
 class ResultsDisplayer(EmailClassificationObserver):
     info_logger = InfoLogger()
 
-    def update(self, ts, ic, classification: str) -> None:
+    def __init__(self):
+        # The logger chain is composed once and shared by every result displayed
+        display_logger = PrefixLogger(ResultsDisplayer.info_logger, "ResultsDisplayer")
+        self.display_logger = IndentationDecorator(display_logger)
+
+    def update(self, ts, ic, classification: str, label_name: str = None) -> None:
         self._display(ts, ic, classification)
 
+    def update_batch(self, ts, ic, classifications, label_name: str = None) -> None:
+        # Nothing is formatted when info messages are turned off
+        if not self.display_logger.is_enabled():
+            return
+        for email_ts, email_ic, classification in zip(ts, ic, classifications):
+            self._display(email_ts, email_ic, classification)
+
     def _display(self, ts, ic, classification: str) -> None:
         """Print classification result."""
-        display_logger = PrefixLogger(ResultsDisplayer.info_logger, "ResultsDisplayer")
-        display_logger = IndentationDecorator(display_logger)
+        display_logger = self.display_logger
 
         display_logger.log(f"Email classification result:")
         display_logger.log(f"Ticket summary: {ts}")
         display_logger.log(f"Interaction content: {ic}")
         display_logger.log(f"Classification: {classification}")
-        display_logger.log("=" * 75)
\ No newline at end of file
+        display_logger.log("=" * 75)
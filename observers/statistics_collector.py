@@ -1,90 +1,156 @@
 import numpy as np
-
+import pandas as pd
 
 from observers.email_classification_observer import EmailClassificationObserver
+from utilities.configuration.config import Config
 from utilities.logger.decorators.indentation_decorator import IndentationDecorator
 from utilities.logger.concrete_logger.info_logger import InfoLogger
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
 
 
 # StatisticsCollector keeps track of classification statistics for an email classifier.
+# Counts are kept per label in an array indexed by class. A batch is counted with one bincount over its distinct
+# classifications, and a report takes time proportional to the number of classes however many were counted.
 class StatisticsCollector(EmailClassificationObserver):
-    _label_1_stats: dict[str, int]
-    _label_2_stats: dict[str, int]
-    _label_3_stats: dict[str, int]
-    _label_4_stats: dict[str, int]
+    # Classes reported when the collector is not given the classes of the trained models
+    DEFAULT_LABEL_CLASSES = {
+        "y1": ["AppGallery &amp; Games ", "In-App Purchase "],
+        "y2": ["Others", "Problem/Fault", "Suggestion"],
+        "y3": ["AppGallery-Install/Upgrade", "AppGallery-Use", "Third Party APPs", "VIP / Offers / Promotions",
+               "General", "Coupon/Gifts/Points Issues", "Other", "Payment", "Payment issue", "Invoice"],
+        "y4": ["Can't update Apps", "Others ", "Refund", "Offers / Vouchers / Promotions", "Can't download Apps",
+               "Cannot connect - Server", "Can't install Apps", "Other download/install/update issue",
+               "Personal data", "AppGallery not loading", "Can't use or acquire", "UI Abnormal in Huawei AppGallery",
+               "Security issue / malware", "Cooperated campaign issue", "Subscription cancellation",
+               "Within 14 days of purchase (not product issue)", "Query deduction details", "Payment failed",
+               "Invoice related request", "Risk Control"],
+    }
+
+    # Heading of each label in the report, the column the label was read from (see DataProcessor.renaming_cols)
+    LABEL_HEADINGS = {"y1": Config.GROUPED, "y2": Config.CLASS_COL, "y3": Config.TYPE_COLS[0],
+                      "y4": Config.TYPE_COLS[1]}
+
+    _classes: dict[str, np.ndarray]
+    _counts: dict[str, np.ndarray]
     _unclassified: int
-    _total_classifications: int
-
-    def __init__(self):
-        self._label_1_stats = {"AppGallery &amp; Games ": 0, "In-App Purchase ": 0}
-        self._label_2_stats = {"Others": 0, "Problem/Fault": 0, "Suggestion": 0}
-        self._label_3_stats = {"AppGallery-Install/Upgrade": 0, "AppGallery-Use": 0, "Third Party APPs": 0,
-                               "VIP / Offers / Promotions": 0, "General": 0, "Coupon/Gifts/Points Issues": 0,
-                               "Other": 0, "Payment": 0, "Payment issue": 0, "Invoice": 0}
-        self._label_4_stats = {"Can't update Apps": 0, "Others ": 0, "Refund": 0, "Offers / Vouchers / Promotions": 0,
-                               "Can't download Apps": 0, "Cannot connect - Server": 0, "Can't install Apps": 0,
-                               "Other download/install/update issue": 0, "Personal data": 0,
-                               "AppGallery not loading": 0, "Can't use or acquire": 0,
-                               "UI Abnormal in Huawei AppGallery": 0, "Security issue / malware": 0,
-                               "Cooperated campaign issue": 0, "Subscription cancellation": 0,
-                               "Within 14 days of purchase (not product issue)": 0, "Query deduction details": 0,
-                               "Payment failed": 0, "Invoice related request": 0, "Risk Control": 0}
+
+    def __init__(self, label_classes: dict = None):
+        """
+        :param label_classes: label name -> the classes predicted for it, such as the classes_ of its trained model
+        """
+        # Sorted classes per label, the counts of a label are indexed by the position of the class in them
+        self._classes = {}
+        self._counts = {}
+        # Classifications for no known label that none of the labels has a class for
         self._unclassified = 0
-        self._total_classifications = 0
+        for label_name, classes in (label_classes or self.DEFAULT_LABEL_CLASSES).items():
+            self._add_classes(label_name, classes)
         self.info_logger = InfoLogger()
 
-    def update(self, _, __, classification: str) -> None:
-        self._update_stats(classification)
+    @staticmethod
+    def from_models(models: list) -> "StatisticsCollector":
+        """Creates a collector for the classes of trained ClassificationContexts whose label names are set"""
+        label_classes = {}
+        for model in models:
+            classes = model.get_fitted_model().classes_
+            # A multi-output model has the classes of each of its labels
+            per_label = classes if len(model.label_names) > 1 else [classes]
+            label_classes.update(zip(model.label_names, per_label))
+        return StatisticsCollector(label_classes)
+
+    def update(self, _, __, classification: str, label_name: str = None) -> None:
+        self.update_batch([], [], [classification], label_name)
+
+    def update_batch(self, _, __, classifications, label_name: str = None) -> None:
+        # The distinct classifications are found by hashing, only they are looked up among the classes.
+        # Missing classifications get the code -1 and are counted as unclassified
+        codes, values = pd.factorize(np.asarray(classifications))
+        counts = np.bincount(codes[codes >= 0], minlength=len(values))
+        values = np.asarray(values).astype(str)
+        # 'nan' is what a multi-output model predicts for a level that does not apply, it is not a class either
+        labelled = values != 'nan'
+        self._unclassified += int((codes < 0).sum()) + int(counts[~labelled].sum())
+        values, counts = values[labelled], counts[labelled]
+        if label_name is None:
+            self._count_without_label(values, counts)
+        else:
+            self._count(label_name, values, counts)
+
+    def merge(self, other: "StatisticsCollector") -> "StatisticsCollector":
+        """Adds the counts of another collector, e.g. one filled by a parallel worker or an earlier stream"""
+        for label_name, classes in other._classes.items():
+            self._add_classes(label_name, classes)
+            positions = np.searchsorted(self._classes[label_name], classes)
+            self._counts[label_name][positions] += other._counts[label_name]
+        self._unclassified += other._unclassified
+        return self
+
+    def counts(self, label_name: str) -> dict:
+        """Returns class -> number of classifications for a label"""
+        return dict(zip(self._classes[label_name].tolist(), self._counts[label_name].tolist()))
 
     def display_stats(self) -> None:
         """Print out a report of collected statistics."""
-        total_emails_classified = self._total_classifications // 4
+        label_totals = {label_name: int(counts.sum()) for label_name, counts in self._counts.items()}
+        total_classifications = sum(label_totals.values()) + self._unclassified
+        # Every email is classified once for each label
+        total_emails_classified = max(label_totals.values(), default=0)
 
         decorated_logger = PrefixLogger(self.info_logger, "StatisticsCollector")
         decorated_logger.log(f"Statistics report:")
         layer_1 = IndentationDecorator(decorated_logger)
         layer_2 = IndentationDecorator(layer_1)
 
-        if sum(self._label_1_stats.values()) > 0:
-            layer_1.log("Type 1:")
-            for key, value in self._label_1_stats.items():
-                percentage = np.round(value / sum(self._label_1_stats.values()) * 100, 2)
-                layer_2.log(f"- {key.ljust(47)}: {value} | {percentage}%")
-
-        if sum(self._label_2_stats.values()) > 0:
-            layer_1.log("Type 2:")
-            for key, value in self._label_2_stats.items():
-                percentage = np.round(value / sum(self._label_2_stats.values()) * 100, 2)
-                layer_2.log(f"- {key.ljust(47)}: {value} | {percentage}%")
-
-        if sum(self._label_3_stats.values()) > 0:
-            layer_1.log("Type 3:")
-            for key, value in self._label_3_stats.items():
-                percentage = np.round(value / sum(self._label_3_stats.values()) * 100, 2)
-                layer_2.log(f"- {key.ljust(47)}: {value} | {percentage}%")
-
-        if sum(self._label_4_stats.values()) > 0:
-            layer_1.log("Type 4:")
-            for key, value in self._label_4_stats.items():
-                percentage = np.round(value / sum(self._label_4_stats.values()) * 100, 2)
-                layer_2.log(f"- {key.ljust(47)}: {value} | {percentage}%")
+        for label_name, counts in self._counts.items():
+            if label_totals[label_name] == 0:
+                continue
+            layer_1.log(f"{self.LABEL_HEADINGS.get(label_name, label_name)}:")
+            percentages = np.round(counts / label_totals[label_name] * 100, 2)
+            for position in self._report_order(label_name):
+                key = self._classes[label_name][position]
+                layer_2.log(f"- {key.ljust(47)}: {counts[position]} | {percentages[position]}%")
 
         layer_1.log()
-        layer_1.log(f"Total classifications made: {self._total_classifications}")
+        layer_1.log(f"Total classifications made: {total_classifications}")
         layer_1.log(f"Total emails classified: {total_emails_classified}")
         layer_1.log(f"Total unclassified labels: {self._unclassified}")
 
-    def _update_stats(self, classification: str) -> None:
-        """Update statistics."""
-        if classification in self._label_1_stats.keys():
-            self._label_1_stats[classification] += 1
-        elif classification in self._label_2_stats.keys():
-            self._label_2_stats[classification] += 1
-        elif classification in self._label_3_stats.keys():
-            self._label_3_stats[classification] += 1
-        elif classification in self._label_4_stats.keys():
-            self._label_4_stats[classification] += 1
-        else:
-            self._unclassified += 1
-        self._total_classifications += 1
\ No newline at end of file
+    def _report_order(self, label_name: str) -> list:
+        """Returns the positions of a label's classes in the order of DEFAULT_LABEL_CLASSES, other classes last"""
+        default_order = {key: i for i, key in enumerate(self.DEFAULT_LABEL_CLASSES.get(label_name, []))}
+        classes = self._classes[label_name]
+        return sorted(range(len(classes)), key=lambda position: default_order.get(classes[position], len(classes)))
+
+    def _add_classes(self, label_name: str, classes) -> None:
+        """Adds the classes a label does not have yet, keeping the counts of those it has"""
+        classes = np.unique(np.asarray(classes).astype(str))
+        # The 'nan' class of a multi-output model is never counted, see update_batch
+        classes = classes[classes != 'nan']
+        if label_name not in self._classes:
+            self._classes[label_name] = classes
+            self._counts[label_name] = np.zeros(len(classes), dtype=np.int64)
+            return
+        known = self._classes[label_name]
+        if np.isin(classes, known).all():
+            return
+        merged = np.union1d(known, classes)
+        counts = np.zeros(len(merged), dtype=np.int64)
+        counts[np.searchsorted(merged, known)] = self._counts[label_name]
+        self._classes[label_name] = merged
+        self._counts[label_name] = counts
+
+    def _count(self, label_name: str, values: np.ndarray, counts: np.ndarray) -> None:
+        """Adds the counts of distinct classifications to a label"""
+        if label_name not in self._classes or not np.isin(values, self._classes[label_name]).all():
+            # A class the label was not known to have, e.g. predicted by a model trained on newer data
+            self._add_classes(label_name, values)
+        self._counts[label_name][np.searchsorted(self._classes[label_name], values)] += counts
+
+    def _count_without_label(self, values: np.ndarray, counts: np.ndarray) -> None:
+        """Counts each classification for the first label that has its class, as the subject did not say which"""
+        for label_name, classes in self._classes.items():
+            known = np.isin(values, classes)
+            if known.any():
+                self._count(label_name, values[known], counts[known])
+                values, counts = values[~known], counts[~known]
+        self._unclassified += int(counts.sum())
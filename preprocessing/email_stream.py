@@ -0,0 +1,38 @@
+from preprocessing.processor import DataProcessor
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+
+
+# Generator pipeline that prepares a csv of unclassified emails one chunk at a time,
+# so only a single chunk is held in memory regardless of the file size
+class EmailStream:
+    def __init__(self, vectoriser: DataProcessor, chunk_size: int = Config.STREAM_CHUNK_SIZE,
+                 file_manager: FileManager = None) -> None:
+        self.vectoriser = vectoriser
+        self.chunk_size = chunk_size
+        self.file_manager = file_manager or FileManager()
+
+    def read(self, file_path: str):
+        """Yields the input columns of the csv in chunks"""
+        yield from self.file_manager.load_csv_in_chunks(file_path, self.chunk_size,
+                                                        [Config.TICKET_SUMMARY, Config.INTERACTION_CONTENT])
+
+    @staticmethod
+    def preprocess(chunks):
+        """Renames and translates each chunk"""
+        for email_df in chunks:
+            email_df = DataProcessor.renaming_cols(email_df)
+            email_df = DataProcessor.translate_data_frame(email_df)
+            yield email_df
+
+    def vectorise(self, chunks):
+        """Yields each chunk together with its feature matrix"""
+        for email_df in chunks:
+            yield email_df, self.vectoriser.vectorize_unclassified_data(email_df)
+
+    def stream(self, file_path: str):
+        """
+        Chains the pipeline together
+        Returns a generator of (DataFrame, X) pairs, one per chunk of the csv
+        """
+        return self.vectorise(self.preprocess(self.read(file_path)))
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# On-disk cache of the vectorised training data, keyed by a fingerprint of the preprocessed data and the vectoriser
+# parameters. The arrays are saved as .npy files and loaded memory-mapped, so they are read without being copied
+# and training workers map the same files read-only.
+class FeatureCache:
+    CACHE_VERSION = 1
+    LABEL_COLUMNS = ("y1", "y2", "y3", "y4")
+
+    def __init__(self, directory: str = Config.FEATURE_CACHE_DIR,
+                 max_entries: int = Config.FEATURE_CACHE_MAX_ENTRIES) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.info_logger = PrefixLogger(InfoLogger(), "FeatureCache")
+
+    @staticmethod
+    def fingerprint(data_frame: pd.DataFrame, vectoriser) -> str:
+        """Hashes the text and label columns, in row order, together with the parameters of the vectoriser"""
+        digest = hashlib.sha256(f"version {FeatureCache.CACHE_VERSION}\0".encode("utf-8"))
+        columns = ["x_ic", "x_ts", *FeatureCache.LABEL_COLUMNS]
+        digest.update(pd.util.hash_pandas_object(data_frame[columns].astype(str), index=False).to_numpy().tobytes())
+        digest.update(json.dumps(vectoriser.get_params(), sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def load(self, key: str):
+        """
+        Loads the features saved under key, memory-mapped read-only
+        Returns (X, y, fitted vectoriser), or None if nothing is saved under key
+        """
+        entry = os.path.join(self.directory, key)
+        manifest_path = os.path.join(entry, "manifest.json")
+        if not os.path.isfile(manifest_path):
+            return None
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        def open_array(name: str) -> np.ndarray:
+            return np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r")
+
+        if manifest["format"] == "csr":
+            X = sparse.csr_matrix((open_array("X_data"), open_array("X_indices"), open_array("X_indptr")),
+                                  shape=tuple(manifest["shape"]), copy=False)
+        else:
+            X = open_array("X")
+        y = {label_name: open_array(label_name) for label_name in manifest["labels"]}
+        vectoriser = joblib.load(os.path.join(entry, "vectoriser.joblib"))
+        # Mark the entry as recently used for eviction
+        os.utime(entry)
+        self.info_logger.log(f"Loaded features {X.shape[0]} x {X.shape[1]} from {entry}")
+        return X, y, vectoriser
+
+    def save(self, key: str, X, y: dict, vectoriser):
+        """
+        Saves the features under key and evicts the least recently used entries beyond the maximum
+        Returns the saved (X, y, vectoriser), memory-mapped from the cache
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        # Written to a temporary directory and renamed, so a concurrent or interrupted run never sees half an entry
+        staging = tempfile.mkdtemp(dir=self.directory, prefix=".staging-")
+        try:
+            if sparse.issparse(X):
+                X = X.tocsr()
+                arrays = {"X_data": X.data, "X_indices": X.indices, "X_indptr": X.indptr}
+                manifest = {"format": "csr"}
+            else:
+                arrays = {"X": np.ascontiguousarray(X)}
+                manifest = {"format": "dense"}
+            # Labels are saved as fixed width strings, which can be memory-mapped. Missing labels become 'nan',
+            # which DataProcessor.labelled_mask treats as missing
+            for label_name, y_val in y.items():
+                arrays[label_name] = np.asarray(y_val).astype(str)
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, f"{name}.npy"), array)
+            joblib.dump(vectoriser, os.path.join(staging, "vectoriser.joblib"))
+
+            manifest.update({"cache_version": self.CACHE_VERSION, "shape": list(X.shape), "labels": list(y)})
+            with open(os.path.join(staging, "manifest.json"), "w") as manifest_file:
+                json.dump(manifest, manifest_file, indent=4)
+
+            entry = os.path.join(self.directory, key)
+            if os.path.isdir(entry):
+                shutil.rmtree(entry)
+            os.replace(staging, entry)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self.info_logger.log(f"Saved features {X.shape[0]} x {X.shape[1]} to {entry}")
+        self._evict(keep=key)
+        return self.load(key)
+
+    def _evict(self, keep: str) -> None:
+        entries = [name for name in os.listdir(self.directory)
+                   if not name.startswith(".") and name != keep
+                   and os.path.isdir(os.path.join(self.directory, name))]
+        entries.sort(key=lambda name: os.path.getmtime(os.path.join(self.directory, name)), reverse=True)
+        for name in entries[max(self.max_entries - 1, 0):]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def clear(self) -> None:
+        """Removes every cached entry"""
+        shutil.rmtree(self.directory, ignore_errors=True)
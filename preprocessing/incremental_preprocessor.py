@@ -0,0 +1,118 @@
+import json
+import os
+
+import pandas as pd
+
+from preprocessing.processor import DataProcessor
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# Keeps the preprocessed store up to date with the training data, only rows whose texts are new or changed
+# are translated and cleaned again. Every other column is taken from the training data as it is.
+class IncrementalPreprocessor:
+    # Columns added to the preprocessed store to track where each row came from and what its texts were
+    SOURCE_COLUMN = "source_file"
+    TEXT_HASH_COLUMN = "text_hash"
+
+    def __init__(self, file_manager: FileManager = None, store_path: str = Config.PREPROCESSED_DATA_PATH,
+                 legacy_store_path: str = Config.PREPROCESSED_CSV_PATH) -> None:
+        self.file_manager = file_manager or FileManager()
+        self.store_path = store_path
+        self.legacy_store_path = legacy_store_path
+        # Fingerprints of the training data files the store was built from, saved next to the store
+        self.sources_path = os.path.splitext(store_path)[0] + ".sources.json"
+        # Number of rows translated and cleaned by the last update
+        self.processed_rows = 0
+        self.info_logger = PrefixLogger(InfoLogger(), "IncrementalPreprocessor")
+
+    def has_store(self) -> bool:
+        return self.file_manager.exists_file(self.store_path) or self.file_manager.exists_file(self.legacy_store_path)
+
+    def load_store(self, columns: list = None) -> pd.DataFrame:
+        """
+        Loads the preprocessed store, converting a csv store saved by earlier versions first
+        Raises FileNotFoundError if there is no store
+        """
+        if not self.file_manager.exists_file(self.store_path):
+            self.file_manager.save_table(self.file_manager.load_csv(self.legacy_store_path), self.store_path)
+        return self.file_manager.load_table(self.store_path, columns=columns)
+
+    def _source_fingerprints(self, directory_path: str) -> dict:
+        fingerprints = {}
+        for file_path in self.file_manager.list_tables_in_directory(directory_path):
+            stat = os.stat(file_path)
+            fingerprints[os.path.basename(file_path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        return fingerprints
+
+    def _load_sources(self):
+        if not os.path.isfile(self.sources_path):
+            return None
+        with open(self.sources_path) as sources_file:
+            return json.load(sources_file)
+
+    @staticmethod
+    def hash_texts(data_frame: pd.DataFrame) -> pd.Series:
+        """Returns one hash per row of the untranslated ticket summary and interaction content"""
+        return pd.util.hash_pandas_object(data_frame[["x_ts", "x_ic"]].astype(str), index=False)
+
+    def update(self, directory_path: str = Config.TRAINING_DATA_DIR) -> pd.DataFrame:
+        """
+        Brings the preprocessed store up to date with the training data in directory_path and saves it
+        Returns the preprocessed DataFrame
+        """
+        self.processed_rows = 0
+        sources = self._source_fingerprints(directory_path)
+        if self.has_store() and self._load_sources() == sources:
+            self.info_logger.log("Training data is unchanged, using the preprocessed data as it is")
+            return self.load_store()
+
+        # Duplicates are removed over all training data, old and new, exactly as a full preprocessing run would
+        df = self.file_manager.load_all_csvs_in_directory(directory_path, source_column=self.SOURCE_COLUMN)
+        df = DataProcessor.renaming_cols(df)
+        df = DataProcessor.de_duplication(df)
+        df = DataProcessor.replace_nan_data_in_column(df, "x_ts")
+        df = DataProcessor.replace_nan_data_in_column(df, "x_ic")
+        df = df.reset_index(drop=True)
+        df[self.TEXT_HASH_COLUMN] = self.hash_texts(df).to_numpy()
+
+        reused = self._reuse_preprocessed_texts(df)
+        changed = ~reused
+        self.processed_rows = int(changed.sum())
+        self.info_logger.log(f"{int(reused.sum())} rows already preprocessed, "
+                             f"{self.processed_rows} new or changed rows to preprocess")
+        if self.processed_rows:
+            new_rows = df.loc[changed, ["x_ts", "x_ic"]].copy()
+            new_rows = DataProcessor.translate_data_frame(new_rows)
+            new_rows = DataProcessor.remove_noise(new_rows)
+            df.loc[changed, ["x_ts", "x_ic"]] = new_rows[["x_ts", "x_ic"]].to_numpy()
+
+        self.file_manager.save_table(df, self.store_path)
+        with open(self.sources_path, "w") as sources_file:
+            json.dump(sources, sources_file, indent=4)
+        return df
+
+    def _reuse_preprocessed_texts(self, df: pd.DataFrame):
+        """
+        Copies the preprocessed texts of rows whose Interaction id and texts are already in the store into df
+        Returns a boolean mask of the rows that were reused
+        """
+        reused = pd.Series(False, index=df.index)
+        if not self.has_store():
+            return reused
+
+        store = self.load_store()
+        store = store.drop_duplicates(subset="Interaction id", keep="last").set_index("Interaction id")
+        in_store = df["Interaction id"].isin(store.index)
+        matched = store.reindex(df.loc[in_store, "Interaction id"])
+        if self.TEXT_HASH_COLUMN in store.columns:
+            same_texts = matched[self.TEXT_HASH_COLUMN].to_numpy() == df.loc[in_store, self.TEXT_HASH_COLUMN].to_numpy()
+        else:
+            # A store written before texts were hashed, its rows are trusted by Interaction id
+            same_texts = True
+        reused[in_store] = same_texts
+        reused_ids = df.loc[reused, "Interaction id"]
+        df.loc[reused, ["x_ts", "x_ic"]] = store.loc[reused_ids, ["x_ts", "x_ic"]].to_numpy()
+        return reused
@@ -0,0 +1,112 @@
+import re
+
+from utilities.logger.concrete_logger.error_logger import ErrorLogger
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# Tiered language detection: obvious english is decided by cheap heuristics, everything else goes to stanza
+class LanguageDetector:
+    # Short words that are also common in other languages (a, in, no, so, ...) are left out on purpose
+    ENGLISH_STOPWORDS = frozenset("""
+        about after all also and any are as at be because been but by can could did do does
+        for from get got had has have he her him his how if into is it its just my not of
+        or our out please some than that the their them then there these they this to up us
+        was we were what when which who why will with would you your""".split())
+
+    # Frequent function words of the other languages in our data, they mark a text as ambiguous
+    FOREIGN_STOPWORDS = frozenset("""
+        der die das und ist nicht ich sie mit auf ein eine den dem zu wir bitte danke
+        le la les et est je vous pas une des du pour avec merci qui dans sur
+        el los las que por una con para es muy gracias como pero
+        il che di non sono per una della grazie ho ma
+        het een niet ik en van dat
+        och att jag inte det som med
+        og ikke jeg er til
+        bir ve bu icin cok
+        nie jest sie na tak""".split())
+
+    # Most frequent character trigrams of english text
+    ENGLISH_TRIGRAMS = frozenset("""
+        the and ing ion tio ent ati for her ter hat tha ere con res ver all ons nce men ith ted ers pro
+        thi wit are ess not ive was ect rea com eve per int est sta cti ica ist ear ain one our iti rat
+        you ple ase can app pay""".split())
+
+    _WORD_PATTERN = re.compile(r"[a-z']+")
+
+    def __init__(self, identifier_provider, min_words: int = 3, min_ascii_ratio: float = 0.97,
+                 min_stopword_rate: float = 0.2, min_trigram_rate: float = 0.15) -> None:
+        """
+        :param identifier_provider: callable returning the stanza langid pipeline, only called when it is needed
+        """
+        self.identifier_provider = identifier_provider
+        self.min_words = min_words
+        self.min_ascii_ratio = min_ascii_ratio
+        self.min_stopword_rate = min_stopword_rate
+        self.min_trigram_rate = min_trigram_rate
+        self.tier_counts = {"empty": 0, "fast_path": 0, "stanza": 0, "failed": 0}
+        self.info_logger = PrefixLogger(InfoLogger(), "LanguageDetector")
+        self.error_logger = PrefixLogger(ErrorLogger(), "LanguageDetector")
+
+    def is_obviously_english(self, text: str) -> bool:
+        """Cheap check for english text, false means the text is ambiguous rather than not english"""
+        letters = [char for char in text if char.isalpha()]
+        if not letters:
+            return False
+        ascii_ratio = sum(char.isascii() for char in letters) / len(letters)
+        if ascii_ratio < self.min_ascii_ratio:
+            return False
+
+        words = self._WORD_PATTERN.findall(text.lower())
+        if len(words) < self.min_words:
+            return False
+        english_hits = sum(word in self.ENGLISH_STOPWORDS for word in words)
+        foreign_hits = sum(word in self.FOREIGN_STOPWORDS for word in words)
+        if english_hits / len(words) < self.min_stopword_rate or foreign_hits * 3 >= english_hits:
+            return False
+
+        trigrams = [word[i:i + 3] for word in words for i in range(len(word) - 2)]
+        if not trigrams:
+            return False
+        return sum(trigram in self.ENGLISH_TRIGRAMS for trigram in trigrams) / len(trigrams) >= self.min_trigram_rate
+
+    def detect(self, texts: list) -> list:
+        """
+        Detects the language of each text
+        Returns a list of stanza language codes, None for empty texts or texts that could not be detected
+        """
+        languages = [None] * len(texts)
+        ambiguous = []
+        for idx, text in enumerate(texts):
+            if text == "":
+                self.tier_counts["empty"] += 1
+            elif self.is_obviously_english(text):
+                languages[idx] = "en"
+                self.tier_counts["fast_path"] += 1
+            else:
+                ambiguous.append(idx)
+
+        if ambiguous:
+            # Imported here so english-only data never imports stanza
+            from stanza.models.common.doc import Document
+            # All ambiguous texts go to stanza as a single batch of documents
+            docs = [Document([], text=texts[idx]) for idx in ambiguous]
+            try:
+                self.identifier_provider()(docs)
+                for idx, doc in zip(ambiguous, docs):
+                    languages[idx] = doc.lang
+                self.tier_counts["stanza"] += len(ambiguous)
+            except Exception as e:
+                self.error_logger.log(f"Stanza language identification failed: {e}")
+                self.tier_counts["failed"] += len(ambiguous)
+
+        return languages
+
+    def log_tier_counts(self) -> None:
+        counts = self.tier_counts
+        self.info_logger.log(f"Texts decided - fast path: {counts['fast_path']}, stanza: {counts['stanza']}, "
+                             f"empty: {counts['empty']}, failed: {counts['failed']}")
+
+    def reset_tier_counts(self) -> None:
+        for tier in self.tier_counts:
+            self.tier_counts[tier] = 0
@@ -0,0 +1,145 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+# Precompiled noise removal, every text is cleaned in a single pass instead of one pass over the column per pattern.
+# The output is byte-for-byte the same as running the patterns one after another with Series.replace.
+# Series.str.lower works on Arrow strings and lowercases some characters unlike str.lower ("İ" becomes "i", not "i"
+# and a combining dot), so texts are lowercased through a Series as well.
+class NoiseRemover:
+    TICKET_SUMMARY_NOISE = "(sv\\s*:)|(wg\\s*:)|(ynt\\s*:)|(fw(d)?\\s*:)|(r\\s*:)|(re\\s*:)|(\\[|\\])|" \
+                           "(aspiegel support issue submit)|(null)|(nan)|((bonus place my )?support.pt 自动回复:)"
+    # Matches a backslash followed by s's, kept as it was in the original noise removal
+    BACKSLASH_S = re.compile(r'\\s+')
+
+    _MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+    # Stages are applied in order. A stage is skipped when the text contains none of its literals,
+    # every match of the pattern contains at least one of them so the result is the same.
+    INTERACTION_CONTENT_STAGES = [
+        # "(r\\s*:)|(re\\s*:)" as "re?\\s*:", the two alternatives can never match at the same position
+        ("(from :)|(subject :)|(sent :)|(re?\\s*:)", (":",)),
+        # Every month name contains its abbreviation
+        ("(january|february|march|april|may|june|july|august|september|october|november|december)", _MONTHS),
+        ("(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)", _MONTHS),
+        ("(monday|tuesday|wednesday|thursday|friday|saturday|sunday)", ("day",)),
+        ("\\d{2}(:|.)\\d{2}", None),
+        ("(xxxxx@xxxx\\.com)|(\\*{5}\\([a-z]+\\))", ("xxxxx@xxxx.com", "*****(")),
+        # "dear ((customer)|(user))" followed by "dear". Removing the first can neither create nor split a "dear"
+        ("dear( ((customer)|(user)))?", ("dear",)),
+        ("(hello)|(hallo)|(hi )|(hi there)", ("hello", "hallo", "hi ")),
+        ("good morning", ("good morning",)),
+        ("thank you for your patience ((during (our)? investigation)|(and cooperation))?", ("thank you",)),
+        ("thank you for contacting us", ("thank you",)),
+        ("thank you for your availability", ("thank you",)),
+        ("thank you for providing us this information", ("thank you",)),
+        ("thank you for contacting", ("thank you",)),
+        ("thank you for reaching us (back)?", ("thank you",)),
+        ("thank you for patience", ("thank you",)),
+        ("thank you for (your)? reply", ("thank you",)),
+        ("thank you for (your)? response", ("thank you",)),
+        ("thank you for (your)? cooperation", ("thank you",)),
+        ("thank you for providing us with more information", ("thank you",)),
+        ("thank you very kindly", ("thank you",)),
+        ("thank you( very much)?", ("thank you",)),
+        ("i would like to follow up on the case you raised on the date", ("i would like to follow up",)),
+        ("i will do my very best to assist you"
+         "in order to give you the best solution", ("i will do my very best",)),
+        ("could you please clarify your request with following information:"
+         "in this matter", ("could you please clarify",)),
+        ("we hope you(( are)|('re)) doing ((fine)|(well))", ("we hope you",)),
+        ("i would like to follow up on the case you raised on", ("i would like to follow up",)),
+        ("we apologize for the inconvenience", ("we apologize for the inconvenience",)),
+        ("sent from my huawei (cell )?phone", ("sent from my huawei",)),
+        ("original message", ("original message",)),
+        ("customer support team", ("customer support team",)),
+        ("(aspiegel )?se is a company incorporated under the laws of ireland with its headquarters in dublin, ireland.",
+         ("se is a company incorporated",)),
+        ("(aspiegel )?se is the provider of huawei mobile services to huawei and honor device owners in",
+         ("se is the provider",)),
+        ("canada, australia, new zealand and other countries", ("canada, australia",)),
+        # "\\d+" followed by "[^0-9a-zA-Z]+". Digit runs become spaces, so every maximal run of
+        # non-letters ends up as one space either way
+        ("[^a-zA-Z]+", None),
+        ("(\\s|^).(\\s|$)", None),
+        # The trailing backslash pass is dropped, no backslash survives "[^a-zA-Z]+"
+    ]
+
+    @staticmethod
+    def _compile(pattern: str) -> re.Pattern:
+        """Compiles a pattern with non-capturing groups, which are faster and equivalent as the replacement never refers to a group"""
+        return re.compile(re.sub(r"(?<!\\)\((?!\?)", "(?:", pattern))
+
+    @staticmethod
+    def _compile_stages(stages: list) -> list:
+        """
+        Compiles the stages, consecutive stages with the same literals are grouped so the literals are only searched for once
+        Returns a list of (literals, [compiled patterns]) tuples
+        """
+        compiled = []
+        for pattern, literals in stages:
+            pattern = NoiseRemover._compile(pattern)
+            if compiled and compiled[-1][0] == literals and literals is not None:
+                compiled[-1][1].append(pattern)
+            else:
+                compiled.append((literals, [pattern]))
+        return compiled
+
+    @staticmethod
+    def lower(texts: list) -> list:
+        """Lowercases the texts like Series.str.lower, anything that is not a string becomes NaN"""
+        lowered = iter(pd.Series([text for text in texts if isinstance(text, str)], dtype="str").str.lower())
+        return [next(lowered) if isinstance(text, str) else np.nan for text in texts]
+
+    @staticmethod
+    def clean_ticket_summary(text):
+        return NoiseRemover.clean_ticket_summaries([text])[0]
+
+    @staticmethod
+    def clean_interaction_content(text):
+        return NoiseRemover.clean_interaction_contents([text])[0]
+
+    @staticmethod
+    def _clean_lowered_ticket_summary(text):
+        if not isinstance(text, str):
+            return np.nan
+        text = NoiseRemover._COMPILED_TICKET_SUMMARY_NOISE.sub(" ", text)
+        return NoiseRemover.BACKSLASH_S.sub(" ", text).strip()
+
+    @staticmethod
+    def _clean_lowered_interaction_content(text):
+        if not isinstance(text, str):
+            return np.nan
+        for literals, patterns in NoiseRemover._COMPILED_STAGES:
+            if literals is None or any(literal in text for literal in literals):
+                for pattern in patterns:
+                    text = pattern.sub(" ", text)
+        return text.strip()
+
+    @staticmethod
+    def clean_ticket_summaries(texts: list) -> list:
+        return [NoiseRemover._clean_lowered_ticket_summary(text) for text in NoiseRemover.lower(texts)]
+
+    @staticmethod
+    def clean_interaction_contents(texts: list) -> list:
+        return [NoiseRemover._clean_lowered_interaction_content(text) for text in NoiseRemover.lower(texts)]
+
+    @staticmethod
+    def clean_column(texts: list, cleaner, workers: int = 1) -> list:
+        """
+        Cleans a list of texts with the given cleaner, in shards over a process pool if workers > 1
+        Returns the cleaned texts in the same order
+        """
+        if workers <= 1 or len(texts) < 2 * workers:
+            return cleaner(texts)
+        shard_size = -(-len(texts) // workers)
+        shards = [texts[start:start + shard_size] for start in range(0, len(texts), shard_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return [text for shard in executor.map(cleaner, shards) for text in shard]
+
+
+NoiseRemover._COMPILED_TICKET_SUMMARY_NOISE = NoiseRemover._compile(NoiseRemover.TICKET_SUMMARY_NOISE)
+NoiseRemover._COMPILED_STAGES = NoiseRemover._compile_stages(NoiseRemover.INTERACTION_CONTENT_STAGES)
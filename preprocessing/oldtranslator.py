@@ -1,9 +1,7 @@
 import warnings
 import numpy as np
-import stanza
-from stanza.pipeline.core import DownloadMethod
-from transformers import M2M100ForConditionalGeneration, M2M100Tokenizer
 
+from preprocessing.translation_engine import TranslationEngine
 from utilities.logger.concrete_logger.error_logger import ErrorLogger
 from utilities.logger.concrete_logger.warning_logger import WarningLogger
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
@@ -12,7 +10,9 @@ from utilities.logger.decorators.prefix_decorator import PrefixLogger
 #The legacy translator code, which we need to adapt wo work with a list-based interface
 class OldTranslator:
     @staticmethod
-    def trans_to_en(texts : np.array):
+    def trans_to_en(texts : np.array, engine : TranslationEngine = None):
+        # The models are owned by the process-wide engine so they are only loaded once
+        engine = engine or TranslationEngine()
         error_logger = ErrorLogger()
         warning_logger = WarningLogger()
 
@@ -24,20 +24,10 @@ class OldTranslator:
 
         with warnings.catch_warnings(record=True) as caught_warning:
 
-            t2t_m = "facebook/m2m100_418M"
-
-            model = M2M100ForConditionalGeneration.from_pretrained(t2t_m)
-            tokenizer = M2M100Tokenizer.from_pretrained(t2t_m)
-            nlp_stanza = stanza.Pipeline(lang="multilingual",
-                                         processors="langid",
-                                         download_method=DownloadMethod.REUSE_RESOURCES)
-            language_map = {
-                "fro": "fr",  # Old French
-                "la": "it",  # Latin
-                "nn": "no",  # Norwegian (Nynorsk)
-                "kmr": "tr",  # Kurmanji
-                "mt": "pl"   # maltese to polish because there is no maltese (in the dataset or the model)
-            }
+            model = engine.model
+            tokenizer = engine.tokenizer
+            nlp_stanza = engine.language_identifier
+            language_map = TranslationEngine.LANGUAGE_MAP
 
             text_en_l = []
             for text in texts:
@@ -70,6 +60,8 @@ class OldTranslator:
                 except Exception as e:
                     error_logger.log("Error occured")
                     error_logger.log(str(e))
+                    # Keep the output aligned with the input
+                    text_en_l.append(text)
 
             for warning in caught_warning:
                 if issubclass(warning.category, FutureWarning):
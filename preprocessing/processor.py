@@ -1,10 +1,15 @@
 import numpy as np
 import pandas as pd
+from scipy import sparse
 
-from sklearn.feature_extraction.text import TfidfVectorizer
 
+from preprocessing.noise_remover import NoiseRemover
 from preprocessing.oldtranslator import OldTranslator
+from preprocessing.translation_cache import TranslationCache
+from preprocessing.translation_engine import TranslationEngine
 from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
 
 
 
@@ -20,16 +25,38 @@ class VectoriserManager:
         return cls.instance.data_processor
 
 class DataProcessor:
-    tfidfconverter = TfidfVectorizer(max_features=2000, min_df=4, max_df=0.90)
+    _tfidfconverter = None
+
+    @property
+    def tfidfconverter(self):
+        """Returns the TF-IDF vectoriser, it is created on first use so scikit-learn is only imported when needed"""
+        if self._tfidfconverter is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            DataProcessor._tfidfconverter = TfidfVectorizer(max_features=2000, min_df=4, max_df=0.90)
+        return self._tfidfconverter
+
+    @tfidfconverter.setter
+    def tfidfconverter(self, vectoriser) -> None:
+        self._tfidfconverter = vectoriser
+
+    @staticmethod
+    def create_hashing_vectoriser(n_features: int = Config.ONLINE_HASH_FEATURES):
+        """
+        Returns a stateless vectoriser for the online models. Its feature space does not depend on the data,
+        so models trained on it can keep learning from new rows. Features are non-negative for naive bayes.
+        """
+        from sklearn.feature_extraction.text import HashingVectorizer
+        return HashingVectorizer(n_features=n_features, alternate_sign=False, norm="l2")
 
     def fit_vectoriser(self, column_data):
         return self.tfidfconverter.fit(column_data)
 
     def vectorize_data(self, data_frame):
         ## Step 6: Textual data numerically:
-        x_ic = self.tfidfconverter.transform(data_frame["x_ic"]).toarray()
-        x_ts = self.tfidfconverter.transform(data_frame["x_ts"]).toarray()
-        X = np.concatenate((x_ic, x_ts), axis=1)
+        # The features stay sparse (CSR), almost all TF-IDF values are zero
+        x_ic = self.tfidfconverter.transform(data_frame["x_ic"])
+        x_ts = self.tfidfconverter.transform(data_frame["x_ts"])
+        X = sparse.hstack((x_ic, x_ts), format="csr")
         # remove bad test cases from test dataset
         # convert the 4 labels in to an array of labels
         y = {
@@ -41,9 +68,9 @@ class DataProcessor:
         return X, y
 
     def vectorize_unclassified_data(self, data_frame):
-        x_ic = self.tfidfconverter.transform(data_frame["x_ic"]).toarray()
-        x_ts = self.tfidfconverter.transform(data_frame["x_ts"]).toarray()
-        X = np.concatenate((x_ic, x_ts), axis=1)
+        x_ic = self.tfidfconverter.transform(data_frame["x_ic"])
+        x_ts = self.tfidfconverter.transform(data_frame["x_ts"])
+        X = sparse.hstack((x_ic, x_ts), format="csr")
         return X
 
     @staticmethod
@@ -70,84 +97,62 @@ class DataProcessor:
         # Remove all rows with duplicates
         df_no_duplicates = data_frame[~data_frame.duplicated(subset="Interaction id", keep=False)]
 
-        print(data_frame.shape[0] - df_no_duplicates.shape[0], "Rows removed due to duplicates and incorrect labelling")
+        # Logged, not printed, so it stays in order with the buffered log output
+        PrefixLogger(InfoLogger(), "DataProcessor").log(
+            f"{data_frame.shape[0] - df_no_duplicates.shape[0]} Rows removed due to duplicates and incorrect labelling")
         return df_no_duplicates
 
     @staticmethod
     def replace_nan_data_in_column(data_frame, column_name):
-        for idx, entry in enumerate(data_frame[column_name]):
-            if entry == 'nan' or entry is None or entry != entry:
-                data_frame.loc[idx, column_name]= ""
+        missing = ~DataProcessor.labelled_mask(data_frame[column_name].to_numpy())
+        data_frame[column_name] = data_frame[column_name].mask(missing, "")
         return data_frame
 
     @staticmethod
-    def remove_noise(data_frame):
+    def labelled_mask(values) -> np.ndarray:
+        """Returns a boolean mask that is False where a value is missing (None, NaN or 'nan')"""
+        values = np.asarray(values, dtype=object)
+        return ~(pd.isna(values) | (values == 'nan'))
+
+    @staticmethod
+    def order_by_labels(data_frame, label_columns=("y1", "y2", "y3", "y4")):
+        """
+        Orders the rows by how many labels they have, most first.
+        Our labels are nested (a row with y4 also has y3, ...), so the labelled rows of every label form a prefix
+        and remove_nan_rows can return views of one shared feature matrix instead of copies.
+        """
+        label_counts = sum(DataProcessor.labelled_mask(data_frame[column].to_numpy()).astype(int)
+                           for column in label_columns)
+        order = np.argsort(-label_counts, kind="stable")
+        return data_frame.iloc[order].reset_index(drop=True)
+
+    @staticmethod
+    def remove_noise(data_frame, workers: int = Config.NOISE_REMOVAL_WORKERS):
         ### Step 4: Noise Removal
         # remove re:
         # remove extrac white space
-        # remove
-        noise = "(sv\\s*:)|(wg\\s*:)|(ynt\\s*:)|(fw(d)?\\s*:)|(r\\s*:)|(re\\s*:)|(\\[|\\])|(aspiegel support issue submit)|(null)|(nan)|((bonus place my )?support.pt 自动回复:)"
-        data_frame["x_ts"] = data_frame["x_ts"].str.lower().replace(noise, " ", regex=True).replace(r'\\s+', ' ', regex=True).str.strip()
-
-        data_frame["x_ic"] = data_frame["x_ic"].str.lower()
-        noise_1 = [
-            "(from :)|(subject :)|(sent :)|(r\\s*:)|(re\\s*:)",
-            "(january|february|march|april|may|june|july|august|september|october|november|december)",
-            "(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)",
-            "(monday|tuesday|wednesday|thursday|friday|saturday|sunday)",
-            "\\d{2}(:|.)\\d{2}",
-            "(xxxxx@xxxx\\.com)|(\\*{5}\\([a-z]+\\))",
-            "dear ((customer)|(user))",
-            "dear",
-            "(hello)|(hallo)|(hi )|(hi there)",
-            "good morning",
-            "thank you for your patience ((during (our)? investigation)|(and cooperation))?",
-            "thank you for contacting us",
-            "thank you for your availability",
-            "thank you for providing us this information",
-            "thank you for contacting",
-            "thank you for reaching us (back)?",
-            "thank you for patience",
-            "thank you for (your)? reply",
-            "thank you for (your)? response",
-            "thank you for (your)? cooperation",
-            "thank you for providing us with more information",
-            "thank you very kindly",
-            "thank you( very much)?",
-            "i would like to follow up on the case you raised on the date",
-            "i will do my very best to assist you"
-            "in order to give you the best solution",
-            "could you please clarify your request with following information:"
-            "in this matter",
-            "we hope you(( are)|('re)) doing ((fine)|(well))",
-            "i would like to follow up on the case you raised on",
-            "we apologize for the inconvenience",
-            "sent from my huawei (cell )?phone",
-            "original message",
-            "customer support team",
-            "(aspiegel )?se is a company incorporated under the laws of ireland with its headquarters in dublin, ireland.",
-            "(aspiegel )?se is the provider of huawei mobile services to huawei and honor device owners in",
-            "canada, australia, new zealand and other countries",
-            "\\d+",
-            "[^0-9a-zA-Z]+",
-            "(\\s|^).(\\s|$)"]
-        for noise in noise_1:
-            # print(noise)
-            data_frame["x_ic"] = data_frame["x_ic"].replace(noise, " ", regex=True)
-        data_frame["x_ic"] = data_frame["x_ic"].replace(r'\\s+', ' ', regex=True).str.strip()
-
+        # remove greetings, signatures, dates and other boilerplate
+        # The patterns are precompiled and applied to each text in one pass, see NoiseRemover
+        data_frame["x_ts"] = NoiseRemover.clean_column(data_frame["x_ts"].to_list(),
+                                                       NoiseRemover.clean_ticket_summaries, workers)
+        data_frame["x_ic"] = NoiseRemover.clean_column(data_frame["x_ic"].to_list(),
+                                                       NoiseRemover.clean_interaction_contents, workers)
         return data_frame
 
     @staticmethod
     def remove_nan_rows(X, y):
-        indices_of_nans = []
-        for idx, y_val in enumerate(y):
-            if y_val == 'nan' or y_val != y_val:
-                indices_of_nans.append(idx)
-
-        X = np.delete(X, indices_of_nans, axis=0)
-        y = np.delete(y, indices_of_nans)
-        return X, y
+        labelled = DataProcessor.labelled_mask(y)
+        n_labelled = int(labelled.sum())
+        # When the labelled rows are a prefix (see order_by_labels) slicing returns views and nothing is copied
+        if labelled[:n_labelled].all():
+            if sparse.isspmatrix_csr(X):
+                # Row slicing a CSR matrix copies, build one on top of the same buffers instead
+                end = X.indptr[n_labelled]
+                X = sparse.csr_matrix((X.data[:end], X.indices[:end], X.indptr[:n_labelled + 1]),
+                                      shape=(n_labelled, X.shape[1]), copy=False)
+                return X, y[:n_labelled]
+            return X[:n_labelled], y[:n_labelled]
+        return X[labelled], y[labelled]
 
     @staticmethod
     def translate_data_frame(data_frame):
@@ -157,17 +162,84 @@ class DataProcessor:
 
     # Translation
     @staticmethod
-    def trans_to_en(texts : list):
-        ta = TranslatorAdaptor(texts)
+    def trans_to_en(texts : list, batch_size : int = Config.TRANSLATION_BATCH_SIZE):
+        ta = TranslatorAdaptor(texts, batch_size)
         return ta.trans_to_en()
 
 #Adapter to use legacy code on new interface
 class TranslatorAdaptor(OldTranslator):
 
     texts : np.array
+    batch_size : int
+    engine : TranslationEngine
+    cache : TranslationCache
 
-    def __init__(self, texts : list):
+    def __init__(self, texts : list, batch_size : int = Config.TRANSLATION_BATCH_SIZE,
+                 cache : TranslationCache = None):
         self.texts = np.array(texts)
+        self.batch_size = batch_size
+        self.engine = TranslationEngine()
+        if cache is None and Config.TRANSLATION_CACHE_ENABLED:
+            cache = TranslationCache.get_instance()
+        self.cache = cache
 
     def trans_to_en(self):
-        return super().trans_to_en(self.texts)
+        texts = self.texts.tolist()
+        if self.cache is None:
+            return self._translate(texts)[0]
+
+        # Only texts that are not cached are sent to the models
+        text_en_l = list(texts)
+        cached = self.cache.get_many(texts)
+        # Cache key -> positions of the texts missing from the cache, repeated texts are translated once
+        missing = {}
+        for idx, (text, entry) in enumerate(zip(texts, cached)):
+            if entry is not None:
+                language, text_en = entry
+                # English texts are cached without a translation and keep their original form
+                text_en_l[idx] = text if language == "en" else text_en
+            elif text != "":
+                missing.setdefault(self.cache.make_key(text), []).append(idx)
+
+        if missing:
+            positions = list(missing.values())
+            translated, languages = self._translate([texts[same_text[0]] for same_text in positions])
+            new_entries = []
+            for same_text, text_en, language in zip(positions, translated, languages):
+                source_text = texts[same_text[0]]
+                for idx in same_text:
+                    # An english text keeps its own form, its repeats may differ in whitespace or normalisation
+                    text_en_l[idx] = texts[idx] if language == "en" else text_en
+                # Failed translations keep their source text, they are not cached so they are retried next time
+                if language == "en" or text_en != source_text:
+                    new_entries.append((source_text, language, "" if language == "en" else text_en))
+            self.cache.put_many(new_entries)
+
+        self.cache.log_stats()
+        return text_en_l
+
+    def _translate(self, texts : list):
+        """Returns the translations and the detected languages, None where the language is unknown"""
+        # Batched translation, a batch size below 2 falls back to the legacy one text at a time translator
+        if self.batch_size and self.batch_size > 1:
+            languages = self.engine.detect_languages(texts)
+            return self.engine.translate_batched(texts, self.batch_size, languages), languages
+        # Detected like the legacy translator does, so english texts are known and cached, the rest go to it
+        languages = [self._detect_language(text) for text in texts]
+        text_en_l = list(texts)
+        foreign = [idx for idx, language in enumerate(languages) if language != "en"]
+        if foreign:
+            for idx, text_en in zip(foreign, super().trans_to_en(np.array([texts[idx] for idx in foreign]),
+                                                                 self.engine)):
+                text_en_l[idx] = text_en
+        return text_en_l, languages
+
+    def _detect_language(self, text : str):
+        """Returns the M2M100 code of the language stanza detects, None for empty or undetectable texts"""
+        if text == "":
+            return None
+        try:
+            language = self.engine.language_identifier(text).lang
+        except Exception:
+            return None
+        return TranslationEngine.LANGUAGE_MAP.get(language, language)
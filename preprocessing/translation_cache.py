@@ -0,0 +1,143 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# On-disk cache of translations, keyed by a hash of the normalised source text and the model name
+class TranslationCache:
+    instance = None
+
+    # SQLite limits the number of parameters in a single statement
+    _QUERY_CHUNK_SIZE = 500
+
+    def __init__(self, path: str = Config.TRANSLATION_CACHE_PATH,
+                 max_entries: int = Config.TRANSLATION_CACHE_MAX_ENTRIES,
+                 model_name: str = Config.TRANSLATION_MODEL) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.info_logger = PrefixLogger(InfoLogger(), "TranslationCache")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("""CREATE TABLE IF NOT EXISTS translations (
+                                        key TEXT PRIMARY KEY,
+                                        model TEXT NOT NULL,
+                                        language TEXT,
+                                        text_en TEXT NOT NULL,
+                                        last_used REAL NOT NULL)""")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+        self._connection.commit()
+
+    @classmethod
+    def get_instance(cls) -> "TranslationCache":
+        """Returns the cache shared by the whole process, opening it on first use"""
+        if cls.instance is None:
+            cls.instance = cls()
+        return cls.instance
+
+    @staticmethod
+    def normalise(text: str) -> str:
+        """Normalises text so that unicode and whitespace variants share a cache entry"""
+        return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+    def make_key(self, text: str) -> str:
+        """Returns the cache key for a text under the current model"""
+        return hashlib.sha256(f"{self.model_name}\0{self.normalise(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: list) -> list:
+        """
+        Looks up a list of texts
+        Returns a list with a (language, text_en) tuple for every hit and None for every miss
+        """
+        keys = [self.make_key(text) for text in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._QUERY_CHUNK_SIZE):
+                chunk = list(set(keys[start:start + self._QUERY_CHUNK_SIZE]))
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, language, text_en FROM translations WHERE key IN ({placeholders})", chunk)
+                for key, language, text_en in rows:
+                    found[key] = (language, text_en)
+
+            # Refresh the recency of every hit for LRU eviction
+            if found:
+                now = time.time()
+                self._connection.executemany("UPDATE translations SET last_used = ? WHERE key = ?",
+                                             [(now, key) for key in found])
+                self._connection.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(result is not None for result in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+        return results
+
+    def put_many(self, entries: list) -> None:
+        """Stores a list of (text, language, text_en) tuples and evicts the least recently used if over capacity"""
+        if not entries:
+            return
+        now = time.time()
+        rows = [(self.make_key(text), self.model_name, language, text_en, now) for text, language, text_en in entries]
+        with self._lock:
+            self._connection.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)", rows)
+            self._connection.commit()
+            self._evict()
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries, down to 90% of capacity so eviction does not run on every put"""
+        count = self._connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        to_remove = count - int(self.max_entries * 0.9)
+        self._connection.execute("""DELETE FROM translations WHERE key IN (
+                                        SELECT key FROM translations ORDER BY last_used LIMIT ?)""", (to_remove,))
+        self._connection.commit()
+        self.evictions += to_remove
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Returns the hit, miss and eviction counters of this process"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        self.info_logger.log(f"{stats['hits']} hits, {stats['misses']} misses, "
+                             f"{stats['evictions']} evictions ({stats['hit_rate'] * 100:.1f}% hit rate)")
+
+    def clear(self) -> None:
+        """Removes every cached translation"""
+        with self._lock:
+            self._connection.execute("DELETE FROM translations")
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+        if TranslationCache.instance is self:
+            TranslationCache.instance = None
@@ -0,0 +1,171 @@
+import gc
+import threading
+import time
+import warnings
+
+from preprocessing.language_detector import LanguageDetector
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.error_logger import ErrorLogger
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.concrete_logger.warning_logger import WarningLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+# Singleton instance - one set of translation models per process
+# transformers and stanza take seconds to import, they are only imported when a model is first loaded
+class TranslationEngine:
+    instance = None
+
+    # Stanza language codes that M2M100 does not know, mapped to the closest language it does
+    LANGUAGE_MAP = {
+        "fro": "fr",  # Old French
+        "la": "it",  # Latin
+        "nn": "no",  # Norwegian (Nynorsk)
+        "kmr": "tr",  # Kurmanji
+        "mt": "pl"   # maltese to polish because there is no maltese (in the dataset or the model)
+    }
+
+    def __new__(cls):
+        if cls.instance is None:  # If instance is not created, create it
+            cls.instance = super(TranslationEngine, cls).__new__(cls)
+            cls.instance._initialise()
+        return cls.instance
+
+    def _initialise(self) -> None:
+        self.model_name = Config.TRANSLATION_MODEL
+        self._model = None
+        self._tokenizer = None
+        self._language_identifier = None
+        self._lock = threading.RLock()
+        self.detector = LanguageDetector(lambda: self.language_identifier)
+        # Load statistics, used to check that the models are only loaded once
+        self.load_count = 0
+        self.load_time = 0.0
+        self.info_logger = PrefixLogger(InfoLogger(), "TranslationEngine")
+        self.error_logger = PrefixLogger(ErrorLogger(), "TranslationEngine")
+        self.warning_logger = PrefixLogger(WarningLogger(), "TranslationEngine")
+
+    @property
+    def model(self):
+        """Returns the M2M100 model, loading it on first use"""
+        with self._lock:
+            if self._model is None:
+                from transformers import M2M100ForConditionalGeneration
+                self._model = self._timed_load(M2M100ForConditionalGeneration.from_pretrained, self.model_name)
+            return self._model
+
+    @property
+    def tokenizer(self):
+        """Returns the M2M100 tokenizer, loading it on first use"""
+        with self._lock:
+            if self._tokenizer is None:
+                from transformers import M2M100Tokenizer
+                self._tokenizer = self._timed_load(M2M100Tokenizer.from_pretrained, self.model_name)
+            return self._tokenizer
+
+    @property
+    def language_identifier(self):
+        """Returns the stanza language identification pipeline, building it on first use"""
+        with self._lock:
+            if self._language_identifier is None:
+                import stanza
+                from stanza.pipeline.core import DownloadMethod
+                self._language_identifier = self._timed_load(stanza.Pipeline,
+                                                             lang="multilingual",
+                                                             processors="langid",
+                                                             download_method=DownloadMethod.REUSE_RESOURCES)
+            return self._language_identifier
+
+    def is_loaded(self) -> bool:
+        """Checks if all models are currently held in memory"""
+        return None not in (self._model, self._tokenizer, self._language_identifier)
+
+    def warm_up(self) -> None:
+        """Loads all models up front so the first translation does not pay for it"""
+        with self._lock:
+            _ = self.model, self.tokenizer, self.language_identifier
+
+    def release(self) -> None:
+        """Drops all loaded models so their memory can be reclaimed. They are reloaded on next use."""
+        with self._lock:
+            if self._model is None and self._tokenizer is None and self._language_identifier is None:
+                return
+            self._model = None
+            self._tokenizer = None
+            self._language_identifier = None
+            gc.collect()
+            self.info_logger.log("Released translation models")
+
+    def detect_languages(self, texts: list) -> list:
+        """
+        Detects the language of each text
+        Returns a list of M2M100 language codes, None for empty texts or texts that could not be detected
+        """
+        languages = self.detector.detect(list(texts))
+        self.detector.log_tier_counts()
+        return [self.LANGUAGE_MAP.get(lang, lang) for lang in languages]
+
+    def translate_batched(self, texts: list, batch_size: int = Config.TRANSLATION_BATCH_SIZE,
+                          languages: list = None) -> list:
+        """
+        Translates texts to english, running one generate call per padded mini-batch.
+        Texts are grouped by source language and sorted by token length so each batch needs little padding.
+        Languages are detected unless already given by the caller.
+        Returns the translations in the same order as the input
+        """
+        texts = list(texts)
+        text_en_l = list(texts)
+        if languages is None:
+            languages = self.detect_languages(texts)
+
+        # Group the positions of non-english texts by their source language
+        groups = {}
+        for idx, lang in enumerate(languages):
+            if lang is not None and lang != "en":
+                groups.setdefault(lang, []).append(idx)
+        if not groups:
+            # Nothing to translate, the translation model does not need to be loaded
+            return text_en_l
+
+        with warnings.catch_warnings(record=True) as caught_warning, self._lock:
+            model = self.model
+            tokenizer = self.tokenizer
+            forced_bos_token_id = tokenizer.get_lang_id("en")
+
+            for lang, positions in groups.items():
+                try:
+                    tokenizer.src_lang = lang
+                    input_ids = tokenizer([texts[idx] for idx in positions])["input_ids"]
+                except Exception as e:
+                    self.error_logger.log(f"Tokenisation failed for language '{lang}': {e}")
+                    continue
+
+                # Sort by token length so each batch is padded to a similar length
+                order = sorted(range(len(positions)), key=lambda i: len(input_ids[i]))
+                for start in range(0, len(order), batch_size):
+                    batch = order[start:start + batch_size]
+                    try:
+                        encoded = tokenizer.pad({"input_ids": [input_ids[i] for i in batch]}, return_tensors="pt")
+                        generated_tokens = model.generate(**encoded, forced_bos_token_id=forced_bos_token_id)
+                        decoded = tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+                    except Exception as e:
+                        self.error_logger.log(f"Translation failed for a batch of {len(batch)} '{lang}' texts: {e}")
+                        continue
+                    # Put the translations back in their original positions
+                    for i, text_en in zip(batch, decoded):
+                        text_en_l[positions[i]] = text_en
+
+        for warning in caught_warning:
+            if issubclass(warning.category, FutureWarning):
+                self.warning_logger.log(f"{warning.message}")
+
+        return text_en_l
+
+    def _timed_load(self, loader, *args, **kwargs):
+        start_time = time.perf_counter()
+        loaded = loader(*args, **kwargs)
+        elapsed = time.perf_counter() - start_time
+        self.load_count += 1
+        self.load_time += elapsed
+        self.info_logger.log(f"Loaded {getattr(loader, '__qualname__', loader)} in {elapsed:.2f} seconds")
+        return loaded
@@ -0,0 +1,54 @@
+import http.client
+import json
+import socket
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float = None) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.path)
+
+
+# Client for a local ClassificationServer, the address has the same form as the server's
+class ClassificationClient:
+    def __init__(self, address: str, timeout: float = 60) -> None:
+        self.address = address
+        self.timeout = timeout
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.address.startswith("unix:"):
+            return UnixHTTPConnection(self.address[len("unix:"):], self.timeout)
+        host, port = self.address.rsplit(":", 1)
+        return http.client.HTTPConnection(host, int(port), timeout=self.timeout)
+
+    def _request(self, method: str, path: str, payload: dict = None) -> dict:
+        connection = self._connect()
+        try:
+            body = json.dumps(payload) if payload is not None else None
+            connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            result = json.loads(response.read())
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise RuntimeError(f"Server returned {response.status}: {result.get('error')}")
+        return result
+
+    def classify(self, emails: list) -> list:
+        """
+        Classifies emails, each a dict with a ticket_summary and an interaction_content
+        Returns a dict of label name -> classification for every email
+        """
+        return self._request("POST", "/classify", {"emails": emails})["classifications"]
+
+    def metrics(self) -> dict:
+        return self._request("GET", "/metrics")
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
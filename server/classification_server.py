@@ -0,0 +1,213 @@
+import json
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from preprocessing.processor import DataProcessor
+from preprocessing.translation_engine import TranslationEngine
+from server.micro_batcher import MicroBatcher
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.error_logger import ErrorLogger
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+
+
+class ThreadingTCPHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Concurrent clients queue up in the listen backlog until a thread accepts them
+    request_queue_size = 128
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Connecting to a Unix socket with a full backlog fails instead of waiting
+    request_queue_size = 128
+
+    def server_bind(self) -> None:
+        # Replace a socket file left behind by an earlier server
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        self.server_name = "localhost"
+        self.server_port = 0
+
+
+# Keeps the vectoriser, the translation engine and the per-label models loaded and classifies emails sent over
+# local HTTP, on a TCP port or a Unix socket. Concurrent requests are classified together in micro-batches.
+class ClassificationServer:
+    # Fields every email sent to /classify must have, as strings
+    EMAIL_FIELDS = ("ticket_summary", "interaction_content")
+
+    def __init__(self, vectoriser: DataProcessor, models: dict, address: str = Config.SERVER_ADDRESS,
+                 max_batch_size: int = Config.SERVER_MAX_BATCH_SIZE,
+                 max_delay: float = Config.SERVER_MAX_DELAY) -> None:
+        """
+        :param vectoriser: DataProcessor holding the fitted vectoriser the models were trained with
+        :param models: label name -> trained ClassificationContext
+        :param address: "host:port", or "unix:/path/to/socket"
+        """
+        self.vectoriser = vectoriser
+        self.models = models
+        self.address = address
+        self.batcher = MicroBatcher(self.classify_emails, max_batch_size, max_delay)
+        self.requests = 0
+        self._requests_lock = threading.Lock()
+        self.started = time.time()
+        self.info_logger = PrefixLogger(InfoLogger(), "ClassificationServer")
+        self.error_logger = PrefixLogger(ErrorLogger(), "ClassificationServer")
+        self._http_server = None
+
+    @staticmethod
+    def parse_emails(body) -> list:
+        """
+        Returns the emails of a request body, a single email or an object with a list of emails
+        Raises a ValueError naming the first email that is not an object with every field as a string
+        """
+        if not isinstance(body, dict):
+            raise ValueError("Expected a JSON object")
+        emails = body["emails"] if "emails" in body else [body]
+        if not isinstance(emails, list):
+            raise ValueError("Expected emails to be a list")
+        for index, email in enumerate(emails):
+            if not isinstance(email, dict):
+                raise ValueError(f"Email {index} is not an object")
+            for field in ClassificationServer.EMAIL_FIELDS:
+                if not isinstance(email.get(field), str):
+                    raise ValueError(f"Email {index} has no {field} string")
+        return emails
+
+    def classify_emails(self, emails: list) -> list:
+        """
+        Classifies a batch of emails, each a dict with a ticket_summary and an interaction_content
+        Returns a dict of label name -> classification for every email
+        """
+        email_df = pd.DataFrame({
+            Config.TICKET_SUMMARY: [email["ticket_summary"] for email in emails],
+            Config.INTERACTION_CONTENT: [email["interaction_content"] for email in emails],
+        })
+        email_df = DataProcessor.renaming_cols(email_df)
+        email_df = DataProcessor.translate_data_frame(email_df)
+        X = self.vectoriser.vectorize_unclassified_data(email_df)
+        ts = email_df["x_ts"].to_numpy()
+        ic = email_df["x_ic"].to_numpy()
+
+        classifications = [{} for _ in emails]
+        for label_name, model in self.models.items():
+            for result, classification in zip(classifications, model.classify_batch(X, ts, ic)):
+                result[label_name] = str(classification)
+        return classifications
+
+    def metrics(self) -> dict:
+        metrics = self.batcher.metrics()
+        metrics["requests"] = self.requests
+        metrics["uptime_seconds"] = time.time() - self.started
+        return metrics
+
+    def _create_handler(self):
+        server = self
+
+        class ClassificationRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    self._send_json(200, server.metrics())
+                elif self.path == "/health":
+                    self._send_json(200, {"status": "ok"})
+                else:
+                    self._send_json(404, {"error": f"Unknown path {self.path}"})
+
+            def do_POST(self) -> None:
+                length = self.headers.get("Content-Length")
+                if length is None or not length.isdigit():
+                    # The body cannot be read without its length, the connection is dropped after answering
+                    self.close_connection = True
+                    if length is None:
+                        self._send_json(411, {"error": "Expected a Content-Length header"})
+                    else:
+                        self._send_json(400, {"error": f"Invalid Content-Length {length}"})
+                    return
+                # The body is read first so the client can finish sending it whatever the response
+                body = self.rfile.read(int(length))
+                if self.path != "/classify":
+                    self._send_json(404, {"error": f"Unknown path {self.path}"})
+                    return
+                # Malformed emails are rejected here, they never reach a batch shared with other requests
+                try:
+                    emails = server.parse_emails(json.loads(body or b"{}"))
+                except ValueError as e:
+                    self._send_json(400, {"error": f"Expected an email or a JSON object with a list of emails: {e}"})
+                    return
+
+                with server._requests_lock:
+                    server.requests += 1
+                try:
+                    futures = [server.batcher.submit(email) for email in emails]
+                except RuntimeError as e:
+                    # The server is shutting down
+                    self._send_json(503, {"error": str(e)})
+                    return
+                try:
+                    self._send_json(200, {"classifications": [future.result() for future in futures]})
+                except Exception as e:
+                    server.error_logger.log(f"Classification failed: {e}")
+                    self._send_json(500, {"error": str(e)})
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def address_string(self) -> str:
+                # Unix socket clients have no address
+                return self.client_address[0] if self.client_address else "unix"
+
+            def log_message(self, format, *args) -> None:
+                # Requests are counted in the metrics instead of logged one by one
+                pass
+
+        return ClassificationRequestHandler
+
+    def start(self) -> None:
+        """Binds the address, after which serve_forever handles requests"""
+        handler = self._create_handler()
+        if self.address.startswith("unix:"):
+            self._http_server = ThreadingUnixHTTPServer(self.address[len("unix:"):], handler)
+        else:
+            host, port = self.address.rsplit(":", 1)
+            self._http_server = ThreadingTCPHTTPServer((host, int(port)), handler)
+            # Port 0 binds a free port, report the one that was chosen
+            self.address = f"{host}:{self._http_server.server_address[1]}"
+        self.info_logger.log(f"Listening on {self.address}")
+
+    def serve_forever(self) -> None:
+        """Handles requests until shutdown is called or the process is interrupted"""
+        if self._http_server is None:
+            self.start()
+        try:
+            self._http_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Stops serve_forever, called from another thread"""
+        if self._http_server is not None:
+            self._http_server.shutdown()
+
+    def close(self) -> None:
+        if self._http_server is None:
+            return
+        self._http_server.server_close()
+        if self.address.startswith("unix:") and os.path.exists(self.address[len("unix:"):]):
+            os.unlink(self.address[len("unix:"):])
+        self._http_server = None
+        self.batcher.stop()
+        TranslationEngine().release()
+        self.info_logger.log(f"Stopped after {self.requests} requests")
@@ -0,0 +1,124 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+# Groups items submitted by concurrent callers into batches. A batch is processed as soon as it is full or when its
+# first item has waited max_delay seconds, and every caller gets the result for its own item back.
+class MicroBatcher:
+    # Number of recent latencies kept for the percentiles in metrics
+    LATENCY_WINDOW = 1000
+
+    def __init__(self, process_batch, max_batch_size: int, max_delay: float) -> None:
+        """
+        :param process_batch: called with a list of items, returns a list with one result per item
+        """
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._metrics_lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._batch_sizes = deque(maxlen=self.LATENCY_WINDOW)
+        self._items = 0
+        self._batches = 0
+        self._errors = 0
+        self._max_queue_depth = 0
+        self._running = True
+        # Held while an item is queued and while stopping, so no item is queued behind the stop sentinel
+        self._state_lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        """Queues an item, returns a Future of its result"""
+        future = Future()
+        with self._state_lock:
+            if not self._running:
+                raise RuntimeError("The batcher is stopped")
+            self._queue.put((item, future, time.perf_counter()))
+        with self._metrics_lock:
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return future
+
+    def _next_batch(self) -> list:
+        """Blocks for the first item, then takes more until the batch is full or the first item is max_delay old"""
+        batch = [self._queue.get()]
+        if batch[0] is None:
+            return []
+        deadline = batch[0][2] + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                # Stop once this batch is done, stop already refuses new items
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self) -> None:
+        while self._running or not self._queue.empty():
+            batch = self._next_batch()
+            if not batch:
+                break
+            try:
+                results = self.process_batch([item for item, _, _ in batch])
+                finished = time.perf_counter()
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception:
+                # One bad item must not fail the others, they are processed again one at a time
+                self._process_one_by_one(batch)
+                finished = time.perf_counter()
+            with self._metrics_lock:
+                self._latencies.extend(finished - submitted for _, _, submitted in batch)
+                self._batch_sizes.append(len(batch))
+                self._items += len(batch)
+                self._batches += 1
+
+    def _process_one_by_one(self, batch: list) -> None:
+        """Processes each item of a failed batch on its own, only the items that fail again get the exception"""
+        for item, future, _ in batch:
+            try:
+                future.set_result(self.process_batch([item])[0])
+            except Exception as e:
+                with self._metrics_lock:
+                    self._errors += 1
+                future.set_exception(e)
+
+    def metrics(self) -> dict:
+        """Returns counts, queue depth, batch sizes and latency percentiles in milliseconds"""
+        with self._metrics_lock:
+            latencies = np.array(self._latencies) * 1000
+            batch_sizes = np.array(self._batch_sizes)
+            metrics = {
+                "items": self._items,
+                "batches": self._batches,
+                "errors": self._errors,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "mean_batch_size": float(batch_sizes.mean()) if len(batch_sizes) else 0.0,
+                "max_batch_size": int(batch_sizes.max()) if len(batch_sizes) else 0,
+            }
+        for percentile in (50, 95, 99):
+            metrics[f"latency_p{percentile}_ms"] = float(np.percentile(latencies, percentile)) if len(latencies) else 0.0
+        return metrics
+
+    def stop(self) -> None:
+        """Processes what is already queued, then stops the worker"""
+        with self._state_lock:
+            if not self._running:
+                return
+            self._running = False
+            # Every item submitted before this point is ahead of the sentinel and is processed
+            self._queue.put(None)
+        self._worker.join()
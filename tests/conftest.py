@@ -0,0 +1,10 @@
+import pytest
+
+from utilities.logger.log_handler import LogHandler
+
+
+@pytest.fixture(autouse=True, scope="session")
+def flush_log_lines():
+    """Writes the waiting log lines while pytest still captures the output, at exit its stream is closed"""
+    yield
+    LogHandler().flush()
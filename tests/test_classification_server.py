@@ -0,0 +1,132 @@
+import threading
+
+import pytest
+
+from preprocessing.processor import DataProcessor
+from server.classification_client import ClassificationClient
+from server.classification_server import ClassificationServer
+from server.micro_batcher import MicroBatcher
+
+EMAIL = {"ticket_summary": "refund", "interaction_content": "please refund my order"}
+
+
+def test_single_email_and_list_of_emails_are_accepted():
+    assert ClassificationServer.parse_emails(EMAIL) == [EMAIL]
+    assert ClassificationServer.parse_emails({"emails": [EMAIL, EMAIL]}) == [EMAIL, EMAIL]
+
+
+@pytest.mark.parametrize("body", [
+    [EMAIL],
+    "refund",
+    {"emails": EMAIL},
+    {"emails": [EMAIL, "refund"]},
+    {"emails": [EMAIL, {"ticket_summary": "refund"}]},
+    {"ticket_summary": "refund", "interaction_content": None},
+    {"ticket_summary": 1, "interaction_content": "please refund my order"},
+])
+def test_malformed_bodies_are_rejected(body):
+    with pytest.raises(ValueError):
+        ClassificationServer.parse_emails(body)
+
+
+def test_failing_item_does_not_fail_the_rest_of_its_batch():
+    def process_batch(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        return [item.upper() for item in items]
+
+    # A long delay so every item below lands in the same batch
+    batcher = MicroBatcher(process_batch, max_batch_size=3, max_delay=5)
+    try:
+        futures = [batcher.submit(item) for item in ("a", "bad", "b")]
+        assert futures[0].result(timeout=10) == "A"
+        assert futures[2].result(timeout=10) == "B"
+        with pytest.raises(ValueError):
+            futures[1].result(timeout=10)
+        metrics = batcher.metrics()
+        assert metrics["batches"] == 1
+        assert metrics["errors"] == 1
+    finally:
+        batcher.stop()
+
+
+class StubVectoriser:
+    def vectorize_unclassified_data(self, data_frame):
+        return data_frame["x_ic"].to_list()
+
+
+class StubContext:
+    """Classifies an email by whether its content asks for a refund"""
+
+    def __init__(self, label_name: str):
+        self.label_name = label_name
+
+    def classify_batch(self, X, ts, ic) -> list:
+        return [f"{self.label_name} refund" if "refund" in text else f"{self.label_name} other" for text in X]
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def server(request, tmp_path, monkeypatch):
+    # The texts are classified as they are, without loading the translation models
+    monkeypatch.setattr(DataProcessor, "translate_data_frame", staticmethod(lambda data_frame: data_frame))
+    address = "127.0.0.1:0" if request.param == "tcp" else f"unix:{tmp_path / 'server.sock'}"
+    server = ClassificationServer(StubVectoriser(), {"y1": StubContext("y1"), "y2": StubContext("y2")}, address,
+                                  max_batch_size=8, max_delay=0.01)
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(timeout=10)
+
+
+def post(server: ClassificationServer, path: str, body: bytes, headers: dict) -> int:
+    """Sends a raw request to the server and returns the response status"""
+    connection = ClassificationClient(server.address)._connect()
+    try:
+        connection.putrequest("POST", path)
+        for name, value in headers.items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def test_client_classifies_through_the_server(server):
+    client = ClassificationClient(server.address)
+    assert client.health() == {"status": "ok"}
+    other = {"ticket_summary": "app", "interaction_content": "the app does not open"}
+    assert client.classify([EMAIL, other]) == [{"y1": "y1 refund", "y2": "y2 refund"},
+                                               {"y1": "y1 other", "y2": "y2 other"}]
+    # A single email is sent without the list around it
+    assert client._request("POST", "/classify", EMAIL)["classifications"] == [{"y1": "y1 refund",
+                                                                              "y2": "y2 refund"}]
+    metrics = client.metrics()
+    assert metrics["requests"] == 2
+    assert metrics["items"] == 3
+
+
+def test_server_rejects_malformed_requests(server):
+    client = ClassificationClient(server.address)
+    with pytest.raises(RuntimeError, match="400"):
+        client.classify([{"ticket_summary": "refund"}])
+    with pytest.raises(RuntimeError, match="404"):
+        client._request("GET", "/unknown")
+    with pytest.raises(RuntimeError, match="404"):
+        client._request("POST", "/unknown", EMAIL)
+    assert post(server, "/classify", b"{", {"Content-Length": "1"}) == 400
+    assert post(server, "/classify", b"", {"Content-Length": "many"}) == 400
+    assert post(server, "/classify", b"", {}) == 411
+    assert client.metrics()["requests"] == 0
+
+
+def test_stopped_batcher_refuses_new_items():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=2, max_delay=0.01)
+    future = batcher.submit("a")
+    batcher.stop()
+    assert future.result(timeout=10) == "a"
+    with pytest.raises(RuntimeError):
+        batcher.submit("b")
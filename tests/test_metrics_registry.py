@@ -0,0 +1,21 @@
+import json
+
+from utilities.metrics.metrics_registry import MetricsRegistry
+
+
+def test_history_keeps_only_the_last_runs(tmp_path, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(registry, "history_max_runs", 3)
+    for run in range(5):
+        registry.append_history({"run": run}, str(tmp_path))
+    with open(tmp_path / "history.jsonl") as history_file:
+        assert [json.loads(line)["run"] for line in history_file] == [2, 3, 4]
+
+
+def test_history_keeps_every_run_without_a_limit(tmp_path, monkeypatch):
+    registry = MetricsRegistry()
+    monkeypatch.setattr(registry, "history_max_runs", None)
+    for run in range(5):
+        registry.append_history({"run": run}, str(tmp_path))
+    with open(tmp_path / "history.jsonl") as history_file:
+        assert len(history_file.readlines()) == 5
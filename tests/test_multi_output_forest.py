@@ -0,0 +1,14 @@
+import numpy as np
+from scipy import sparse
+
+from model.models.multi_output_forest import MultiOutputForestModel
+
+
+def test_rows_missing_a_label_are_left_out_of_training():
+    X = sparse.csr_matrix(np.eye(6))
+    y = np.array([["a", "x"], ["a", "x"], ["b", "y"], ["b", "y"], ["a", "nan"], ["b", None]], dtype=object)
+    model = MultiOutputForestModel()
+    model.train(X, y)
+    assert model.model.n_features_in_ == 6
+    assert [list(classes) for classes in model.model.classes_] == [["a", "b"], ["x", "y"]]
+    assert "nan" not in model.predict(X).astype(str)
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from benchmarks.noise_removal_benchmark import fuzz_texts, legacy_remove_noise
+from preprocessing.noise_remover import NoiseRemover
+from utilities.configuration.config import Config
+from utilities.file_manager import FileManager
+
+
+@pytest.fixture(scope="module")
+def training_texts():
+    df = FileManager().load_all_csvs_in_directory(Config.TRAINING_DATA_DIR)
+    return (df[Config.TICKET_SUMMARY].fillna("").astype(str).tolist(),
+            df[Config.INTERACTION_CONTENT].fillna("").astype(str).tolist())
+
+
+def assert_same_as_legacy(x_ts: list, x_ic: list) -> None:
+    expected = legacy_remove_noise(pd.DataFrame({"x_ts": x_ts, "x_ic": x_ic}))
+    assert NoiseRemover.clean_ticket_summaries(x_ts) == expected["x_ts"].to_list()
+    assert NoiseRemover.clean_interaction_contents(x_ic) == expected["x_ic"].to_list()
+
+
+def test_training_data_is_cleaned_like_legacy(training_texts):
+    assert_same_as_legacy(*training_texts)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_fuzzed_texts_are_cleaned_like_legacy(training_texts, seed):
+    x_ts, x_ic = training_texts
+    assert_same_as_legacy(fuzz_texts(x_ts, 2000, seed=2 * seed + 1), fuzz_texts(x_ic, 2000, seed=2 * seed + 2))
+
+
+@pytest.mark.parametrize("text", ["İletişim bilgileri", "re\xa0: hello", "fw\x0b: x", "٣٣.٣٣ a ٣٣", "ΣΑΣ ǅ"])
+def test_unicode_edge_cases_are_cleaned_like_legacy(text):
+    assert_same_as_legacy([text], [text])
+
+
+def test_missing_texts_stay_missing():
+    assert pd.isna(NoiseRemover.clean_interaction_content(None))
+    assert pd.isna(NoiseRemover.clean_ticket_summary(float("nan")))
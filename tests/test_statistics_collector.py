@@ -0,0 +1,39 @@
+import numpy as np
+
+from observers.statistics_collector import StatisticsCollector
+from utilities.logger.abstract_logger import AbstractLogger
+
+
+class RecordingLogger(AbstractLogger):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def log(self, message: str = ""):
+        self.messages.append(message)
+
+
+def test_missing_and_nan_classifications_are_counted_as_unclassified():
+    collector = StatisticsCollector({"y1": ["a", "b", "nan"]})
+    collector.update_batch([], [], np.array(["a", "nan", "b", "a"], dtype=object), "y1")
+    collector.update_batch([], [], np.array([None, "a", np.nan], dtype=object), "y1")
+    collector.update([], [], None, "y1")
+    collector.update([], [], "nan")
+    assert collector.counts("y1") == {"a": 3, "b": 1}
+    assert collector._unclassified == 5
+
+
+def test_new_classes_are_added_to_their_label():
+    collector = StatisticsCollector({"y1": ["a"]})
+    collector.update_batch([], [], ["b", "a", "b"], "y1")
+    assert collector.counts("y1") == {"a": 1, "b": 2}
+
+
+def test_report_keeps_the_original_headings_and_class_order():
+    collector = StatisticsCollector()
+    collector.info_logger = RecordingLogger()
+    collector.update_batch([], [], ["Suggestion", "Others"], "y2")
+    collector.display_stats()
+    report = "\n".join(collector.info_logger.messages)
+    assert "Type 2:" in report and "y2" not in report
+    assert report.index("- Others") < report.index("- Problem/Fault") < report.index("- Suggestion")
@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+from preprocessing.processor import TranslatorAdaptor
+from preprocessing.translation_cache import TranslationCache
+
+TEXTS = ["Hallo Welt", "hello world", "Hallo  Welt", "", "hello world", "Hallo Welt"]
+
+
+class StubEngine:
+    """Detects german by its greeting and translates it, counting every text it is given"""
+
+    def __init__(self):
+        self.detected = []
+        self.translated = []
+
+    def language_of(self, text: str) -> str:
+        self.detected.append(text)
+        return "de" if text.startswith("Hallo") else "en"
+
+    def detect_languages(self, texts: list) -> list:
+        return [None if text == "" else self.language_of(text) for text in texts]
+
+    def translate_batched(self, texts: list, batch_size: int = None, languages: list = None) -> list:
+        self.translated.extend(text for text, language in zip(texts, languages) if language == "de")
+        return [text.replace("Hallo", "Hello") if language == "de" else text
+                for text, language in zip(texts, languages)]
+
+    def language_identifier(self, text: str):
+        return SimpleNamespace(lang=self.language_of(text))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranslationCache(str(tmp_path / "translations.sqlite"))
+    yield cache
+    cache.close()
+
+
+def translate(texts: list, engine: StubEngine, cache: TranslationCache) -> list:
+    adaptor = TranslatorAdaptor(texts, batch_size=8, cache=cache)
+    adaptor.engine = engine
+    return adaptor.trans_to_en()
+
+
+def test_repeated_texts_are_translated_once(cache):
+    engine = StubEngine()
+    assert translate(TEXTS, engine, cache) == ["Hello Welt", "hello world", "Hello Welt", "", "hello world",
+                                               "Hello Welt"]
+    assert engine.detected == ["Hallo Welt", "hello world"]
+    assert engine.translated == ["Hallo Welt"]
+
+
+def test_english_texts_are_cached_by_the_legacy_translator(cache, monkeypatch):
+    # The legacy translator is only given the texts that are not english
+    legacy_texts = []
+    def legacy_translate(texts, engine=None):
+        legacy_texts.extend(texts)
+        return [text.replace("Hallo", "Hello") for text in texts]
+
+    monkeypatch.setattr("preprocessing.oldtranslator.OldTranslator.trans_to_en", staticmethod(legacy_translate))
+    engine = StubEngine()
+    adaptor = TranslatorAdaptor(TEXTS, batch_size=1, cache=cache)
+    adaptor.engine = engine
+    assert adaptor.trans_to_en() == ["Hello Welt", "hello world", "Hello Welt", "", "hello world", "Hello Welt"]
+    assert legacy_texts == ["Hallo Welt"]
+
+    engine = StubEngine()
+    assert translate(TEXTS, engine, cache) == ["Hello Welt", "hello world", "Hello Welt", "", "hello world",
+                                               "Hello Welt"]
+    assert engine.detected == []
@@ -2,6 +2,8 @@
 # For example, this will contain the name of dataframe columns we will be working with for each file
 class Config:
     TRAINED_MODELS_DIR = 'trained_models'
+    # Vectoriser and per-label models saved by -r and loaded by -u
+    MODEL_BUNDLE_PATH = 'trained_models/model_bundle.joblib'
 
     # Input Columns
     TICKET_SUMMARY = 'Ticket Summary'
@@ -12,5 +14,97 @@ class Config:
     CLASS_COL = 'Type 2'
     GROUPED = 'Type 1'
 
-    # Where preprocessed data is saved
-    PREPROCESSED_DATA_PATH = 'data/preprocessed_data/preprocessed.csv'
\ No newline at end of file
+    # Directory of the training data csv exports
+    TRAINING_DATA_DIR = 'data/training_data'
+
+    # Where preprocessed data is saved, as Parquet so it is read without parsing text and only the needed columns are read
+    PREPROCESSED_DATA_PATH = 'data/preprocessed_data/preprocessed.parquet'
+    # Preprocessed data saved as csv by earlier versions, converted to PREPROCESSED_DATA_PATH on first use
+    PREPROCESSED_CSV_PATH = 'data/preprocessed_data/preprocessed.csv'
+    # Columns of the preprocessed data used for training
+    PREPROCESSED_COLUMNS = ['x_ic', 'x_ts', 'y1', 'y2', 'y3', 'y4']
+
+    # Number of threads reading the training data files
+    INGESTION_WORKERS = 4
+
+    # Online models, trained with -o on a hashing feature space that never changes and updated with -n
+    ONLINE_MODEL_BUNDLE_PATH = 'trained_models/online_model_bundle.joblib'
+    ONLINE_DEFAULT_MODEL = 'sgd'
+    # Number of hashed features per text column
+    ONLINE_HASH_FEATURES = 2 ** 16
+
+    # Translation model used for non-english emails
+    TRANSLATION_MODEL = 'facebook/m2m100_418M'
+    # Number of texts translated per generate call, 1 translates one text at a time
+    TRANSLATION_BATCH_SIZE = 16
+
+    # Persistent translation cache, entries beyond the maximum are evicted least recently used first
+    TRANSLATION_CACHE_ENABLED = True
+    TRANSLATION_CACHE_PATH = 'data/translation_cache/translations.sqlite'
+    TRANSLATION_CACHE_MAX_ENTRIES = 500000
+
+    # Vectorised training data, memory-mapped on later runs while the preprocessed data and vectoriser are unchanged
+    FEATURE_CACHE_ENABLED = True
+    FEATURE_CACHE_DIR = 'data/feature_cache'
+    FEATURE_CACHE_MAX_ENTRIES = 3
+
+    # Number of emails read and classified at a time when streaming a csv with -s
+    STREAM_CHUNK_SIZE = 1000
+
+    # Messages of loggers below LOG_LEVEL (DEBUG, INFO, WARNING or ERROR) are dropped before they are formatted
+    LOG_LEVEL = 'INFO'
+    # Colour codes are only written when the output is a terminal, True or False forces them on or off
+    LOG_COLOUR = None
+    # Log lines are written to a terminal one at a time, otherwise LOG_BUFFER_LINES lines are written together
+    LOG_BUFFER_LINES = 256
+    # Write log lines from a background thread at least every LOG_FLUSH_INTERVAL seconds, logging never waits for output
+    LOG_NON_BLOCKING = False
+    LOG_FLUSH_INTERVAL = 0.1
+
+    # Calls of methods decorated with TimingDecorator are counted and one in METRICS_SAMPLE_EVERY is timed. With
+    # METRICS_LOG_CALLS every timed call is also logged
+    METRICS_SAMPLE_EVERY = 1
+    METRICS_LOG_CALLS = False
+    # Where the metrics are exported on exit and, unless None, every METRICS_EXPORT_INTERVAL seconds. None turns
+    # exporting off
+    METRICS_DIR = 'data/metrics'
+    METRICS_EXPORT_INTERVAL = None
+    # Runs kept in METRICS_DIR/history.jsonl, the oldest are dropped when a run is added. None keeps every run
+    METRICS_HISTORY_MAX_RUNS = 100
+
+    # Observers are notified from a background worker: at most OBSERVER_QUEUE_SIZE notifications wait for it before
+    # classifying blocks, and it hands observers up to OBSERVER_BATCH_SIZE classifications at a time
+    OBSERVER_QUEUE_SIZE = 64
+    OBSERVER_BATCH_SIZE = 4096
+
+    # Classification server started with -d: where it listens ("host:port" or "unix:/path/to/socket"), and how
+    # many emails are classified together at most and how long the first of them waits for others, in seconds
+    SERVER_ADDRESS = '127.0.0.1:8765'
+    SERVER_MAX_BATCH_SIZE = 64
+    SERVER_MAX_DELAY = 0.01
+
+    # k nearest neighbours by cosine similarity: KNN_NEIGHBOURS neighbours vote, found by an "exact" or "lsh" index.
+    # The exact index holds at most KNN_BLOCK_SIZE similarities at once. The lsh index hashes rows into KNN_LSH_TABLES
+    # tables of KNN_LSH_BITS bit codes and compares a query with at most KNN_LSH_MAX_BUCKET_SIZE rows per table: more
+    # tables find more of the exact neighbours, more bits and smaller buckets answer faster
+    KNN_NEIGHBOURS = 5
+    KNN_INDEX = 'exact'
+    KNN_BLOCK_SIZE = 2 ** 22
+    KNN_LSH_TABLES = 8
+    KNN_LSH_BITS = 12
+    KNN_LSH_MAX_BUCKET_SIZE = 256
+
+    # Number of processes used to remove noise from the training data, 1 runs in the current process
+    NOISE_REMOVAL_WORKERS = 1
+
+    # Number of processes training candidate models with -r, None uses every core and 1 trains in the current process
+    TRAINING_WORKERS = None
+
+    # Model selection with -r by successive halving: each rung keeps the best 1 / SELECTION_ETA of the candidates
+    # and gives them SELECTION_ETA times more rows, scored with SELECTION_FOLDS held-out folds
+    SELECTION_ETA = 3
+    SELECTION_MIN_ROWS = 50
+    SELECTION_FOLDS = 3
+
+    # Seed for the models that use randomness, None gives a different model on every run
+    RANDOM_SEED = None
\ No newline at end of file
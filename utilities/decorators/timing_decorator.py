@@ -1,23 +1,38 @@
+import itertools
 import time
 from functools import wraps
 
+from utilities.configuration.config import Config
 from utilities.logger.concrete_logger.info_logger import InfoLogger
 from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.metrics.metrics_registry import MetricsRegistry
 
 
+# Counts the calls of a method and records how long they take in the MetricsRegistry, which summarises and exports
+# them when the process exits. Timing only one in sample_every calls keeps the cost down on hot paths.
 class TimingDecorator:
-    def __init__(self, info_logger=None) -> None:
+    def __init__(self, info_logger=None, sample_every: int = Config.METRICS_SAMPLE_EVERY) -> None:
         self.info_logger = info_logger or InfoLogger()
         self.info_logger = PrefixLogger(self.info_logger, "TimingDecorator")
+        self.sample_every = max(sample_every, 1)
+        self.registry = MetricsRegistry()
 
     def __call__(self, method):
+        name = method.__qualname__
+        calls = itertools.count()
+        histogram = self.registry.histogram(name)
+
         @wraps(method)
         def timing_decorator(*args, **kwargs):
-            start_time = time.time()
-            result = method(*args, **kwargs)
-            end_time = time.time()
-            execution_time = end_time - start_time
-            # Log the execution time
-            self.info_logger.log(f"Execution time for {method.__name__}: {execution_time:.4f} seconds")
-            return result
-        return timing_decorator
\ No newline at end of file
+            self.registry.increment(name)
+            if next(calls) % self.sample_every:
+                return method(*args, **kwargs)
+            start_time = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                execution_time = time.perf_counter_ns() - start_time
+                histogram.record(execution_time)
+                if Config.METRICS_LOG_CALLS:
+                    self.info_logger.log(f"Execution time for {method.__name__}: {execution_time / 1e9:.4f} seconds")
+        return timing_decorator
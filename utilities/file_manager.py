@@ -1,7 +1,13 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from utilities.configuration.config import Config
+
 class FileManager:
+    # Formats load_table and save_table support, by file extension
+    TABLE_FORMATS = (".csv", ".parquet", ".feather")
 
     def load_csv(self, file_path: str) -> pd.DataFrame:
         """
@@ -14,6 +20,18 @@ class FileManager:
             raise FileNotFoundError(f"File does not exist at location: {file_path}!")
         return df
 
+    def load_csv_in_chunks(self, file_path: str, chunk_size: int, columns: list = None):
+        """
+        Lazily loads the csv in the specified location, chunk_size rows at a time
+        Only the given columns are read if specified
+        Returns a generator of DataFrames
+        """
+        if not self.exists_file(file_path):
+            raise FileNotFoundError(f"File does not exist at location: {file_path}!")
+        with pd.read_csv(file_path, chunksize=chunk_size, usecols=columns) as reader:
+            for chunk in reader:
+                yield chunk.reset_index(drop=True)
+
     def save_csv(self, df, file_path: str) -> None:
         """
         Saves a DataFrame in the specified location as a csv
@@ -24,19 +42,61 @@ class FileManager:
             os.makedirs(directory, exist_ok=True)
         df.to_csv(file_path, index=False)
 
-    def load_all_csvs_in_directory(self, directory_path: str) -> pd.DataFrame:
+    def load_table(self, file_path: str, columns: list = None) -> pd.DataFrame:
+        """
+        Loads a csv, Parquet or Feather file, chosen by its extension
+        Only the given columns are read if specified, columnar formats skip the other columns entirely
+        Returns a DataFrame
+        """
+        if not self.exists_file(file_path):
+            raise FileNotFoundError(f"File does not exist at location: {file_path}!")
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".parquet":
+            return pd.read_parquet(file_path, columns=columns)
+        if extension == ".feather":
+            return pd.read_feather(file_path, columns=columns)
+        return pd.read_csv(file_path, usecols=columns)
+
+    def save_table(self, df, file_path: str) -> None:
+        """
+        Saves a DataFrame as a csv, Parquet or Feather file, chosen by its extension
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".parquet":
+            df.to_parquet(file_path, index=False)
+        elif extension == ".feather":
+            df.reset_index(drop=True).to_feather(file_path)
+        else:
+            df.to_csv(file_path, index=False)
+
+    def list_tables_in_directory(self, directory_path: str) -> list:
+        """
+        Returns the paths of the csv, Parquet and Feather files in the specified directory, in file name order
+        """
+        return [os.path.join(directory_path, file_name) for file_name in sorted(os.listdir(directory_path))
+                if os.path.splitext(file_name)[1].lower() in self.TABLE_FORMATS]
+
+    def load_all_csvs_in_directory(self, directory_path: str, workers: int = Config.INGESTION_WORKERS,
+                                   source_column: str = None) -> pd.DataFrame:
         """
-        Combines all csvs in the specified directory
+        Combines all csvs in the specified directory, read in parallel and concatenated once in file name order
+        If source_column is given, a column of that name holds the name of the file each row came from
         Returns a DataFrame
         """
-        file_paths = os.listdir(directory_path)
+        file_paths = self.list_tables_in_directory(directory_path)
 
-        combined_df = pd.DataFrame()
-        for file_path in file_paths:
-            csv = self.load_csv(os.path.join(directory_path, file_path))
-            combined_df = pd.concat([combined_df, csv], axis=0, ignore_index=True)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(file_paths)))) as executor:
+            tables = list(executor.map(self.load_table, file_paths))
+        if source_column is not None:
+            for file_path, table in zip(file_paths, tables):
+                table[source_column] = os.path.basename(file_path)
 
-        return combined_df
+        if not tables:
+            return pd.DataFrame()
+        return pd.concat(tables, axis=0, ignore_index=True)
 
     def exists_file(self, file_path: str) -> bool:
         """
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
 
+from utilities.logger.log_handler import LogHandler
+from utilities.logger.log_level import LogLevel
+
 class AbstractLogger(ABC):
     __slots__ = ["base_message"]
+    level = LogLevel.INFO
 
     def __init__(self):
         self.base_message = "[BASE LOG]"
@@ -10,3 +14,11 @@ class AbstractLogger(ABC):
     @abstractmethod
     def log(self, message: str):
         pass
+
+    def is_enabled(self) -> bool:
+        """Checks if messages of this logger are written, so callers can skip building messages that would be dropped"""
+        return self.level >= (LogHandler.instance or LogHandler()).level
+
+    def decorations(self) -> tuple:
+        """Returns the text put before and after every message and the logger that writes it"""
+        return "", "", self
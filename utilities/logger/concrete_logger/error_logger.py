@@ -5,9 +5,12 @@ from utilities.logger.decorators.colour_decorator import ColourDecorator
 from colorama import Fore, Back
 
 from utilities.logger.decorators.italics_decorator import ItalicsDecorator
+from utilities.logger.log_handler import LogHandler
+from utilities.logger.log_level import LogLevel
 
 
 class BaseErrorLogger(AbstractLogger):
+    level = LogLevel.ERROR
 
     def __init__(self):
         super().__init__()
@@ -15,16 +18,20 @@ class BaseErrorLogger(AbstractLogger):
 
 
     def log(self, message):
-        print(self.base_message, message)
+        if self.is_enabled():
+            LogHandler().write(f"{self.base_message} {message}", self.level)
 
 class ErrorLogger(BaseErrorLogger):
     def __init__(self):
         super().__init__()
+        # The style is composed once, not for every message
+        decorated_logger = ColourDecorator(BaseErrorLogger(), Fore.RED)
+        decorated_logger = BackgroundDecorator(decorated_logger, Back.BLACK)
+        decorated_logger = BoldDecorator(decorated_logger)
+        self.styled_logger = ItalicsDecorator(decorated_logger)
 
+    def decorations(self) -> tuple:
+        return self.styled_logger.decorations()
 
     def log(self, message):
-        decorated_logger = ColourDecorator(super(), Fore.RED)
-        decorated_logger = BackgroundDecorator(decorated_logger, Back.BLACK)
-        decorated_logger = BoldDecorator(decorated_logger)
-        decorated_logger = ItalicsDecorator(decorated_logger)
-        decorated_logger.log(message)
\ No newline at end of file
+        self.styled_logger.log(message)
@@ -2,21 +2,29 @@ from colorama import Fore
 
 from utilities.logger.abstract_logger import AbstractLogger
 from utilities.logger.decorators.colour_decorator import ColourDecorator
+from utilities.logger.log_handler import LogHandler
+from utilities.logger.log_level import LogLevel
 
 
 class BaseInfoLogger(AbstractLogger):
+    level = LogLevel.INFO
+
     def __init__(self):
         super().__init__()
         self.base_message = "[INFO]"
 
     def log(self, message):
-        print(self.base_message, message)
+        if self.is_enabled():
+            LogHandler().write(f"{self.base_message} {message}", self.level)
 
 class InfoLogger(BaseInfoLogger):
     def __init__(self):
         super().__init__()
+        # The style is composed once, not for every message
+        self.styled_logger = ColourDecorator(BaseInfoLogger(), Fore.LIGHTCYAN_EX)
 
+    def decorations(self) -> tuple:
+        return self.styled_logger.decorations()
 
     def log(self, message):
-        coloured_logger = ColourDecorator(super(), Fore.LIGHTCYAN_EX)
-        coloured_logger.log(message)
\ No newline at end of file
+        self.styled_logger.log(message)
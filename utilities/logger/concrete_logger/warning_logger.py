@@ -3,21 +3,30 @@ from colorama import Fore
 from utilities.logger.abstract_logger import AbstractLogger
 from utilities.logger.decorators.colour_decorator import ColourDecorator
 from utilities.logger.decorators.italics_decorator import ItalicsDecorator
+from utilities.logger.log_handler import LogHandler
+from utilities.logger.log_level import LogLevel
 
 
 class BaseWarningLogger(AbstractLogger):
+    level = LogLevel.WARNING
+
     def __init__(self):
         super().__init__()
         self.base_message = "[WARNING]"
 
     def log(self, message):
-        print(self.base_message, message)
+        if self.is_enabled():
+            LogHandler().write(f"{self.base_message} {message}", self.level)
 
 class WarningLogger(BaseWarningLogger):
     def __init__(self):
         super().__init__()
+        # The style is composed once, not for every message
+        styled_logger = ColourDecorator(BaseWarningLogger(), Fore.YELLOW)
+        self.styled_logger = ItalicsDecorator(styled_logger)
+
+    def decorations(self) -> tuple:
+        return self.styled_logger.decorations()
 
     def log(self, message):
-        decorated_logger = ColourDecorator(super(), Fore.YELLOW)
-        decorated_logger = ItalicsDecorator(decorated_logger)
-        decorated_logger.log(message)
\ No newline at end of file
+        self.styled_logger.log(message)
@@ -2,14 +2,14 @@ from colorama import Style
 
 from utilities.logger.abstract_logger import AbstractLogger
 from utilities.logger.decorators.logger_decorator_interface import ILoggerDecorator
+from utilities.logger.log_handler import LogHandler
 
 
 class BackgroundDecorator(ILoggerDecorator):
     def __init__(self, logger: AbstractLogger, colour_code: str):
-        super().__init__(logger)
         self.background_colour = colour_code
         self.reset_code = Style.RESET_ALL
+        super().__init__(logger)
 
-    def log(self, message):
-        colored_message = f"{self.background_colour}{message}{self.reset_code}"
-        self.logger.log(colored_message)
\ No newline at end of file
+    def decoration(self) -> tuple:
+        return (self.background_colour, self.reset_code) if LogHandler().colour else ("", "")
@@ -1,4 +1,5 @@
 from utilities.logger.decorators.logger_decorator_interface import ILoggerDecorator
+from utilities.logger.log_handler import LogHandler
 
 
 class BoldDecorator(ILoggerDecorator):
@@ -8,5 +9,5 @@ class BoldDecorator(ILoggerDecorator):
     def __init__(self, logger):
         super().__init__(logger)
 
-    def log(self, message=""):
-        self.logger.log(f"{self.BOLD}{message}{self.END_BOLD}")
\ No newline at end of file
+    def decoration(self) -> tuple:
+        return (self.BOLD, self.END_BOLD) if LogHandler().colour else ("", "")
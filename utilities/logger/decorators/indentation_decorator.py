@@ -4,12 +4,11 @@ from utilities.logger.decorators.logger_decorator_interface import ILoggerDecora
 
 class IndentationDecorator(ILoggerDecorator):
     def __init__(self, logger: AbstractLogger):
-        super().__init__(logger)
         if isinstance(logger, IndentationDecorator):
             self.indent_level = logger.indent_level + 1
         else:
             self.indent_level = 1
+        super().__init__(logger)
 
-    def log(self,message = ""):
-        indentations = "    " * self.indent_level
-        self.logger.log(f"{indentations}{message}")
+    def decoration(self) -> tuple:
+        return "    " * self.indent_level, ""
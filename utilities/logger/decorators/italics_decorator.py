@@ -1,4 +1,5 @@
 from utilities.logger.decorators.logger_decorator_interface import ILoggerDecorator
+from utilities.logger.log_handler import LogHandler
 
 
 class ItalicsDecorator(ILoggerDecorator):
@@ -8,5 +9,5 @@ class ItalicsDecorator(ILoggerDecorator):
     def __init__(self, logger):
         super().__init__(logger)
 
-    def log(self, message=""):
-        self.logger.log(f"{self.ITALICS}{message}{self.END_ITALICS}")
\ No newline at end of file
+    def decoration(self) -> tuple:
+        return (self.ITALICS, self.END_ITALICS) if LogHandler().colour else ("", "")
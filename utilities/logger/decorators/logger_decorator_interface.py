@@ -7,7 +7,24 @@ class ILoggerDecorator(AbstractLogger, ABC):
     def __init__(self, logger: AbstractLogger):
         super().__init__()
         self.logger = logger
+        # The decorations of the whole chain are composed once, logging a message only puts it in between
+        before, after, self.target = logger.decorations()
+        own_before, own_after = self.decoration()
+        self.before = before + own_before
+        self.after = own_after + after
+        self.level = self.target.level
 
     @abstractmethod
-    def log(self, message):
+    def decoration(self) -> tuple:
+        """Returns the text this decorator puts before and after a message"""
         pass
+
+    def decorations(self) -> tuple:
+        return self.before, self.after, self.target
+
+    def is_enabled(self) -> bool:
+        return self.target.is_enabled()
+
+    def log(self, message=""):
+        if self.target.is_enabled():
+            self.target.log(f"{self.before}{message}{self.after}")
@@ -4,9 +4,9 @@ from utilities.logger.decorators.logger_decorator_interface import ILoggerDecora
 
 class PrefixLogger(ILoggerDecorator):
     def __init__(self, logger: AbstractLogger, prefix: str = ""):
-        super().__init__(logger)
         self.prefix = prefix
+        super().__init__(logger)
 
 
-    def log(self, message = ""):
-        self.logger.log(f"[{self.prefix}] {message}")
+    def decoration(self) -> tuple:
+        return f"[{self.prefix}] ", ""
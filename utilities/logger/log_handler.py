@@ -0,0 +1,105 @@
+import atexit
+import os
+import sys
+import threading
+from multiprocessing import util
+
+from utilities.configuration.config import Config
+from utilities.logger.log_level import LogLevel
+
+
+# Singleton instance - every logger in the process writes through one handler
+# Lines are collected and written together, to a terminal one at a time and otherwise once buffer_lines are waiting.
+# Errors are written at once. Whatever is left is written when the process exits.
+class LogHandler:
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:  # If instance is not created, create it
+            cls.instance = super(LogHandler, cls).__new__(cls)
+            cls.instance._initialise()
+        return cls.instance
+
+    def _initialise(self) -> None:
+        self._lines = []
+        # _lock guards the waiting lines, _write_lock keeps batches of lines in order while they are written
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._writer = None
+        self.flush_interval = Config.LOG_FLUSH_INTERVAL
+        self.configure(sys.stdout, LogLevel[Config.LOG_LEVEL], Config.LOG_COLOUR, Config.LOG_BUFFER_LINES,
+                       Config.LOG_NON_BLOCKING)
+        atexit.register(self.flush)
+        # Pool workers exit through multiprocessing, which runs its finalizers but not atexit
+        util.Finalize(None, self.flush, exitpriority=0)
+        # Waiting lines are written before a fork so a forked worker does not write them again
+        os.register_at_fork(before=self.flush)
+        util.register_after_fork(self, LogHandler._after_fork)
+
+    def _after_fork(self) -> None:
+        # A forked worker has no writer thread and lost the finalizers of its parent
+        self._lines = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writer = None
+        util.Finalize(None, self.flush, exitpriority=0)
+
+    def configure(self, stream=None, level: LogLevel = None, colour: bool = None, buffer_lines: int = None,
+                  non_blocking: bool = None) -> None:
+        """
+        Changes where and how lines are written, arguments left as None keep their setting
+        Colour is decided when a logger is created, it only applies to loggers created afterwards
+        """
+        self.flush()
+        if stream is not None:
+            self.stream = stream
+            # The colour follows the stream unless it was forced
+            self.colour = Config.LOG_COLOUR if Config.LOG_COLOUR is not None else self._is_terminal(stream)
+        if level is not None:
+            self.level = level
+        if colour is not None:
+            self.colour = colour
+        if buffer_lines is not None:
+            self.buffer_lines = buffer_lines
+        # A terminal shows every line as it is logged
+        self._flush_at = 1 if self._is_terminal(self.stream) else max(self.buffer_lines, 1)
+        if non_blocking and self._writer is None:
+            self._writer = threading.Thread(target=self._run_writer, name="LogHandler", daemon=True)
+            self._writer.start()
+
+    @staticmethod
+    def _is_terminal(stream) -> bool:
+        try:
+            return stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    def is_enabled(self, level: LogLevel) -> bool:
+        return level >= self.level
+
+    def write(self, line: str, level: LogLevel = LogLevel.INFO) -> None:
+        with self._lock:
+            self._lines.append(line)
+            waiting = len(self._lines)
+        if waiting < self._flush_at and level < LogLevel.ERROR:
+            return
+        if self._writer is not None:
+            self._wake.set()
+        else:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes every waiting line"""
+        with self._write_lock:
+            with self._lock:
+                lines, self._lines = self._lines, []
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+
+    def _run_writer(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
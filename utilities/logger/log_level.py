@@ -0,0 +1,9 @@
+from enum import IntEnum
+
+
+# Loggers write at one of these levels, messages below the level of the LogHandler are dropped
+class LogLevel(IntEnum):
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
@@ -0,0 +1,87 @@
+import math
+import threading
+
+
+# Latency histogram in the style of an HDR histogram: every power of two is split into SUB_BUCKETS linear buckets,
+# so a percentile is within 1 / SUB_BUCKETS of the true value over the whole range. Recording a value is O(1)
+# and the memory used does not grow with the number of values.
+class LatencyHistogram:
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    # Durations up to 2 ** MAX_BITS nanoseconds (about 18 minutes) get their own bucket, longer ones share the last
+    MAX_BITS = 40
+
+    def __init__(self) -> None:
+        self.counts = [0] * ((self.MAX_BITS - self.SUB_BUCKET_BITS + 1) * self.SUB_BUCKETS)
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _index(cls, value_ns: int) -> int:
+        # The top SUB_BUCKET_BITS + 1 bits of the value pick its bucket, smaller values have a bucket each
+        shift = value_ns.bit_length() - cls.SUB_BUCKET_BITS - 1
+        if shift <= 0:
+            return value_ns
+        return shift * cls.SUB_BUCKETS + (value_ns >> shift)
+
+    @classmethod
+    def _highest_value(cls, index: int) -> int:
+        """Returns the largest value that falls in a bucket"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        return ((index - shift * cls.SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, value_ns: int) -> None:
+        index = self._index(value_ns)
+        with self._lock:
+            self.counts[index if index < len(self.counts) else -1] += 1
+            if value_ns < self.min_ns or self.count == 0:
+                self.min_ns = value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+            self.count += 1
+            self.total_ns += value_ns
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Adds the values of another histogram, e.g. one recorded in another process"""
+        if other.count == 0:
+            return self
+        with self._lock:
+            self._merge(other)
+        return self
+
+    def _merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.min_ns = other.min_ns if self.count == 0 else min(self.min_ns, other.min_ns)
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+    def percentile(self, percentile: float) -> int:
+        """Returns the value in nanoseconds that percentile percent of the recorded values are at or below"""
+        if self.count == 0:
+            return 0
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._highest_value(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> dict:
+        """Returns the count, mean, percentiles and extremes, durations in seconds"""
+        return {
+            "count": self.count,
+            "sum_seconds": self.total_ns / 1e9,
+            "mean_seconds": self.total_ns / self.count / 1e9 if self.count else 0.0,
+            "min_seconds": self.min_ns / 1e9,
+            "p50_seconds": self.percentile(50) / 1e9,
+            "p95_seconds": self.percentile(95) / 1e9,
+            "p99_seconds": self.percentile(99) / 1e9,
+            "max_seconds": self.max_ns / 1e9,
+        }
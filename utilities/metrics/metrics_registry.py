@@ -0,0 +1,146 @@
+import atexit
+import json
+import os
+import re
+import threading
+import time
+
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.metrics.latency_histogram import LatencyHistogram
+
+
+# Singleton instance - one registry of call counters and latency histograms per process
+# Metrics are exported to directory as metrics.json and as metrics.prom, in the Prometheus text format read by the
+# node exporter textfile collector. Both are rewritten every export_interval seconds and when the process exits,
+# when each run is also appended to history.jsonl so latencies can be compared across runs. The history keeps the
+# last history_max_runs runs.
+class MetricsRegistry:
+    instance = None
+
+    def __new__(cls):
+        if cls.instance is None:  # If instance is not created, create it
+            cls.instance = super(MetricsRegistry, cls).__new__(cls)
+            cls.instance._initialise()
+        return cls.instance
+
+    def _initialise(self) -> None:
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+        self.directory = Config.METRICS_DIR
+        self.export_interval = Config.METRICS_EXPORT_INTERVAL
+        self.history_max_runs = Config.METRICS_HISTORY_MAX_RUNS
+        self.info_logger = PrefixLogger(InfoLogger(), "MetricsRegistry")
+        self._stopped = threading.Event()
+        self._exporter = None
+        if self.directory and self.export_interval:
+            self._exporter = threading.Thread(target=self._run_exporter, name="MetricsExporter", daemon=True)
+            self._exporter.start()
+        atexit.register(self.close)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Returns the histogram of name, created on first use. Callers can keep it and record into it directly"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            return histogram
+
+    def record(self, name: str, duration_ns: int) -> None:
+        """Adds a duration in nanoseconds to the histogram of name"""
+        self.histogram(name).record(duration_ns)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started": self.started,
+                "exported": time.time(),
+                "pid": os.getpid(),
+                "counters": dict(self.counters),
+                "latencies": {name: histogram.summary() for name, histogram in self.histograms.items()
+                              if histogram.count},
+            }
+
+    @staticmethod
+    def _label(name: str) -> str:
+        return re.sub(r'(["\\])', r"\\\1", name)
+
+    def to_prometheus(self, snapshot: dict = None) -> str:
+        """Returns the metrics in the Prometheus text format"""
+        snapshot = snapshot or self.snapshot()
+        lines = ["# HELP email_classifier_calls_total Calls of each timed method",
+                 "# TYPE email_classifier_calls_total counter"]
+        lines += [f'email_classifier_calls_total{{name="{self._label(name)}"}} {count}'
+                  for name, count in snapshot["counters"].items()]
+        lines += ["# HELP email_classifier_duration_seconds Latency of each timed method",
+                  "# TYPE email_classifier_duration_seconds summary"]
+        for name, summary in snapshot["latencies"].items():
+            label = self._label(name)
+            for quantile, percentile in (("0.5", 50), ("0.95", 95), ("0.99", 99)):
+                lines.append(f'email_classifier_duration_seconds{{name="{label}",quantile="{quantile}"}} '
+                             f'{summary[f"p{percentile}_seconds"]:.9f}')
+            lines.append(f'email_classifier_duration_seconds_sum{{name="{label}"}} {summary["sum_seconds"]:.9f}')
+            lines.append(f'email_classifier_duration_seconds_count{{name="{label}"}} {summary["count"]}')
+        lines += ["# HELP email_classifier_duration_seconds_max Longest call of each timed method",
+                  "# TYPE email_classifier_duration_seconds_max gauge"]
+        lines += [f'email_classifier_duration_seconds_max{{name="{self._label(name)}"}} {summary["max_seconds"]:.9f}'
+                  for name, summary in snapshot["latencies"].items()]
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: str = None) -> dict:
+        """Writes metrics.json and metrics.prom, each replaced at once so readers never see half a file"""
+        directory = directory or self.directory
+        snapshot = self.snapshot()
+        os.makedirs(directory, exist_ok=True)
+        for file_name, content in (("metrics.json", json.dumps(snapshot, indent=4)),
+                                   ("metrics.prom", self.to_prometheus(snapshot))):
+            path = os.path.join(directory, file_name)
+            with open(path + ".tmp", "w") as export_file:
+                export_file.write(content)
+            os.replace(path + ".tmp", path)
+        return snapshot
+
+    def log_summary(self) -> None:
+        for name, summary in self.snapshot()["latencies"].items():
+            self.info_logger.log(f"{name}: {summary['count']} timed calls, p50 {summary['p50_seconds']:.4f}s, "
+                                 f"p95 {summary['p95_seconds']:.4f}s, p99 {summary['p99_seconds']:.4f}s, "
+                                 f"max {summary['max_seconds']:.4f}s")
+
+    def close(self) -> None:
+        """Stops the periodic export, logs a summary and exports the metrics of this run"""
+        self._stopped.set()
+        if self._exporter is not None:
+            self._exporter.join()
+            self._exporter = None
+        atexit.unregister(self.close)
+        if not self.histograms and not self.counters:
+            return
+        self.log_summary()
+        if self.directory:
+            self.append_history(self.export())
+
+    def append_history(self, snapshot: dict, directory: str = None) -> None:
+        """Adds a run to history.jsonl and drops the oldest runs beyond history_max_runs"""
+        path = os.path.join(directory or self.directory, "history.jsonl")
+        runs = []
+        if os.path.exists(path):
+            with open(path) as history_file:
+                runs = history_file.readlines()
+        runs.append(json.dumps(snapshot) + "\n")
+        if self.history_max_runs:
+            runs = runs[-self.history_max_runs:]
+        # Replaced at once like the exports, an interrupted run cannot lose the history
+        with open(path + ".tmp", "w") as history_file:
+            history_file.writelines(runs)
+        os.replace(path + ".tmp", path)
+
+    def _run_exporter(self) -> None:
+        while not self._stopped.wait(self.export_interval):
+            self.export()
@@ -0,0 +1,152 @@
+import math
+import time
+
+import numpy as np
+
+from model.factory.classification_factory import ClassificationContextFactory
+from preprocessing.processor import DataProcessor
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.concrete_logger.warning_logger import WarningLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.training_scheduler import TrainingScheduler
+
+
+# Successive halving: every candidate is scored on a small stratified subsample with held-out folds,
+# only the best 1 / eta of them move on to a budget eta times larger, until one candidate is left
+class SuccessiveHalvingSelector:
+    def __init__(self, eta: int = Config.SELECTION_ETA, min_rows: int = Config.SELECTION_MIN_ROWS,
+                 folds: int = Config.SELECTION_FOLDS, seed: int = Config.RANDOM_SEED,
+                 workers: int = Config.TRAINING_WORKERS) -> None:
+        self.eta = eta
+        self.min_rows = min_rows
+        self.folds = folds
+        self.seed = seed
+        # Every fold of every candidate of a rung is trained as one job of the scheduler's process pool
+        self.scheduler = TrainingScheduler(workers)
+        # Model name -> parameters of its unfitted estimator, for the budget of each rung
+        self._default_params = {}
+        # label name -> list of (rung, rows, model name, score, seconds)
+        self.selection_log = {}
+        self.selection_time = 0.0
+        self.info_logger = PrefixLogger(InfoLogger(), "SuccessiveHalvingSelector")
+        self.warning_logger = PrefixLogger(WarningLogger(), "SuccessiveHalvingSelector")
+
+    def select_all(self, X, y: dict, model_names: list) -> dict:
+        """
+        Selects the best of model_names for every label in y, without training any candidate on all rows
+        The rungs of all labels are run together, so a rung is one batch of jobs for the scheduler
+        Returns label name -> model name
+        """
+        start_time = time.perf_counter()
+        labels = {}
+        class_orders = {}
+        candidates = {}
+        for label_name, y_val in y.items():
+            labels[label_name] = np.asarray(y_val, dtype=object).astype(str)
+            labelled_rows = np.flatnonzero(DataProcessor.labelled_mask(y_val))
+            rng = np.random.default_rng(self.seed)
+            # One shuffled order of the rows of X per class, so the subsample of every rung contains the one before it
+            class_orders[label_name] = [rng.permutation(labelled_rows[labels[label_name][labelled_rows] == label])
+                                        for label in np.unique(labels[label_name][labelled_rows])]
+            candidates[label_name] = list(model_names)
+            self.selection_log[label_name] = []
+
+        n_rungs = self._count_rungs(len(model_names))
+        for rung in range(n_rungs):
+            budget = self.eta ** (rung - n_rungs)
+            jobs = []
+            subsample_sizes = {}
+            for label_name in y:
+                n_labelled = sum(len(order) for order in class_orders[label_name])
+                n_rows = min(n_labelled, max(self.min_rows, math.ceil(n_labelled * budget)))
+                rows, fold_of_row = self._stratified_subsample(class_orders[label_name], n_rows / n_labelled)
+                subsample_sizes[label_name] = len(rows)
+                jobs.extend(self._fold_jobs(label_name, candidates[label_name], rows, fold_of_row,
+                                            labels[label_name], budget))
+            results = self.scheduler.score_all(X, jobs)
+            for label_name in y:
+                candidates[label_name] = self._keep_best(label_name, rung, subsample_sizes[label_name],
+                                                          candidates[label_name], results)
+
+        selected = {}
+        for label_name in y:
+            selected[label_name] = candidates[label_name][0]
+            self._log_selection(label_name, selected[label_name])
+        self.selection_time = time.perf_counter() - start_time
+        return selected
+
+    def select(self, label_name: str, X, y, model_names: list) -> str:
+        """Returns the name of the best model for one label"""
+        return self.select_all(X, {label_name: y}, model_names)[label_name]
+
+    def _fold_jobs(self, label_name: str, model_names: list, rows, fold_of_row, labels, budget: float) -> list:
+        """Returns a scoring job for every fold of every candidate, keyed by (label name, model name, fold)"""
+        jobs = []
+        for model_name in model_names:
+            params = self._budget_params(model_name, budget)
+            for fold in range(self.folds):
+                held_out = fold_of_row == fold
+                train_rows, test_rows = rows[~held_out], rows[held_out]
+                jobs.append(((label_name, model_name, fold), model_name, params,
+                             train_rows, labels[train_rows], test_rows, labels[test_rows]))
+        return jobs
+
+    def _keep_best(self, label_name: str, rung: int, n_rows: int, model_names: list, results: dict) -> list:
+        """Records the mean held-out accuracy of every candidate, returns the best 1 / eta of them"""
+        scores = []
+        for model_name in model_names:
+            fold_scores = []
+            elapsed = 0.0
+            for fold in range(self.folds):
+                score, error, fold_time = results[(label_name, model_name, fold)]
+                if error is not None:
+                    # A small training fold can be too small for some models, e.g. fewer rows than neighbours
+                    self.warning_logger.log(f"{model_name} could not be scored on fold {fold}: {error}")
+                fold_scores.append(score)
+                elapsed += fold_time
+            scores.append(float(np.mean(fold_scores)))
+            self.selection_log[label_name].append((rung, n_rows, model_name, scores[-1], elapsed))
+
+        # Stable sort, ties keep the order of model_names
+        ranking = sorted(range(len(model_names)), key=lambda i: -scores[i])
+        n_kept = max(1, math.ceil(len(model_names) / self.eta))
+        return [model_names[i] for i in sorted(ranking[:n_kept])]
+
+    def _stratified_subsample(self, class_orders: list, fraction: float):
+        """
+        Takes the same fraction of every class, at least one row each
+        Returns the rows and the fold each row is held out in, folds are assigned round robin within each class
+        """
+        rows = []
+        folds = []
+        for order in class_orders:
+            taken = order[:max(1, math.ceil(len(order) * fraction))]
+            rows.append(taken)
+            folds.append(np.arange(len(taken)) % self.folds)
+        return np.concatenate(rows), np.concatenate(folds)
+
+    def _budget_params(self, model_name: str, budget: float) -> dict:
+        """Ensembles get the budget's share of their trees, any other model keeps its parameters"""
+        if model_name not in self._default_params:
+            # Read once per model, the candidates themselves are created in the scheduler's jobs
+            self._default_params[model_name] = \
+                ClassificationContextFactory.create_context(model_name).get_fitted_model().get_params()
+        n_estimators = self._default_params[model_name].get("n_estimators")
+        if n_estimators is not None:
+            return {"n_estimators": max(10, int(n_estimators * budget))}
+        return {}
+
+    def _count_rungs(self, n_candidates: int) -> int:
+        """Returns the number of rungs needed to narrow n_candidates down to one, at least one"""
+        n_rungs = 0
+        while n_candidates > 1 or n_rungs == 0:
+            n_candidates = math.ceil(n_candidates / self.eta)
+            n_rungs += 1
+        return n_rungs
+
+    def _log_selection(self, label_name: str, best_model: str) -> None:
+        for rung, n_rows, model_name, score, elapsed in self.selection_log[label_name]:
+            self.info_logger.log(f"{label_name} rung {rung} ({n_rows} rows) {model_name.ljust(20)}: "
+                                 f"{score:.2f}% in {elapsed:.2f} seconds")
+        self.info_logger.log(f"{label_name} selected {best_model}")
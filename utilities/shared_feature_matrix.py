@@ -0,0 +1,79 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import sparse
+
+
+# Places a dense or CSR feature matrix in shared memory, worker processes map the same buffers instead of receiving a copy.
+# Arrays that are already memory-mapped from a .npy file (see FeatureCache) are not copied, workers map the file instead.
+class SharedFeatureMatrix:
+    def __init__(self, X) -> None:
+        self._blocks = []
+        if sparse.issparse(X):
+            X = X.tocsr()
+            arrays = {"data": X.data, "indices": X.indices, "indptr": X.indptr}
+            self.spec = {"format": "csr", "shape": X.shape, "arrays": {}}
+        else:
+            arrays = {"data": np.ascontiguousarray(X)}
+            self.spec = {"format": "dense", "shape": X.shape, "arrays": {}}
+
+        for name, array in arrays.items():
+            file_name = self._backing_file(array)
+            if file_name is not None:
+                self.spec["arrays"][name] = ("file", file_name)
+                continue
+            # Shared memory blocks cannot be empty
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.spec["arrays"][name] = ("shm", block.name, array.shape, array.dtype.str)
+
+    @staticmethod
+    def _backing_file(array: np.ndarray):
+        """Returns the .npy file the whole array is memory-mapped from, None if it is not"""
+        base = array
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        if base is None or not getattr(base, "filename", None) or not str(base.filename).endswith(".npy"):
+            return None
+        whole_file = (base.shape == array.shape and base.dtype == array.dtype
+                      and base.__array_interface__["data"][0] == array.__array_interface__["data"][0])
+        return str(base.filename) if whole_file else None
+
+    @staticmethod
+    def attach(spec: dict):
+        """
+        Maps a shared matrix from its spec, without copying it
+        Returns the matrix and the shared memory handles, which must be kept alive as long as the matrix is used
+        """
+        blocks = []
+        arrays = {}
+        for name, source in spec["arrays"].items():
+            if source[0] == "file":
+                arrays[name] = np.load(source[1], mmap_mode="r")
+                continue
+            _, block_name, shape, dtype = source
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            array.flags.writeable = False
+            arrays[name] = array
+
+        if spec["format"] == "csr":
+            X = sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=spec["shape"], copy=False)
+        else:
+            X = arrays["data"]
+        return X, blocks
+
+    def close(self) -> None:
+        """Frees the shared memory, workers must be done with it"""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
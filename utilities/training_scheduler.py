@@ -0,0 +1,136 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from model.classification_context import ClassificationContext
+from model.factory.classification_factory import ClassificationContextFactory
+from preprocessing.processor import DataProcessor
+from utilities.configuration.config import Config
+from utilities.logger.concrete_logger.info_logger import InfoLogger
+from utilities.logger.decorators.prefix_decorator import PrefixLogger
+from utilities.shared_feature_matrix import SharedFeatureMatrix
+
+# Feature matrix mapped by each worker process, set up once by _init_worker
+_worker_X = None
+_worker_blocks = None
+
+
+def _init_worker(spec: dict) -> None:
+    global _worker_X, _worker_blocks
+    _worker_X, _worker_blocks = SharedFeatureMatrix.attach(spec)
+
+
+def _fit(X, label_name: str, model_name: str, y_val):
+    """Trains one candidate on the labelled rows of X, returns the fitted model and the time it took"""
+    start_time = time.perf_counter()
+    X_trimmed, y_trim_val = DataProcessor.remove_nan_rows(X, y_val)
+    model = ClassificationContextFactory.create_context(model_name)
+    model.train_model(X_trimmed, y_trim_val.astype(str))
+    return label_name, model_name, model.get_fitted_model(), time.perf_counter() - start_time
+
+
+def _score(X, key, model_name: str, params: dict, train_rows, y_train, test_rows, y_test):
+    """
+    Trains a candidate with params set on its estimator on train_rows of X and scores it on test_rows
+    Returns the key, the accuracy, the error that kept the candidate from being scored if any and the time it took
+    """
+    start_time = time.perf_counter()
+    model = ClassificationContextFactory.create_context(model_name)
+    model.get_fitted_model().set_params(**params)
+    try:
+        model.train_model(X[train_rows], y_train)
+        score, error = model.evaluate_model(X[test_rows], y_test), None
+    except ValueError as e:
+        score, error = 0.0, str(e)
+    return key, score, error, time.perf_counter() - start_time
+
+
+def _call_in_worker(function, *args):
+    return function(_worker_X, *args)
+
+
+# Trains and scores (label, candidate model) pairs, over a process pool when more than one worker is configured
+class TrainingScheduler:
+    # Rough relative training cost of each model, the most expensive jobs are started first
+    COST_ESTIMATES = {
+        "random_forest": 100,
+        "svm": 60,
+        "logistic_regression": 10,
+        "decision_tree": 5,
+        "k_nearest_neighbors": 1,
+        "naive_bayes": 1,
+        "sgd": 2,
+        "passive_aggressive": 2,
+        "complement_naive_bayes": 1,
+    }
+
+    def __init__(self, workers: int = Config.TRAINING_WORKERS) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.timings = {}
+        self.wall_time = 0.0
+        self.info_logger = PrefixLogger(InfoLogger(), "TrainingScheduler")
+
+    def _ordered_jobs(self, y: dict, jobs: list) -> list:
+        costs = {}
+        for label_name, y_val in y.items():
+            costs[label_name] = int(DataProcessor.labelled_mask(y_val).sum())
+        return sorted(jobs, key=lambda job: self.COST_ESTIMATES.get(job[1], 10) * costs[job[0]], reverse=True)
+
+    def train_selected(self, X, y: dict, selected: dict) -> dict:
+        """
+        Trains one model per label, selected maps each label name to a model name
+        Returns label name -> trained ClassificationContext
+        """
+        fitted_models = self._run(list(selected.items()), X, y)
+        return {label_name: self._create_context(label_name, model_name, fitted_models[(label_name, model_name)])
+                for label_name, model_name in selected.items()}
+
+    def score_all(self, X, jobs: list) -> dict:
+        """
+        Scores candidates on held-out rows, each job is (key, model name, estimator params, training rows,
+        training labels, held-out rows, held-out labels) with rows indexing X
+        Returns key -> (accuracy, error or None, seconds)
+        """
+        jobs = sorted(jobs, key=lambda job: self.COST_ESTIMATES.get(job[1], 10) * len(job[3]), reverse=True)
+        results = self._map(_score, X, jobs)
+        return {key: (score, error, elapsed) for key, score, error, elapsed in results}
+
+    @staticmethod
+    def _create_context(label_name: str, model_name: str, fitted_model) -> ClassificationContext:
+        model: ClassificationContext = ClassificationContextFactory.create_context(model_name)
+        model.set_fitted_model(fitted_model)
+        model.set_label_names([label_name])
+        return model
+
+    def _run(self, jobs: list, X, y: dict) -> dict:
+        """Runs the (label name, model name) jobs, returns (label name, model name) -> fitted model"""
+        jobs = self._ordered_jobs(y, jobs)
+        start_time = time.perf_counter()
+        results = self._map(_fit, X, [(label_name, model_name, y[label_name]) for label_name, model_name in jobs])
+        self.wall_time = time.perf_counter() - start_time
+
+        fitted_models = {}
+        self.timings = {}
+        for label_name, model_name, fitted_model, elapsed in results:
+            fitted_models[(label_name, model_name)] = fitted_model
+            self.timings[(label_name, model_name)] = elapsed
+        self._log_timings(self.wall_time)
+        return fitted_models
+
+    def _map(self, function, X, jobs: list) -> list:
+        """Returns function(X, *job) for every job, over a process pool when more than one worker is configured"""
+        if self.workers <= 1:
+            return [function(X, *job) for job in jobs]
+        # The workers map the feature matrix from shared memory, only the rest of each job is sent to them
+        with SharedFeatureMatrix(X) as shared_X:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(shared_X.spec,)) as executor:
+                futures = [executor.submit(_call_in_worker, function, *job) for job in jobs]
+                return [future.result() for future in as_completed(futures)]
+
+    def _log_timings(self, wall_time: float) -> None:
+        for (label_name, model_name), elapsed in sorted(self.timings.items(), key=lambda item: -item[1]):
+            self.info_logger.log(f"{label_name} {model_name.ljust(20)}: {elapsed:.2f} seconds")
+        total_time = sum(self.timings.values())
+        self.info_logger.log(f"Trained {len(self.timings)} models in {wall_time:.2f} seconds "
+                             f"({total_time:.2f} seconds of training over {self.workers} workers)")
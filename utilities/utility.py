@@ -1,34 +1,16 @@
-from model.classification_context import ClassificationContext
-from model.factory.classification_factory import ClassificationContextFactory
+import numpy as np
 
 class Utils:
+    # Models that compete to be the best model of each label
+    CANDIDATE_MODELS = ["naive_bayes", "decision_tree", "random_forest", "logistic_regression", "svm",
+                        "k_nearest_neighbors"]
+    # Models trained once on all labels, they return one column per label
+    MULTI_OUTPUT_MODELS = ["multi_output_forest"]
+
     def __init__(self):
         pass
 
     @staticmethod
-    def instantiate_all_models() -> [ClassificationContext]:
-        models = list()
-        models.append(ClassificationContextFactory.create_context("naive_bayes"))
-        models.append(ClassificationContextFactory.create_context("decision_tree"))
-        models.append(ClassificationContextFactory.create_context("random_forest"))
-        models.append(ClassificationContextFactory.create_context("logistic_regression"))
-        models.append(ClassificationContextFactory.create_context("svm"))
-        models.append(ClassificationContextFactory.create_context("k_nearest_neighbors"))
-        return models
-
-    @staticmethod
-    def train_models(models: [ClassificationContext], X, y) -> None:
-        for model in models:
-            model.train_model(X, y)
-
-    @staticmethod
-    def get_best_model(models: [ClassificationContext], X, y) -> ClassificationContext:
-        best_model_score = 0
-        best_model = None
-        for model in models:
-            model_score = model.evaluate_model(X, y)
-            if model_score > best_model_score:
-                best_model_score = model_score
-                best_model = model
-
-        return best_model
+    def stack_labels(y: dict):
+        """Returns the labels as one array with a column per label, in the order of y"""
+        return np.column_stack([y_val for y_val in y.values()])